@@ -1,8 +1,13 @@
+import importlib
 import customtkinter
-from gui.encrypt_frame import EncryptFrame
-from gui.decrypt_frame import DecryptFrame
 from gui.toast import ToastNotification
 
+# Frames are imported and built the first time they are shown, so startup only pays for the first one.
+FRAME_CLASSES = {
+    "encrypt": "gui.encrypt_frame:EncryptFrame",
+    "decrypt": "gui.decrypt_frame:DecryptFrame",
+}
+
 
 class App(customtkinter.CTk):
     def __init__(self, **kwargs):
@@ -51,10 +56,7 @@ class App(customtkinter.CTk):
         self.status_bar = customtkinter.CTkLabel(self, text="Ready", anchor="w", font=("", 12))
         self.status_bar.grid(row=2, column=0, sticky="ew", padx=10, pady=(5, 5))
 
-        self.frames = {
-            "encrypt": EncryptFrame(master=self.frame_container, app=self, status_bar=self.status_bar),
-            "decrypt": DecryptFrame(master=self.frame_container, app=self, status_bar=self.status_bar)
-        }
+        self.frames = {}
         self.select_frame("encrypt")
 
     def show_toast(self, title, message, toast_type="info"):
@@ -69,14 +71,23 @@ class App(customtkinter.CTk):
 
         self.after(4000, toast.destroy)
 
+    def get_frame(self, name):
+        """Returns the frame called `name`, building it on first use."""
+        if name not in self.frames:
+            module_name, _, class_name = FRAME_CLASSES[name].partition(":")
+            frame_class = getattr(importlib.import_module(module_name), class_name)
+            self.frames[name] = frame_class(master=self.frame_container, app=self, status_bar=self.status_bar)
+        return self.frames[name]
+
     def select_frame(self, name):
         self.encrypt_button.configure(
             fg_color="transparent" if name != "encrypt" else customtkinter.ThemeManager.theme["CTkButton"]["fg_color"])
         self.decrypt_button.configure(
             fg_color="transparent" if name != "decrypt" else customtkinter.ThemeManager.theme["CTkButton"]["fg_color"])
 
-        for frame_name, frame in self.frames.items():
-            if frame_name == name:
+        selected = self.get_frame(name)
+        for frame in self.frames.values():
+            if frame is selected:
                 frame.pack(fill="both", expand=True)
             else:
                 frame.pack_forget()
\ No newline at end of file
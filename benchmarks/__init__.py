@@ -0,0 +1,7 @@
+# File: benchmarks/__init__.py
+#
+# Performance benchmarks; run them from the repository root, e.g.
+# python -m benchmarks.startup
+# python -m benchmarks.throughput run --sizes 1K,1M,1G --output baseline.json
+# python -m benchmarks.throughput compare baseline.json current.json --threshold 0.1
+# python -m benchmarks.load_test --requests 5000 --concurrency 64 --size 1K
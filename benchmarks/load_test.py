@@ -0,0 +1,179 @@
+# File: benchmarks/load_test.py
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.throughput import parse_size, make_input
+from cryptosuite.service import read_head, iter_body
+
+DEFAULT_RECIPE = [{"operation": "To Base64"}, {"operation": "To Hex"}]
+
+
+class Connection:
+    """A keep-alive HTTP/1.1 client connection to the bake service."""
+
+    def __init__(self, reader, writer, host: str):
+        self.reader, self.writer, self.host = reader, writer, host
+
+    @classmethod
+    async def open(cls, host: str = None, port: int = None, unix_path: str = None) -> "Connection":
+        if unix_path:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+            return cls(reader, writer, "localhost")
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, host)
+
+    async def request(self, method: str, path: str, body: bytes = b"", headers: dict = None) -> tuple:
+        """Sends one request and returns (status, body)."""
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await self.writer.drain()
+        status_line, response_headers = await read_head(self.reader)
+        data = b"".join([chunk async for chunk in iter_body(self.reader, response_headers)])
+        return int(status_line.split(" ")[1]), data
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, max(0, round(fraction * len(values)) - 1))]
+
+
+async def run_load(connect, recipe: list, payloads: list, total: int, concurrency: int) -> dict:
+    """
+    Sends `total` bake requests over `concurrency` keep-alive connections and
+    measures the latency of each one, from sending the request to reading the
+    whole response.
+    """
+    setup = await connect()
+    status, body = await setup.request("POST", "/recipes", json.dumps(recipe).encode("utf-8"),
+                                       {"Content-Type": "application/json"})
+    if status != 201:
+        raise RuntimeError(f"Recipe rejected ({status}): {body.decode('utf-8', 'replace')}")
+    path = f"/bake/{json.loads(body)['id']}"
+    before = json.loads((await setup.request("GET", "/stats"))[1])
+
+    latencies, errors, remaining = [], 0, total
+
+    async def client():
+        nonlocal errors, remaining
+        connection = await connect()
+        try:
+            while remaining > 0:
+                remaining -= 1
+                payload = random.choice(payloads)
+                start = time.perf_counter()
+                status, _ = await connection.request("POST", path, payload)
+                latencies.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+        finally:
+            await connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    after = json.loads((await setup.request("GET", "/stats"))[1])
+    await setup.close()
+    latencies.sort()
+    batches = after["batches"] - before["batches"]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "payload_bytes": len(payloads[0]),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "mean": statistics.fmean(latencies) * 1e3,
+            "p50": percentile(latencies, 0.50) * 1e3,
+            "p90": percentile(latencies, 0.90) * 1e3,
+            "p99": percentile(latencies, 0.99) * 1e3,
+            "max": latencies[-1] * 1e3,
+        },
+        "worker_batches": batches,
+        "mean_batch_size": (after["batched_requests"] - before["batched_requests"]) / batches if batches else 0.0,
+    }
+
+
+def spawn_service(unix_path: str, workers: int) -> subprocess.Popen:
+    """Starts `python -m cryptosuite serve` on a Unix socket and waits until it accepts connections."""
+    command = [sys.executable, "-m", "cryptosuite", "serve", "--unix", unix_path]
+    if workers:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command)
+    deadline = time.monotonic() + 30
+    while not os.path.exists(unix_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError("The bake service did not start.")
+        time.sleep(0.05)
+    return process
+
+
+def _print_report(report: dict):
+    latency = report["latency_ms"]
+    print(f"{report['requests']} requests ({report['errors']} errors) of {report['payload_bytes']:,} bytes "
+          f"over {report['concurrency']} connections in {report['seconds']:.2f}s")
+    print(f"throughput: {report['requests_per_second']:.0f} req/s")
+    print(f"latency: p50 {latency['p50']:.2f} ms · p90 {latency['p90']:.2f} ms · p99 {latency['p99']:.2f} ms · "
+          f"max {latency['max']:.2f} ms")
+    print(f"worker calls: {report['worker_batches']} (mean batch size {report['mean_batch_size']:.1f})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the CryptoSuite bake service.")
+    parser.add_argument("--host", help="Service host; without --host or --unix a local service is started.")
+    parser.add_argument("--port", type=int, default=8765, help="Service port (default: 8765).")
+    parser.add_argument("--unix", help="Service Unix socket path.")
+    parser.add_argument("--workers", type=int, default=None, help="Workers of the service started locally.")
+    parser.add_argument("--recipe", "-r", help="Recipe JSON file (default: To Base64 → To Hex).")
+    parser.add_argument("--requests", "-n", type=int, default=5000, help="Total requests (default: 5000).")
+    parser.add_argument("--concurrency", "-c", type=int, default=64, help="Open connections (default: 64).")
+    parser.add_argument("--size", default="1K", help="Payload size, e.g. 100, 1K, 64K (default: 1K).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    recipe = DEFAULT_RECIPE
+    if args.recipe:
+        with open(args.recipe, "r", encoding="utf-8") as f:
+            recipe = json.load(f)
+    size = parse_size(args.size)
+    payloads = [make_input("ascii", size, seed) for seed in range(16)]
+
+    process = None
+    with tempfile.TemporaryDirectory(prefix="cryptosuite-load-") as directory:
+        unix_path = args.unix
+        if not args.host and not args.unix:
+            unix_path = os.path.join(directory, "bake.sock")
+            process = spawn_service(unix_path, args.workers)
+        try:
+            report = asyncio.run(run_load(lambda: Connection.open(args.host, args.port, unix_path), recipe,
+                                          payloads, args.requests, args.concurrency))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        _print_report(report)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
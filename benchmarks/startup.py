@@ -0,0 +1,102 @@
+# File: benchmarks/startup.py
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budgets in seconds (median of the runs). Raise them only on purpose.
+DEFAULT_BUDGETS = {
+    "import_operations": 0.1,
+    "import_app": 0.5,
+    "first_frame": 1.5,
+}
+
+# Modules that must not be loaded by a given import, to keep startup lazy.
+FORBIDDEN_MODULES = {
+    "import_operations": ("tkinter", "customtkinter", "pyperclip", "gui", "numpy"),
+    "import_app": ("pyperclip", "numpy", "gui.decrypt_frame", "operations.detect"),
+}
+
+_SNIPPETS = {
+    "import_operations": "import operations.engine, operations.stream",
+    "import_app": "import app",
+    # Builds the window and processes pending events, i.e. the first paint.
+    "first_frame": "import app\nwindow = app.App()\nwindow.update()\nwindow.destroy()",
+}
+
+_HARNESS = """
+import json, sys, time
+start = time.perf_counter()
+try:
+    exec(compile({snippet!r}, "<startup>", "exec"))
+except Exception as e:
+    print(json.dumps({{"error": f"{{type(e).__name__}}: {{e}}"}}))
+    raise SystemExit(0)
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(name: str) -> dict:
+    """Runs one startup snippet in a fresh interpreter and returns its timing and loaded modules."""
+    harness = _HARNESS.format(snippet=_SNIPPETS[name])
+    completed = subprocess.run([sys.executable, "-c", harness], cwd=ROOT, capture_output=True, text=True)
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr else "no output"}
+    return json.loads(lines[-1])
+
+
+def run(repeat: int, budgets: dict) -> tuple[dict, list]:
+    """Measures every snippet `repeat` times; returns the report and the list of failures."""
+    report, failures = {}, []
+    for name in _SNIPPETS:
+        runs = [measure(name) for _ in range(repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            # e.g. no display available for the first-frame measurement.
+            report[name] = {"skipped": errors[0]}
+            continue
+        median = statistics.median(r["seconds"] for r in runs)
+        report[name] = {"median": round(median, 4), "budget": budgets[name]}
+        if median > budgets[name]:
+            failures.append(f"{name}: {median * 1000:.1f} ms exceeds the {budgets[name] * 1000:.0f} ms budget")
+
+        loaded = set(runs[0]["modules"])
+        for forbidden in FORBIDDEN_MODULES.get(name, ()):
+            offenders = sorted(m for m in loaded if m == forbidden or m.startswith(forbidden + "."))
+            if offenders:
+                failures.append(f"{name}: eagerly imports {offenders[0]}")
+    return report, failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure CryptoSuite startup time against a budget.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per measurement (default: 5).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    for name, budget in DEFAULT_BUDGETS.items():
+        parser.add_argument(f"--budget-{name.replace('_', '-')}", type=float, default=budget,
+                            dest=name, help=f"Budget for {name} in seconds (default: {budget}).")
+    args = parser.parse_args(argv)
+
+    report, failures = run(args.repeat, {name: getattr(args, name) for name in DEFAULT_BUDGETS})
+    if args.json:
+        print(json.dumps({"results": report, "failures": failures}, indent=4))
+    else:
+        for name, result in report.items():
+            if "skipped" in result:
+                print(f"{name:<18} skipped ({result['skipped']})")
+            else:
+                print(f"{name:<18} {result['median'] * 1000:8.1f} ms  (budget {result['budget'] * 1000:.0f} ms)")
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
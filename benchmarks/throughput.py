@@ -0,0 +1,293 @@
+# File: benchmarks/throughput.py
+
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from operations.engine import compile_recipe
+from operations.registry import registry
+from operations.ciphers import caesar_cipher
+from operations.aes import aes_encrypt
+from operations.encoders import to_base64
+from operations.hex import to_hex
+from operations.compression import compress
+
+DEFAULT_SIZES = "1K,64K,1M,16M"
+BENCHMARK_KEY = "benchmark"
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_MEMORY_THRESHOLD = 0.25
+# Small inputs are repeated until one measurement covers at least this many seconds.
+MIN_MEASURE_TIME = 0.2
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+_WORDS = ("the quick brown fox jumps over lazy dog and then some more plain english text "
+          "appears here with numbers 0123456789 punctuation, dots. and lines\n").split(" ")
+_UNICODE_WORDS = ("Grüße naïve café façade Ελληνικά кириллица 日本語テキスト emoji 🙂 "
+                  "mixed with ascii words too").split(" ")
+
+# Canonical recipes: (name, recipe, prepare) where prepare turns the source into the recipe's input.
+RECIPES = (
+    ("encode: Base64 → Hex", [{"operation": "To Base64"}, {"operation": "To Hex"}], None),
+    ("decode: Hex → Base64", [{"operation": "From Hex"}, {"operation": "From Base64"}],
+     lambda source: to_hex(to_base64(source)[1])[1]),
+    ("cipher: Caesar(13) → Base64", [{"operation": "Caesar Encrypt", "args": {"shift": "13"}},
+                                    {"operation": "To Base64"}], None),
+    ("crack: Base64 → Caesar Brute Force", [{"operation": "From Base64"}, {"operation": "Caesar Brute Force"}],
+     lambda source: to_base64(source)[1]),
+    ("pack: Gzip(1) → Base64", [{"operation": "Gzip Compress", "args": {"level": "1"}}, {"operation": "To Base64"}],
+     None),
+)
+
+# Operations that need an encoded input rather than the raw source.
+_OPERATION_INPUTS = {
+    "From Base64": lambda source: to_base64(source)[1],
+    "From Hex": lambda source: to_hex(source)[1],
+    "AES Decrypt": lambda source: aes_encrypt(source, BENCHMARK_KEY)[1],
+    "Zlib Decompress": lambda source: compress(source, "zlib")[1],
+    "Gzip Decompress": lambda source: compress(source, "gzip")[1],
+    "Bzip2 Decompress": lambda source: compress(source, "bz2")[1],
+    "LZMA Decompress": lambda source: compress(source, "lzma")[1],
+}
+
+
+def parse_size(text: str) -> int:
+    """Parses '1K', '64K', '16M' or '1G' (powers of 1024) into a number of bytes."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    return int(float(text[:len(text) - len(unit)]) * _UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    for unit in ("G", "M", "K"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+
+def make_input(kind: str, size: int, seed: int = 0) -> bytes:
+    """
+    Builds a reproducible input of exactly `size` bytes.
+
+    'ascii' is English-like text, 'unicode' is text with multi-byte UTF-8
+    characters (cut on a byte boundary, like a real chunk would be) and
+    'binary' is random bytes. A 1 MB block is generated and repeated, so
+    even 1 GB inputs are built in well under a second.
+    """
+    rng = random.Random(seed)
+    block_size = min(size, 1024 * 1024) or 1
+    if kind == "binary":
+        block = rng.randbytes(block_size)
+    else:
+        words = _WORDS if kind == "ascii" else _WORDS + _UNICODE_WORDS
+        parts, length = [], 0
+        while length < block_size:
+            word = rng.choice(words).encode("utf-8") + b" "
+            parts.append(word)
+            length += len(word)
+        block = b"".join(parts)[:block_size]
+    return (block * (size // block_size + 1))[:size]
+
+
+def cases(kinds: list, selected: str = None):
+    """
+    Yields (case_name, kind, prepare, run) for every registered operation,
+    the string Caesar API and the canonical recipes. `run(data)` executes
+    the case once on prepared input.
+    """
+    entries = []
+    for name in registry.names():
+        operation = registry.get(name)
+        if not operation.available:
+            continue
+        args = {param.name: param.default or ("3" if param.name == "shift" else BENCHMARK_KEY)
+                for param in operation.params}
+        recipe = [{"operation": name, "args": args}]
+        entries.append((f"op: {name}", compile_recipe(recipe).run, _OPERATION_INPUTS.get(name), kinds))
+    text_kinds = [kind for kind in kinds if kind != "binary"]
+    entries.append(("api: caesar_cipher (str)", lambda text: caesar_cipher(text, 3),
+                    lambda source: source.decode("utf-8", errors="replace"), text_kinds))
+    for name, recipe, prepare in RECIPES:
+        entries.append((f"recipe: {name}", compile_recipe(recipe).run, prepare, kinds))
+
+    for name, run, prepare, case_kinds in entries:
+        if selected and selected.lower() not in name.lower():
+            continue
+        for kind in case_kinds:
+            yield name, kind, prepare, run
+
+
+def measure(run, data, repeat: int) -> dict:
+    """Times `run(data)` (median of `repeat` measurements) and its peak extra memory in one traced pass."""
+    success, result = run(data)
+    if success is False:
+        return {"error": str(result)}
+
+    # Calibrate how many calls make up one measurement, so tiny inputs are not lost in timer noise.
+    start = time.perf_counter()
+    run(data)
+    single = max(time.perf_counter() - start, 1e-9)
+    loops = max(1, int(MIN_MEASURE_TIME / single)) if single < MIN_MEASURE_TIME else 1
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run(data)
+        timings.append((time.perf_counter() - start) / loops)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    run(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    size = len(data.encode("utf-8")) if isinstance(data, str) else len(data)
+    return {"input_bytes": size, "seconds": seconds, "mb_per_s": size / seconds / 1024 ** 2,
+            "peak_bytes": peak - baseline}
+
+
+def run_suite(sizes: list, kinds: list, repeat: int, selected: str = None, log=None) -> dict:
+    """Runs every case for every size and input kind; returns the JSON-ready report."""
+    results = {}
+    for size in sizes:
+        sources = {kind: make_input(kind, size) for kind in kinds}
+        for name, kind, prepare, run in cases(kinds, selected):
+            data = prepare(sources[kind]) if prepare else sources[kind]
+            key = f"{name} | {kind} | {format_size(size)}"
+            results[key] = measure(run, data, repeat)
+            if log:
+                log(key, results[key])
+            del data
+        del sources
+    return {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "numpy": _numpy_version(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _numpy_version():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy.__version__
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+            memory_threshold: float = DEFAULT_MEMORY_THRESHOLD) -> tuple[list, list]:
+    """
+    Compares two reports case by case.
+
+    A case regresses when its throughput drops by more than `threshold`
+    (0.10 = 10%) or its peak memory grows by more than `memory_threshold`.
+    Cases present in only one report are ignored.
+
+    Returns:
+        A tuple of (rows, regressions): one row per common case as
+        (key, baseline MB/s, current MB/s, change) and the regression messages.
+    """
+    rows, regressions = [], []
+    for key, old in baseline["results"].items():
+        new = current["results"].get(key)
+        if new is None or "error" in old or "error" in new:
+            continue
+        change = new["mb_per_s"] / old["mb_per_s"] - 1
+        rows.append((key, old["mb_per_s"], new["mb_per_s"], change))
+        if change < -threshold:
+            regressions.append(f"{key}: throughput {old['mb_per_s']:.1f} → {new['mb_per_s']:.1f} MB/s "
+                               f"({change:+.0%})")
+        # A few KB of bookkeeping is noise; only compare memory once it is significant.
+        if old["peak_bytes"] > 64 * 1024 and new["peak_bytes"] > old["peak_bytes"] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak memory {old['peak_bytes'] / 1024 ** 2:.1f} → "
+                               f"{new['peak_bytes'] / 1024 ** 2:.1f} MB")
+    return rows, regressions
+
+
+def _print_result(key: str, result: dict):
+    if "error" in result:
+        print(f"{key:<58} error: {result['error']}")
+        return
+    print(f"{key:<58} {result['mb_per_s']:10.1f} MB/s  {result['seconds'] * 1000:10.3f} ms  "
+          f"peak {result['peak_bytes'] / 1024 ** 2:8.1f} MB")
+
+
+def _load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _report_comparison(baseline: dict, current: dict, threshold: float, memory_threshold: float) -> int:
+    rows, regressions = compare(baseline, current, threshold, memory_threshold)
+    for key, old, new, change in rows:
+        flag = "  REGRESSION" if change < -threshold else ""
+        print(f"{key:<58} {old:10.1f} → {new:10.1f} MB/s  {change:+7.1%}{flag}")
+    for regression in regressions:
+        print(f"FAIL {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the throughput and peak memory of CryptoSuite operations.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the suite and optionally write a JSON baseline.")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                            help=f"Comma-separated input sizes, e.g. 1K,1M,1G (default: {DEFAULT_SIZES}).")
+    run_parser.add_argument("--kinds", default="ascii,unicode,binary",
+                            help="Comma-separated input kinds: ascii, unicode, binary (default: all).")
+    run_parser.add_argument("--filter", dest="selected", help="Only run cases whose name contains this text.")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Measurements per case (default: 5).")
+    run_parser.add_argument("--output", "-o", help="Write the report to this JSON file.")
+    run_parser.add_argument("--baseline", help="Compare the run against this JSON baseline.")
+    run_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help=f"Allowed throughput drop, as a fraction (default: {DEFAULT_THRESHOLD}).")
+    run_parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                            help=f"Allowed peak memory growth, as a fraction (default: {DEFAULT_MEMORY_THRESHOLD}).")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two JSON reports and flag regressions.")
+    compare_parser.add_argument("baseline", help="The reference report.")
+    compare_parser.add_argument("current", help="The report to check.")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help=f"Allowed throughput drop, as a fraction (default: {DEFAULT_THRESHOLD}).")
+    compare_parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                                help=f"Allowed peak memory growth, as a fraction "
+                                     f"(default: {DEFAULT_MEMORY_THRESHOLD}).")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        return _report_comparison(_load(args.baseline), _load(args.current), args.threshold,
+                                  args.memory_threshold)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    kinds = [kind.strip() for kind in args.kinds.split(",")]
+    unknown = set(kinds) - {"ascii", "unicode", "binary"}
+    if unknown:
+        parser.error(f"unknown input kind: {sorted(unknown)[0]}")
+    report = run_suite(sizes, kinds, args.repeat, args.selected, log=_print_result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    if args.baseline:
+        print()
+        return _report_comparison(_load(args.baseline), report, args.threshold, args.memory_threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
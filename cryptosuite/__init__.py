@@ -0,0 +1,4 @@
+# File: cryptosuite/__init__.py
+#
+# Headless entry points (python -m cryptosuite ...). Nothing in this package
+# may import the GUI, so it runs on servers without a display.
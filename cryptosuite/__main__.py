@@ -0,0 +1,8 @@
+# File: cryptosuite/__main__.py
+
+import sys
+
+from cryptosuite.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
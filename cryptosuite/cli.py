@@ -0,0 +1,361 @@
+# File: cryptosuite/cli.py
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from operations.detect import detect
+from operations.batch import bake_files, timed, BatchStats, BakeResult
+from operations.parallel import run_parallel, run_parallel_file
+from operations.engine import compile_recipe, RecipeError
+from operations.profiling import run_profiled, format_seconds, format_bytes
+from operations.hashing import hash_files, hash_buffer
+from operations.registry import parse_hash_algorithms
+from operations.optimizer import optimize
+from operations.fanout import fanout, parse_values, vary_all, PREVIEW_LENGTH
+
+
+def load_recipe(path: str) -> list:
+    """Loads a recipe saved by the GUI's 'Save Recipe' button."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _error(message: str) -> int:
+    print(f"cryptosuite: {message}", file=sys.stderr)
+    return 2
+
+
+def _output_path(input_path: str, output_dir: str, suffix: str) -> str:
+    return os.path.join(output_dir, os.path.basename(input_path) + suffix)
+
+
+def cmd_bake(args) -> int:
+    try:
+        recipe_data = load_recipe(args.recipe)
+        pipeline = compile_recipe(recipe_data, optimize=not args.no_optimize)
+    except (OSError, ValueError) as e:
+        return _error(f"cannot load recipe: {e}")
+
+    if not args.inputs or args.inputs == ["-"]:
+        success, result = pipeline.run(sys.stdin.buffer.read())
+        if not success:
+            return _error(result)
+        sys.stdout.buffer.write(result)
+        return 0
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        jobs = [(path, _output_path(path, args.output_dir, args.suffix)) for path in args.inputs]
+    else:
+        jobs = [(path, None) for path in args.inputs]
+
+    if args.split:
+        return _bake_split(pipeline, jobs, args)
+
+    stats = BatchStats()
+    try:
+        results = bake_files(recipe_data, jobs, workers=args.jobs, ordered=not args.unordered,
+                             optimize=not args.no_optimize)
+        for result in timed(results, stats):
+            if not result.success:
+                print(f"{result.path}: {result.error}", file=sys.stderr)
+            elif result.output is not None:
+                sys.stdout.buffer.write(result.output)
+                if not args.no_newline:
+                    sys.stdout.buffer.write(b"\n")
+    except RecipeError as e:
+        return _error(str(e))
+    sys.stdout.flush()
+
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+def _bake_split(pipeline, jobs, args) -> int:
+    """Bakes inputs one after another, splitting each one across the whole worker pool."""
+    stats = BatchStats()
+    start = time.perf_counter()
+    workers = args.jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, output_path in jobs:
+            try:
+                size = os.path.getsize(path)
+                if output_path is not None:
+                    success, result = run_parallel_file(pipeline, path, output_path, workers, executor)
+                    written = result if success else 0
+                else:
+                    with open(path, "rb") as f:
+                        success, result = run_parallel(pipeline, f.read(), workers, executor)
+                    written = len(result) if success else 0
+            except OSError as e:
+                size, success, result, written = 0, False, f"File error: {e}", 0
+
+            if not success:
+                print(f"{path}: {result}", file=sys.stderr)
+            elif output_path is None:
+                sys.stdout.buffer.write(result)
+                if not args.no_newline:
+                    sys.stdout.buffer.write(b"\n")
+            stats.add(BakeResult(path, success, size, written))
+    stats.seconds = time.perf_counter() - start
+    sys.stdout.flush()
+
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+def cmd_explain(args) -> int:
+    try:
+        plan = optimize(compile_recipe(load_recipe(args.recipe)))
+    except (OSError, ValueError) as e:
+        return _error(f"cannot load recipe: {e}")
+    print(plan.explain())
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from cryptosuite.service import run_service
+    return run_service(args.host, args.port, args.unix, args.workers, args.max_batch)
+
+
+def cmd_detect(args) -> int:
+    if args.input and args.input != "-":
+        try:
+            with open(args.input, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            return _error(f"cannot read input: {e}")
+    else:
+        data = sys.stdin.buffer.read()
+
+    candidates = detect(data, max_depth=args.depth, time_budget=args.budget)
+    if args.json:
+        print(json.dumps([{"recipe": c.recipe, "score": c.score, "preview": c.preview} for c in candidates],
+                         indent=4))
+    else:
+        for i, candidate in enumerate(candidates, start=1):
+            print(f"{i}. [{candidate.score:.3f}] {candidate.describe()}: {candidate.preview[:60]!r}")
+    return 0 if candidates else 1
+
+
+def cmd_profile(args) -> int:
+    try:
+        pipeline = compile_recipe(load_recipe(args.recipe))
+    except (OSError, ValueError) as e:
+        return _error(f"cannot load recipe: {e}")
+    if args.input and args.input != "-":
+        try:
+            with open(args.input, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            return _error(f"cannot read input: {e}")
+    else:
+        data = sys.stdin.buffer.read()
+
+    success, result, profile = run_profiled(pipeline, data, trace_memory=args.memory)
+    if args.trace:
+        try:
+            profile.save_trace(args.trace)
+        except OSError as e:
+            return _error(f"cannot write trace: {e}")
+    if args.json:
+        print(json.dumps(profile.to_chrome_trace()["otherData"]["steps"], indent=4))
+    else:
+        print(f"{'#':>2}  {'step':<20} {'wall':>10} {'cpu':>10} {'in':>10} {'out':>10} {'throughput':>12}"
+              f" {'blocks':>8}" + (f" {'peak':>10}" if args.memory else ""))
+        for step in profile.steps:
+            print(f"{step.index + 1:>2}  {step.name:<20} {format_seconds(step.wall):>10} {format_seconds(step.cpu):>10}"
+                  f" {format_bytes(step.bytes_in):>10} {format_bytes(step.bytes_out):>10}"
+                  f" {format_bytes(step.throughput) + '/s':>12} {step.allocated_blocks:>+8,}"
+                  + (f" {format_bytes(step.peak_bytes):>10}" if args.memory else ""))
+            if step.note:
+                print(f"    {step.note}")
+        print(f"    {'total':<20} {format_seconds(profile.wall):>10} {format_seconds(profile.cpu):>10}")
+    if not success:
+        return _error(result)
+    return 0
+
+
+def load_recipes(paths: list) -> list:
+    """Loads recipes from files holding either one recipe or a list of recipes."""
+    recipes = []
+    for path in paths:
+        data = load_recipe(path)
+        if isinstance(data, list) and data and all(isinstance(item, list) for item in data):
+            recipes.extend(data)
+        else:
+            recipes.append(data)
+    return recipes
+
+
+def cmd_fanout(args) -> int:
+    try:
+        recipes = load_recipes(args.recipe)
+    except (OSError, ValueError) as e:
+        return _error(f"cannot load recipe: {e}")
+    variations = {}
+    for spec in args.vary or ():
+        name, separator, values = spec.partition("=")
+        if not separator or not name.strip() or not parse_values(values):
+            return _error(f"invalid --vary '{spec}': expected NAME=VALUES, e.g. shift=1-25")
+        variations[name.strip()] = parse_values(values)
+    recipes = vary_all(recipes, variations)
+    if args.input and args.input != "-":
+        try:
+            with open(args.input, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            return _error(f"cannot read input: {e}")
+    else:
+        data = sys.stdin.buffer.read()
+
+    results, stats = fanout(recipes, data, workers=args.jobs, optimize=not args.no_optimize,
+                            keep_outputs=bool(args.output_dir), preview_length=args.preview)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        width = len(str(len(results)))
+        for result in results:
+            if result.success:
+                with open(os.path.join(args.output_dir, f"{result.index + 1:0{width}}.out"), "wb") as f:
+                    f.write(result.output)
+    if args.json:
+        print(json.dumps([{"recipe": recipes[r.index], "description": r.description, "success": r.success,
+                           "seconds": r.seconds, "output_size": r.output_size,
+                           "preview": r.preview(args.preview) if r.success else None, "error": r.error}
+                          for r in results], indent=4))
+    else:
+        width = min(max((len(r.description) for r in results), default=6), 60)
+        print(f"{'#':>3}  {'recipe':<{width}} {'time':>10} {'size':>10}  preview")
+        for r in results:
+            description = r.description if len(r.description) <= width else r.description[:width - 1] + "…"
+            size = format_bytes(r.output_size) if r.success else "failed"
+            print(f"{r.index + 1:>3}  {description:<{width}} {format_seconds(r.seconds):>10} {size:>10}  "
+                  f"{r.preview(args.preview)}")
+    if not args.quiet:
+        print(f"{stats.recipes} recipes in {format_seconds(stats.wall)} on {stats.workers} process(es): "
+              f"{stats.steps_run} steps run instead of {stats.steps_total} "
+              f"({stats.steps_saved} saved by sharing prefixes)", file=sys.stderr)
+    return 0 if any(r.success for r in results) else 1
+
+
+def cmd_hash(args) -> int:
+    try:
+        algorithms = parse_hash_algorithms(args.algorithms)
+    except RecipeError as e:
+        return _error(str(e))
+
+    if not args.inputs or args.inputs == ["-"]:
+        results = [("-", hash_buffer(sys.stdin.buffer.read(), algorithms), None)]
+    else:
+        results = ((r.path, r.digests, r.error) for r in hash_files(args.inputs, algorithms, workers=args.jobs))
+
+    failed, report = 0, []
+    for path, digests, error in results:
+        if error is not None:
+            failed += 1
+            print(f"{path}: {error}", file=sys.stderr)
+        elif args.json:
+            report.append({"path": path, "digests": digests})
+        elif len(digests) == 1:
+            # The same layout as sha256sum and friends, so the output can be checked with them.
+            print(f"{next(iter(digests.values()))}  {path}")
+        else:
+            for name, digest in digests.items():
+                print(f"{name.upper()} ({path}) = {digest}")
+    if args.json:
+        print(json.dumps(report, indent=4))
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cryptosuite", description="Headless CryptoSuite recipe runner.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    bake = subparsers.add_parser("bake", help="Apply a saved recipe to files or stdin.")
+    bake.add_argument("--recipe", "-r", required=True, help="Recipe JSON file written by 'Save Recipe'.")
+    bake.add_argument("inputs", nargs="*", help="Input files; omit or use '-' to read stdin.")
+    bake.add_argument("--output-dir", "-o", help="Write one output file per input here instead of stdout.")
+    bake.add_argument("--suffix", default=".out", help="Suffix appended to output file names (default: .out).")
+    bake.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes (default: CPU count).")
+    bake.add_argument("--unordered", action="store_true", help="Emit results as soon as they finish.")
+    bake.add_argument("--split", action="store_true",
+                      help="Split each input into aligned segments baked across all workers (for large files).")
+    bake.add_argument("--no-newline", action="store_true", help="Do not separate stdout results with newlines.")
+    bake.add_argument("--quiet", "-q", action="store_true", help="Do not print the throughput summary.")
+    bake.add_argument("--no-optimize", action="store_true",
+                      help="Run every step as written instead of removing inverse pairs and fusing shifts.")
+    bake.set_defaults(func=cmd_bake)
+
+    detect_parser = subparsers.add_parser("detect", help="Suggest decoding recipes for an unknown input.")
+    detect_parser.add_argument("input", nargs="?", help="Input file; omit or use '-' to read stdin.")
+    detect_parser.add_argument("--depth", type=int, default=4, help="Maximum stacked decodings (default: 4).")
+    detect_parser.add_argument("--budget", type=float, default=0.05, help="Search time budget in seconds.")
+    detect_parser.add_argument("--json", action="store_true", help="Print candidates as JSON recipes.")
+    detect_parser.set_defaults(func=cmd_detect)
+
+    explain_parser = subparsers.add_parser("explain", help="Show how the optimizer rewrites a recipe.")
+    explain_parser.add_argument("--recipe", "-r", required=True, help="Recipe JSON file written by 'Save Recipe'.")
+    explain_parser.set_defaults(func=cmd_explain)
+
+    serve_parser = subparsers.add_parser("serve", help="Run a local HTTP bake service for other tools.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1).")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port (default: 8765).")
+    serve_parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP.")
+    serve_parser.add_argument("--workers", "-j", type=int, default=None,
+                              help="Worker processes (default: CPU count).")
+    serve_parser.add_argument("--max-batch", type=int, default=256,
+                              help="Most small requests baked in one worker call (default: 256).")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    fanout_parser = subparsers.add_parser("fanout", help="Bake many recipes over one input, sharing common prefixes.")
+    fanout_parser.add_argument("--recipe", "-r", action="append", required=True,
+                               help="Recipe JSON file, or a file holding a list of recipes; may be repeated.")
+    fanout_parser.add_argument("input", nargs="?", help="Input file; omit or use '-' to read stdin.")
+    fanout_parser.add_argument("--vary", action="append", metavar="NAME=VALUES",
+                               help="Expand every step with this parameter into one recipe per value, "
+                                    "e.g. shift=1-25 or level=1,6,9; may be repeated.")
+    fanout_parser.add_argument("--jobs", "-j", type=int, default=None,
+                               help="Worker processes for large inputs (default: CPU count).")
+    fanout_parser.add_argument("--preview", type=int, default=PREVIEW_LENGTH,
+                               help=f"Characters of each output to show (default: {PREVIEW_LENGTH}).")
+    fanout_parser.add_argument("--output-dir", "-o", help="Also write every output here, as 01.out, 02.out, ...")
+    fanout_parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    fanout_parser.add_argument("--quiet", "-q", action="store_true", help="Do not print the summary.")
+    fanout_parser.add_argument("--no-optimize", action="store_true",
+                               help="Run every step as written instead of optimizing each recipe first.")
+    fanout_parser.set_defaults(func=cmd_fanout)
+
+    hash_parser = subparsers.add_parser("hash", help="Compute one or more digests of files in a single pass each.")
+    hash_parser.add_argument("inputs", nargs="*", help="Input files; omit or use '-' to read stdin.")
+    hash_parser.add_argument("--algorithms", "-a", default="sha256",
+                             help="Comma-separated digests, e.g. md5,sha1,sha256,sha512,blake2b (default: sha256).")
+    hash_parser.add_argument("--jobs", "-j", type=int, default=None,
+                             help="Files hashed concurrently (default: Python's thread pool size).")
+    hash_parser.add_argument("--json", action="store_true", help="Print the digests as JSON.")
+    hash_parser.set_defaults(func=cmd_hash)
+
+    profile_parser = subparsers.add_parser("profile", help="Time every step of a recipe on one input.")
+    profile_parser.add_argument("--recipe", "-r", required=True, help="Recipe JSON file written by 'Save Recipe'.")
+    profile_parser.add_argument("input", nargs="?", help="Input file; omit or use '-' to read stdin.")
+    profile_parser.add_argument("--trace", help="Also write a Chrome/Perfetto trace JSON file here.")
+    profile_parser.add_argument("--memory", action="store_true", help="Trace each step's peak memory (slower).")
+    profile_parser.add_argument("--json", action="store_true", help="Print the step measurements as JSON.")
+    profile_parser.set_defaults(func=cmd_profile)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`): stop quietly. Point stdout at devnull
+        # so the interpreter's final flush does not fail on the closed pipe again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
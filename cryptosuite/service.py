@@ -0,0 +1,483 @@
+# File: cryptosuite/service.py
+#
+# A local bake service: other tools POST a payload and get the baked bytes back
+# instead of spawning `python -m cryptosuite bake` per call.
+#
+#   POST /recipes          body: recipe JSON (as written by 'Save Recipe') -> {"id": ..., "steps": n}
+#   POST /bake/<id>        body: payload -> baked bytes
+#   POST /bake             body: payload, header X-Recipe: <recipe JSON> -> baked bytes (+ X-Recipe-Id)
+#   GET  /health, /stats
+#
+# Failed bakes answer 422 with the error message as text/plain.
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from operations.engine import compile_recipe, RecipeError
+from operations.stream import stream_path
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Payloads up to this size are queued for micro-batching; larger ones get a worker call of their own.
+BATCH_MAX_BYTES = 64 * 1024
+BATCH_MAX_JOBS = 256
+# Bodies above this size are spooled to a temp file and baked (and sent back) as a stream.
+STREAM_THRESHOLD = 8 * 1024 * 1024
+MAX_BODY_SIZE = 16 * 1024 ** 3
+RECIPE_CACHE_SIZE = 1024
+IO_CHUNK_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 64 * 1024
+
+_REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 422: "Unprocessable Entity",
+            500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def recipe_id(recipe_data) -> str:
+    """The content hash a recipe is cached under: equal recipes get the same id whatever their formatting."""
+    canonical = json.dumps(recipe_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class RecipeCache:
+    """An LRU of validated recipes by content hash, so each one is compiled once, not once per request."""
+
+    def __init__(self, max_size: int = RECIPE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, recipe_data) -> str:
+        """Compiles and caches a recipe, returning its id. Raises RecipeError if it is invalid."""
+        rid = recipe_id(recipe_data)
+        if rid in self._entries:
+            self._entries.move_to_end(rid)
+            return rid
+        pipeline = compile_recipe(recipe_data, optimize=True)
+        self._entries[rid] = (recipe_data, pipeline)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return rid
+
+    def get(self, rid: str):
+        entry = self._entries.get(rid)
+        if entry is not None:
+            self._entries.move_to_end(rid)
+        return entry
+
+
+# --- Worker side (runs in the process pool) ---
+
+# Per-process cache of compiled recipes, keyed by recipe id.
+_compiled = {}
+
+
+def _worker_pipeline(rid: str, recipe_data):
+    pipeline = _compiled.get(rid)
+    if pipeline is None:
+        if len(_compiled) >= RECIPE_CACHE_SIZE:
+            _compiled.clear()
+        pipeline = _compiled[rid] = compile_recipe(recipe_data, optimize=True)
+    return pipeline
+
+
+def bake_batch(jobs) -> list:
+    """
+    Worker: bakes a batch of (recipe id, recipe data, payload) jobs in one call.
+
+    Returns:
+        One (success, result or error message, seconds) tuple per job, in order.
+        A failing job never affects the others in its batch.
+    """
+    results = []
+    for rid, recipe_data, payload in jobs:
+        start = time.perf_counter()
+        try:
+            success, result = _worker_pipeline(rid, recipe_data).run(payload)
+            if success:
+                result = bytes(result)
+        except Exception as e:
+            success, result = False, f"Internal error: {e}"
+        results.append((success, result, time.perf_counter() - start))
+    return results
+
+
+def bake_spooled(rid: str, recipe_data, input_path: str, output_path: str) -> tuple:
+    """Worker: streams a spooled request body through the recipe into an output file."""
+    start = time.perf_counter()
+    success, result = stream_path(_worker_pipeline(rid, recipe_data), input_path, output_path)
+    return success, result, time.perf_counter() - start
+
+
+# --- Event loop side ---
+
+class MicroBatcher:
+    """
+    Coalesces small bake requests into one worker call per batch.
+
+    While fewer batches are in flight than there are workers, whatever arrived
+    during the current event loop tick is sent at once, so an idle service adds
+    no latency. Once every worker is busy, requests queue up and leave as one
+    batch (of up to `max_jobs`) as soon as a worker frees up: the busier the
+    service, the larger the batches and the lower the per-request overhead.
+    """
+
+    def __init__(self, executor, workers: int, max_jobs: int = BATCH_MAX_JOBS):
+        self.executor = executor
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.in_flight = 0
+        self.batches = 0
+        self.batched_jobs = 0
+        self._pending = []
+        self._scheduled = False
+
+    def submit(self, job) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((job, future))
+        if not self._scheduled and self.in_flight < self.workers:
+            self._scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        self._scheduled = False
+        while self._pending and self.in_flight < self.workers:
+            batch, self._pending = self._pending[:self.max_jobs], self._pending[self.max_jobs:]
+            self.in_flight += 1
+            self.batches += 1
+            self.batched_jobs += len(batch)
+            done = asyncio.get_running_loop().run_in_executor(self.executor, bake_batch,
+                                                              [job for job, _ in batch])
+            done.add_done_callback(lambda done, batch=batch: self._finished(batch, done))
+
+    def _finished(self, batch, done):
+        self.in_flight -= 1
+        error = done.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[index])
+        self._flush()
+
+
+async def read_head(reader) -> tuple:
+    """Reads a request or status line and its headers. Returns (first line, headers), or None at EOF."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "Incomplete request head.")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(400, "Request head too large.")
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    return lines[0], headers
+
+
+def content_length(headers: dict) -> int:
+    """The declared body size (0 without a Content-Length header); raises HTTPError 400 if malformed."""
+    value = headers.get("content-length", "") or "0"
+    if not value.isdigit():
+        raise HTTPError(400, "Invalid Content-Length")
+    return int(value)
+
+
+def _chunk_size(line: bytes) -> int:
+    """Parses a chunked-encoding size line ('1a2b;ext=1'); raises HTTPError 400 if malformed."""
+    digits = line.split(b";")[0].strip()
+    if not digits or digits.strip(b"0123456789abcdefABCDEF"):
+        raise HTTPError(400, "Invalid chunk size")
+    return int(digits, 16)
+
+
+async def iter_body(reader, headers: dict):
+    """Yields a message body in chunks, from Content-Length or chunked transfer encoding."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = _chunk_size(await reader.readuntil(b"\r\n"))
+            if size == 0:
+                await reader.readuntil(b"\r\n")
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    remaining = content_length(headers)
+    while remaining > 0:
+        chunk = await reader.readexactly(min(remaining, IO_CHUNK_SIZE))
+        remaining -= len(chunk)
+        yield chunk
+
+
+class BakeService:
+    """The HTTP front end: parses requests on the event loop and sends all recipe work to the pool."""
+
+    def __init__(self, workers: int = None, max_batch: int = BATCH_MAX_JOBS,
+                 stream_threshold: int = STREAM_THRESHOLD):
+        self.workers = workers or os.cpu_count() or 1
+        # Workers are started on demand; forked straight from this process they would inherit the open
+        # client sockets, and a connection the service closes would stay open until the worker exits.
+        context = multiprocessing.get_context("forkserver" if os.name == "posix" else "spawn")
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self.batcher = MicroBatcher(self.executor, self.workers, max_batch)
+        self.recipes = RecipeCache()
+        self.stream_threshold = stream_threshold
+        self.started = time.time()
+        self.stats = {"requests": 0, "bakes": 0, "failed_bakes": 0, "streamed": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """Serves one connection, with keep-alive, until the client closes it."""
+        try:
+            while True:
+                try:
+                    request = await read_head(reader)
+                    if request is None:
+                        break
+                    keep_alive = await self._dispatch(request, reader, writer)
+                except HTTPError as e:
+                    await self._send(writer, e.status, str(e).encode("utf-8") + b"\n", keep_alive=False)
+                    break
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request, reader, writer) -> bool:
+        (request_line, headers) = request
+        method, _, rest = request_line.partition(" ")
+        path = rest.rpartition(" ")[0].split("?")[0]
+        self.stats["requests"] += 1
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if headers.get("expect", "").lower() == "100-continue":
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+
+        if method == "GET" and path == "/health":
+            await self._send_json(writer, 200, {"status": "ok"}, keep_alive)
+        elif method == "GET" and path == "/stats":
+            await self._send_json(writer, 200, self.snapshot(), keep_alive)
+        elif method == "POST" and path == "/recipes":
+            body = await self._read_small_body(reader, headers)
+            try:
+                recipe_data = json.loads(body)
+                rid = self.recipes.add(recipe_data)
+            except (ValueError, RecipeError) as e:
+                raise HTTPError(400, f"Invalid recipe: {e}")
+            await self._send_json(writer, 201, {"id": rid, "steps": len(recipe_data)}, keep_alive)
+        elif method == "POST" and (path == "/bake" or path.startswith("/bake/")):
+            await self._bake(path, reader, writer, headers, keep_alive)
+        elif path in ("/health", "/stats", "/recipes", "/bake") or path.startswith("/bake/"):
+            raise HTTPError(405, f"{method} is not allowed on {path}.")
+        else:
+            raise HTTPError(404, f"No such endpoint: {path}")
+        return keep_alive
+
+    def _resolve_recipe(self, path: str, headers: dict) -> tuple:
+        if path == "/bake":
+            if "x-recipe" not in headers:
+                raise HTTPError(400, "POST /bake needs an X-Recipe header, or use /bake/<id>.")
+            try:
+                rid = self.recipes.add(json.loads(headers["x-recipe"]))
+            except (ValueError, RecipeError) as e:
+                raise HTTPError(400, f"Invalid recipe: {e}")
+        else:
+            rid = path[len("/bake/"):]
+        entry = self.recipes.get(rid)
+        if entry is None:
+            raise HTTPError(404, f"Unknown recipe id '{rid}'; POST it to /recipes first.")
+        return rid, entry[0]
+
+    async def _bake(self, path, reader, writer, headers, keep_alive):
+        rid, recipe_data = self._resolve_recipe(path, headers)
+        payload, spooled = await self._read_body(reader, headers)
+        try:
+            if spooled is not None:
+                await self._bake_streamed(rid, recipe_data, spooled, writer, keep_alive)
+                return
+            job = (rid, recipe_data, payload)
+            try:
+                if len(payload) <= BATCH_MAX_BYTES:
+                    success, result, seconds = await self.batcher.submit(job)
+                else:
+                    loop = asyncio.get_running_loop()
+                    success, result, seconds = (await loop.run_in_executor(self.executor, bake_batch, [job]))[0]
+            except BrokenProcessPool:
+                raise HTTPError(503, "The worker pool has crashed.")
+            self._count(success, len(payload), len(result) if success else 0)
+            if not success:
+                await self._send(writer, 422, result.encode("utf-8") + b"\n", keep_alive)
+                return
+            await self._send(writer, 200, result, keep_alive, content_type="application/octet-stream",
+                             extra={"X-Recipe-Id": rid, "X-Bake-Seconds": f"{seconds:.6f}"})
+        finally:
+            if spooled is not None:
+                os.unlink(spooled)
+
+    async def _bake_streamed(self, rid, recipe_data, input_path, writer, keep_alive):
+        """Bakes a spooled body file to file in a worker, then streams the result back in chunks."""
+        self.stats["streamed"] += 1
+        fd, output_path = tempfile.mkstemp(prefix="cryptosuite-out-")
+        os.close(fd)
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                success, result, seconds = await loop.run_in_executor(self.executor, bake_spooled, rid,
+                                                                      recipe_data, input_path, output_path)
+            except BrokenProcessPool:
+                raise HTTPError(503, "The worker pool has crashed.")
+            self._count(success, os.path.getsize(input_path), result if success else 0)
+            if not success:
+                await self._send(writer, 422, result.encode("utf-8") + b"\n", keep_alive)
+                return
+            head = self._head(200, keep_alive, "application/octet-stream",
+                              {"Transfer-Encoding": "chunked", "X-Recipe-Id": rid,
+                               "X-Bake-Seconds": f"{seconds:.6f}"})
+            writer.write(head)
+            with open(output_path, "rb") as f:
+                while chunk := await asyncio.to_thread(f.read, IO_CHUNK_SIZE):
+                    writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        finally:
+            os.unlink(output_path)
+
+    async def _read_body(self, reader, headers) -> tuple:
+        """
+        Reads a request body into memory, or into a temp file once it grows
+        past the stream threshold. Returns (bytes, None) or (None, temp path).
+        """
+        declared = content_length(headers)
+        if declared > MAX_BODY_SIZE:
+            raise HTTPError(413, f"Bodies are limited to {MAX_BODY_SIZE:,} bytes.")
+        buffer, spool, size = bytearray(), None, 0
+        try:
+            async for chunk in iter_body(reader, headers):
+                size += len(chunk)
+                if size > MAX_BODY_SIZE:
+                    raise HTTPError(413, f"Bodies are limited to {MAX_BODY_SIZE:,} bytes.")
+                if spool is None and size > self.stream_threshold:
+                    spool = tempfile.NamedTemporaryFile(prefix="cryptosuite-in-", delete=False)
+                    spool.write(buffer)
+                    buffer = None
+                if spool is not None:
+                    await asyncio.to_thread(spool.write, chunk)
+                else:
+                    buffer += chunk
+        except BaseException:
+            if spool is not None:
+                spool.close()
+                os.unlink(spool.name)
+            raise
+        if spool is not None:
+            spool.close()
+            return None, spool.name
+        return bytes(buffer), None
+
+    async def _read_small_body(self, reader, headers) -> bytes:
+        body = bytearray()
+        async for chunk in iter_body(reader, headers):
+            body += chunk
+            if len(body) > MAX_HEADER_SIZE * 16:
+                raise HTTPError(413, "Recipe too large.")
+        return bytes(body)
+
+    def _count(self, success: bool, bytes_in: int, bytes_out: int):
+        self.stats["bakes"] += 1
+        self.stats["bytes_in"] += bytes_in
+        self.stats["bytes_out"] += bytes_out
+        if not success:
+            self.stats["failed_bakes"] += 1
+
+    def snapshot(self) -> dict:
+        batches = self.batcher.batches
+        return dict(self.stats, workers=self.workers, recipes_cached=len(self.recipes), batches=batches,
+                    batched_requests=self.batcher.batched_jobs,
+                    mean_batch_size=round(self.batcher.batched_jobs / batches, 2) if batches else 0.0,
+                    uptime=round(time.time() - self.started, 3))
+
+    @staticmethod
+    def _head(status: int, keep_alive: bool, content_type: str, extra: dict) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{name}: {value}" for name, value in extra.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer, status: int, body: bytes, keep_alive: bool,
+                    content_type: str = "text/plain; charset=utf-8", extra: dict = None):
+        writer.write(self._head(status, keep_alive, content_type, dict(extra or {}, **{"Content-Length": len(body)})))
+        writer.write(body)
+
+    async def _send_json(self, writer, status: int, data: dict, keep_alive: bool):
+        await self._send(writer, status, json.dumps(data).encode("utf-8"), keep_alive, "application/json")
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None, workers: int = None,
+                max_batch: int = BATCH_MAX_JOBS, ready=None):
+    """
+    Runs the service until cancelled. `ready`, if given, is called with a
+    description of the listening address once the socket is bound.
+    """
+    service = BakeService(workers, max_batch)
+    try:
+        if unix_path:
+            server = await asyncio.start_unix_server(service.handle, path=unix_path, limit=MAX_HEADER_SIZE)
+            address = unix_path
+        else:
+            server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_SIZE)
+            address = "http://%s:%d" % server.sockets[0].getsockname()[:2]
+        try:
+            # Stop cleanly (shutting the pool down) on SIGTERM as well as Ctrl+C.
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows event loops have no signal handlers.
+        if ready is not None:
+            ready(address)
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+        if unix_path and os.path.exists(unix_path):
+            os.unlink(unix_path)
+
+
+def run_service(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: str = None, workers: int = None,
+                max_batch: int = BATCH_MAX_JOBS) -> int:
+    def ready(address):
+        print(f"cryptosuite: serving on {address} with {workers or os.cpu_count()} worker(s)", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(host, port, unix_path, workers, max_batch, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    return 0
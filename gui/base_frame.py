@@ -1,11 +1,33 @@
 # File: gui/base_frame.py
 
 import customtkinter
-import pyperclip
+import codecs
 import json
-import threading
+import os
 import queue
-from tkinter import filedialog
+import tkinter
+from dataclasses import replace
+from operations.engine import compile_recipe, RecipeError
+from operations.registry import registry
+from operations.cache import StepCache
+from operations.optimizer import optimize, describe_step
+from operations.progress import ProgressThrottle, format_eta
+from operations.executor import LatestWinsExecutor
+from operations.profiling import run_profiled, format_seconds, format_bytes
+from operations.incremental import IncrementalBaker
+from operations.sources import FileSource, LARGE_INPUT_THRESHOLD, open_input
+from gui.output_viewer import OutputViewer
+from gui.recipe_list import RecipeList
+from operations.recipe import Recipe
+from gui.result_buffer import ResultBuffer
+from gui.text_dialog import TextDialog
+
+# Larger outputs are too big for the clipboard and must be saved to a file instead.
+COPY_LIMIT = 64 * 1024 * 1024
+# Virtual event a worker thread generates to tell the UI thread that results are waiting.
+RESULT_EVENT = "<<WorkerResult>>"
+# Live preview waits for a pause in typing this long before re-baking.
+LIVE_DEBOUNCE_MS = 150
 
 
 class BaseFrame(customtkinter.CTkFrame):
@@ -17,8 +39,25 @@ class BaseFrame(customtkinter.CTkFrame):
 
         # --- Core Attributes ---
         self.current_step_index = 0
-        self.recipe_placeholder = None
-        self.result_queue = queue.Queue()
+        # The recipe being edited; the step list is only a view of it.
+        self.recipe = Recipe()
+        self.recipe.subscribe(self.on_recipe_changed)
+        # One long-lived worker thread per kind of job: a new Bake or Step supersedes the previous one,
+        # and live re-bakes never cancel a bake. Results come back through RESULT_EVENT.
+        self.results = queue.Queue()
+        self.executor = LatestWinsExecutor(self.post_result, name="bake")
+        self.live_executor = LatestWinsExecutor(self.post_result, name="live")
+        self.app.bind(RESULT_EVENT, self.on_worker_result, add="+")
+        # A large file attached by "Open"; while set, the input box only shows its summary.
+        self.input_source = None
+        # Per-step measurements of the last full bake, for the inline stats and trace export.
+        self.last_profile = None
+        # Intermediate results for Step mode, so each click only runs the new step.
+        self.step_cache = StepCache()
+        # Live preview: the baker keeps the last input and output to re-bake only what an edit touched.
+        # Built and used on the live executor's thread only.
+        self.live_baker = None
+        self.live_job = None
 
         # --- Layout Configuration ---
         self.grid_columnconfigure(0, weight=2, minsize=200)
@@ -31,193 +70,392 @@ class BaseFrame(customtkinter.CTkFrame):
         self.create_operations_sidebar()
         self.create_recipe_panel()
         self.create_io_panel()
-        self.update_recipe_placeholder()
 
     # --- Threading and Processing Logic (Common to both frames) ---
 
     def set_processing_state(self, is_processing: bool):
-        """Disables/Enables buttons during processing."""
-        state = "disabled" if is_processing else "normal"
-        self.bake_button.configure(state=state)
-        self.step_button.configure(state=state)
+        """Enables Cancel while a job runs; Bake and Step stay enabled and supersede the running job."""
+        self.cancel_button.configure(state="normal" if is_processing else "disabled")
         if is_processing:
             self.status_bar.configure(text="Processing... Please wait.", text_color="orange")
 
     def reset_step_state(self, event=None):
         self.current_step_index = 0
-        for widget in self.recipe_scrollable_frame.winfo_children():
-            if isinstance(widget, customtkinter.CTkFrame):
-                widget.configure(border_width=0)
+        self.recipe_list.highlight(None)
         self.status_bar.configure(text="Ready", text_color="gray70")
 
+    def on_recipe_changed(self, change):
+        if change.structural:
+            self.reset_step_state()
+            self.schedule_live_bake()
+
+    def get_recipe_data(self) -> list:
+        """Returns the recipe in the JSON format used by 'Save Recipe'."""
+        return self.recipe.to_data()
+
+    def get_input(self):
+        """Returns the attached FileSource, or the text typed or pasted into the input box."""
+        if self.input_source is not None:
+            return self.input_source
+        return self.input_textbox.get("1.0", "end-1c")
+
+    def compile_current_recipe(self):
+        """Compiles the recipe panel on the UI thread; shows a toast and returns None on failure."""
+        try:
+            return compile_recipe(self.get_recipe_data())
+        except RecipeError as e:
+            self.app.show_toast("Recipe Error", str(e), toast_type="error")
+            self.reset_step_state()
+            return None
+
     def process_step(self):
-        """Starts step-by-step processing in a background thread."""
+        """Runs the next step on the step executor; a click while one runs restarts it with the current input."""
+        if not self.get_recipe_data():
+            self.app.show_toast("Recipe Error", "Please add an operation.", toast_type="error")
+            return
+        pipeline = self.compile_current_recipe()
+        if pipeline is None: return
+        if self.current_step_index >= len(pipeline):
+            self.status_bar.configure(text="End of recipe reached. Resetting.", text_color="gray70")
+            self.reset_step_state()
+            return
+
         self.set_processing_state(True)
-        thread = threading.Thread(target=self._worker_process_step)
-        thread.daemon = True
-        thread.start()
-        self.after(100, self.check_queue)
+        self.executor.submit(self._worker_process_step, pipeline, self.get_input(), self.current_step_index)
 
     def bake_recipe(self):
-        """Starts full recipe processing in a background thread."""
-        self.set_processing_state(True)
-        thread = threading.Thread(target=self._worker_bake_recipe)
-        thread.daemon = True
-        thread.start()
-        self.after(100, self.check_queue)
-
-    def _worker_process_step(self):
-        """Worker function for step processing (runs in background)."""
-        recipe_steps = [child for child in self.recipe_scrollable_frame.winfo_children() if
-                        isinstance(child, customtkinter.CTkFrame)]
-        if not recipe_steps:
-            self.result_queue.put(("error", ("Recipe Error", "Please add an operation.")))
+        """Bakes on the frame's executor; a new bake supersedes one still running."""
+        self.reset_step_state()
+        input_data = self.get_input()
+        if not input_data:
+            self.app.show_toast("Input Error", "The input field is empty.", toast_type="error")
             return
-
-        if self.current_step_index >= len(recipe_steps):
-            self.result_queue.put(("reset", "End of recipe reached. Resetting."))
+        if not self.get_recipe_data():
+            self.app.show_toast("Recipe Error", "Please add at least one operation.", toast_type="error")
             return
+        pipeline = self.compile_current_recipe()
+        if pipeline is None: return
+        # Bakes skip the passes the optimizer can prove useless; Step mode runs the recipe as written.
+        plan = optimize(pipeline)
 
-        current_data = self.input_textbox.get("1.0", "end-1c")
-
-        for i in range(self.current_step_index + 1):
-            step_frame = recipe_steps[i]
-            operation_name = step_frame.op_name
-            success, current_data = self.execute_operation(operation_name, current_data, step_frame)
-            if not success:
-                self.result_queue.put(
-                    ("error", ("Processing Failed", f"Step '{operation_name}' failed: {current_data}")))
-                return
+        self.set_processing_state(True)
+        self.executor.submit(self._worker_bake_recipe, plan, input_data, bool(self.memory_switch.get()))
 
-        self.result_queue.put(("step_success", (current_data, self.current_step_index)))
+    # --- Live Preview ---
 
-    def _worker_bake_recipe(self):
-        """Worker function for baking (runs in background)."""
+    def on_input_edited(self, event=None):
         self.reset_step_state()
-        current_data = self.input_textbox.get("1.0", "end-1c")
-        recipe_steps = [child for child in self.recipe_scrollable_frame.winfo_children() if
-                        isinstance(child, customtkinter.CTkFrame)]
+        self.schedule_live_bake()
 
-        if not current_data:
-            self.result_queue.put(("error", ("Input Error", "The input field is empty.")))
+    def toggle_live(self):
+        if self.live_switch.get():
+            self.schedule_live_bake()
             return
-        if not recipe_steps:
-            self.result_queue.put(("error", ("Recipe Error", "Please add at least one operation.")))
+        if self.live_job is not None:
+            self.after_cancel(self.live_job)
+            self.live_job = None
+        self.live_executor.cancel()
+        self.live_baker = None
+
+    def schedule_live_bake(self, event=None):
+        """Restarts the debounce timer, so a burst of keystrokes causes a single re-bake."""
+        if not self.live_switch.get():
             return
+        if self.live_job is not None:
+            self.after_cancel(self.live_job)
+        self.live_job = self.after(LIVE_DEBOUNCE_MS, self.live_bake)
+
+    def live_bake(self):
+        """Re-bakes the input on the live executor, superseding a re-bake of older text."""
+        self.live_job = None
+        if self.input_source is not None:
+            self.status_bar.configure(text="Live preview is off for memory-mapped files; use Bake.",
+                                      text_color="gray70")
+            return
+        recipe_data = self.get_recipe_data()
+        if not recipe_data:
+            return
+        try:
+            pipeline = compile_recipe(recipe_data, optimize=True)
+        except RecipeError as e:
+            # Usually a parameter that is still being typed: say so quietly instead of a toast.
+            self.status_bar.configure(text=f"Live: {e}", text_color="orange")
+            return
+        self.live_executor.submit(self._worker_live_bake, pipeline, self.input_textbox.get("1.0", "end-1c"))
+
+    def _worker_live_bake(self, job, pipeline, text):
+        """Worker function for live preview (runs in background, never touches widgets)."""
+        # The baker is built here rather than on the UI thread: setting it up may plan or build stages,
+        # which must not stall typing. The UI thread only ever drops it (sets it to None).
+        baker = self.live_baker
+        if baker is None or baker.pipeline.fingerprints != pipeline.fingerprints:
+            baker = self.live_baker = IncrementalBaker(pipeline)
+        # The executor runs one job at a time, so the baker never sees two bakes at once. A superseded
+        # bake still finishes (it only re-bakes the edited blocks) and leaves the baker up to date.
+        success, result = baker.bake(text)
+        if not success:
+            job.report("live_error", result)
+        elif isinstance(result, bytearray):
+            # The baker splices later edits into this same array, under its lock.
+            job.report("live_success", (ResultBuffer.live(result, baker.lock), baker))
+        else:
+            job.report("live_success", (ResultBuffer.from_bytes(bytes(result)), baker))
+
+    def show_live_result(self, buffer, baker):
+        if not self.live_switch.get() or baker is not self.live_baker:
+            return  # Switched off, or the recipe changed while this ran: the result is stale.
+        self.show_output(buffer)
+        update = baker.last_update
+        if update.incremental:
+            text = (f"Live: re-baked {format_bytes(update.rebaked)} of {format_bytes(update.input_size)} "
+                    f"in {format_seconds(update.seconds)}.")
+        elif baker.block_local:
+            text = f"Live: baked {format_bytes(update.input_size)} in {format_seconds(update.seconds)}."
+        else:
+            text = (f"Live: full re-bake in {format_seconds(update.seconds)} "
+                    f"(the recipe has a step that is not block-local).")
+        self.status_bar.configure(text=text, text_color="gray70")
+
+    def cancel_processing(self):
+        """Asks the worker to stop; it notices before its next chunk and reports back as "cancelled"."""
+        self.executor.cancel()
+        self.cancel_button.configure(state="disabled")
+        self.status_bar.configure(text="Cancelling...", text_color="orange")
+
+    def _progress_reporter(self, job, pipeline):
+        """Builds the coalescing progress callback a worker hands to the engine, in recipe panel step indices."""
+        origins = pipeline.origins
+        return ProgressThrottle(lambda reports: job.report(
+            "progress", tuple(replace(progress, step_index=origins[progress.step_index][0]) for progress in reports)))
+
+    def _worker_process_step(self, job, pipeline, input_data, step_index):
+        """Worker function for step processing (runs in background, never touches widgets)."""
+        digest = input_data.digest() if isinstance(input_data, FileSource) else None
+        progress = self._progress_reporter(job, pipeline)
+        try:
+            with open_input(input_data) as data:
+                success, result = self.step_cache.run_prefix(pipeline, data, step_index, progress=progress,
+                                                             cancel=job.cancel, digest=digest)
+            progress.flush()
+        except OSError as e:
+            job.report("error", ("File Error", f"Failed to read the input file: {e}"))
+            return
+        if not success:
+            job.report("error", ("Processing Failed", result))
+            return
+        job.report("step_success", (ResultBuffer.from_bytes(result), step_index))
 
-        for step_frame in recipe_steps:
-            operation_name = step_frame.op_name
-            success, current_data = self.execute_operation(operation_name, current_data, step_frame)
-            if not success:
-                self.result_queue.put(
-                    ("error", ("Processing Failed", f"Step '{operation_name}' failed: {current_data}")))
-                return
-
-        self.result_queue.put(("bake_success", current_data))
-
-    def check_queue(self):
-        """Checks queue for results from the background thread to update the UI."""
+    def _worker_bake_recipe(self, job, plan, input_data, trace_memory=False):
+        """Worker function for baking (runs in background, never touches widgets)."""
+        pipeline = plan.optimized
+        progress = self._progress_reporter(job, pipeline)
+        try:
+            with open_input(input_data) as data:
+                success, result, profile = run_profiled(pipeline, data, progress=progress, cancel=job.cancel,
+                                                        trace_memory=trace_memory)
+                progress.flush()
+                if not success:
+                    job.report("error", ("Processing Failed", result))
+                    return
+                # The buffer (and its spill file for huge results) is filled here, off the UI thread,
+                # and before the mapping closes: a recipe the optimizer emptied returns the input view itself.
+                buffer = ResultBuffer.from_bytes(result)
+                del result
+        except OSError as e:
+            job.report("error", ("File Error", f"Failed to read the input file: {e}"))
+            return
+        job.report("bake_success", (buffer, profile, plan))
+
+    def post_result(self, job, msg_type, data):
+        """
+        Executor listener, called on a worker thread: queues the message and
+        wakes the UI thread with a virtual event, so results arrive as soon as
+        they exist and nothing polls while the frame is idle.
+        """
+        self.results.put((job, msg_type, data))
+        try:
+            # Tkinter hands calls from other threads to the main loop, so this is safe off the UI thread.
+            self.app.event_generate(RESULT_EVENT, when="tail")
+        except (RuntimeError, tkinter.TclError):
+            pass  # The window is being destroyed.
+
+    def on_worker_result(self, event=None):
+        """
+        Drains the worker messages on the UI thread.
+
+        Messages of superseded jobs are dropped, and progress messages are
+        coalesced to the latest one per step, so the UI does a bounded amount
+        of work per event however fast the workers report.
+        """
+        latest_progress, messages = {}, []
         try:
-            message = self.result_queue.get_nowait()
-            msg_type, data = message
-
-            if msg_type == "bake_success":
-                self.output_textbox.configure(state="normal")
-                self.output_textbox.delete("1.0", "end")
-                self.output_textbox.insert("1.0", data)
-                self.output_textbox.configure(state="disabled")
-                self.status_bar.configure(text="Recipe baked successfully!", text_color="gray70")
-            elif msg_type == "step_success":
-                result_data, step_index = data
-                self.output_textbox.configure(state="normal")
-                self.output_textbox.delete("1.0", "end")
-                self.output_textbox.insert("1.0", result_data)
-                self.output_textbox.configure(state="disabled")
-
-                recipe_steps = [child for child in self.recipe_scrollable_frame.winfo_children() if
-                                isinstance(child, customtkinter.CTkFrame)]
-                for widget in recipe_steps: widget.configure(border_width=0)
-                current_step_frame = recipe_steps[step_index]
-                current_step_frame.configure(border_width=2, border_color="#3498DB")
-                self.status_bar.configure(text=f"Executed step {step_index + 1}: {current_step_frame.op_name}",
-                                          text_color="gray70")
-                self.current_step_index += 1
-            elif msg_type == "reset":
-                self.status_bar.configure(text=data, text_color="gray70")
-                self.reset_step_state()
-            elif msg_type == "error":
-                title, msg = data
-                self.app.show_toast(title, msg, toast_type="error")
-                self.reset_step_state()
-
-            self.set_processing_state(False)
+            while True:
+                job, msg_type, data = self.results.get_nowait()
+                if not job.current:
+                    continue
+                if msg_type == "progress":
+                    for progress in data:
+                        latest_progress[progress.step_index] = progress
+                else:
+                    messages.append((job, msg_type, data))
         except queue.Empty:
-            self.after(100, self.check_queue)
+            pass
+
+        if not any(job.executor is self.executor for job, _, _ in messages):
+            for progress in latest_progress.values():
+                self.show_progress(progress)
+        for job, msg_type, data in messages:
+            # A newer job may have been submitted by an earlier message of this same batch.
+            if not job.current:
+                continue
+            # Live re-bakes have their own handler, so they can never touch the Bake/Step state.
+            if job.executor is self.live_executor:
+                self.handle_live_result(msg_type, data)
+            else:
+                self.handle_result(msg_type, data)
+
+    def handle_live_result(self, msg_type, data):
+        if msg_type == "live_success":
+            self.show_live_result(*data)
+        elif msg_type == "live_error":
+            self.status_bar.configure(text=f"Live: {data}", text_color="orange")
+        elif msg_type == "error":
+            title, msg = data
+            self.status_bar.configure(text=f"Live: {title}: {msg}", text_color="orange")
+        # "cancelled" needs nothing: a live job is only cancelled when the preview is switched off.
+
+    def handle_result(self, msg_type, data):
+        self.clear_progress()
+        if msg_type == "bake_success":
+            result_data, profile, plan = data
+            self.show_output(result_data)
+            self.show_profile(profile, plan)
+        elif msg_type == "step_success":
+            result_data, step_index = data
+            self.show_output(result_data)
+
+            self.recipe_list.highlight(step_index)
+            self.status_bar.configure(text=f"Executed step {step_index + 1}: {self.recipe[step_index].operation}",
+                                      text_color="gray70")
+            self.current_step_index += 1
+        elif msg_type == "reset":
+            self.status_bar.configure(text=data, text_color="gray70")
+            self.reset_step_state()
+        elif msg_type == "cancelled":
+            self.reset_step_state()
+            self.status_bar.configure(text=data, text_color="gray70")
+        elif msg_type == "error":
+            title, msg = data
+            self.app.show_toast(title, msg, toast_type="error")
+            self.reset_step_state()
+
+        self.set_processing_state(False)
+
+    def show_progress(self, progress):
+        """Updates the progress bar and ETA of one step in the recipe panel."""
+        if progress.step_index >= len(self.recipe):
+            return  # The step was removed while the bake was running.
+        eta = format_eta(progress.eta)
+        self.recipe.annotate(progress.step_index, info=f"{progress.fraction:.0%}" + (f" · ETA {eta}" if eta else ""),
+                             progress=progress.fraction)
+        self.status_bar.configure(text=f"Step {progress.step_index + 1}/{len(self.recipe)}: {progress.step_name} "
+                                       f"{progress.fraction:.0%}" + (f" (ETA {eta})" if eta else ""),
+                                  text_color="orange")
+
+    def clear_progress(self):
+        self.recipe.reset_annotations()
+
+    def show_profile(self, profile, plan):
+        """Writes each step's timings under it and names the slowest step in the status bar."""
+        self.last_profile = profile
+        self.recipe.reset_annotations("Skipped by the optimizer" if plan.passes_saved else "")
+        for step in profile.steps:
+            origins = plan.optimized.origins[step.index]
+            prefix = f"Fused into {describe_step(plan.optimized.steps[step.index])} · " if len(origins) > 1 else ""
+            for origin in origins:
+                if origin < len(self.recipe):
+                    self.recipe.annotate(origin, info=prefix + step.describe())
+        slowest = profile.slowest()
+        text = f"Recipe baked successfully in {format_seconds(profile.wall)}."
+        if slowest is not None and len(profile.steps) > 1:
+            text += f" Slowest step: {slowest.name} ({format_seconds(slowest.wall)})."
+        if plan.passes_saved:
+            text += f" The optimizer saved {plan.passes_saved} pass(es)."
+        self.status_bar.configure(text=text, text_color="gray70")
+
+    def explain_recipe(self):
+        """Shows the original and optimized plan of the current recipe."""
+        if not self.get_recipe_data():
+            self.app.show_toast("Recipe Error", "Please add at least one operation.", toast_type="error")
+            return
+        pipeline = self.compile_current_recipe()
+        if pipeline is None: return
+        plan = optimize(pipeline)
+        TextDialog(self, "Recipe Plan", plan.explain())
+        self.status_bar.configure(text=f"Optimizer: {len(plan.original)} → {len(plan.optimized)} steps, "
+                                       f"{plan.passes_saved} pass(es) saved.", text_color="gray70")
+
+    def export_trace(self):
+        from tkinter import filedialog
+        if self.last_profile is None:
+            self.app.show_toast("Warning", "Bake a recipe first to record a trace.", toast_type="warning")
+            return
+        filepath = filedialog.asksaveasfilename(title="Export Trace As", defaultextension=".json",
+                                                initialfile="cryptosuite-trace.json",
+                                                filetypes=[("Chrome trace", "*.json")])
+        if not filepath: return
+        try:
+            self.last_profile.save_trace(filepath)
+            self.status_bar.configure(text="Trace exported. Open it in ui.perfetto.dev or chrome://tracing.",
+                                      text_color="gray70")
+        except Exception as e:
+            self.app.show_toast("File Error", f"Failed to export trace: {e}", toast_type="error")
+
+    def show_output(self, buffer: ResultBuffer):
+        """Hands the raw result to the virtualized viewer, which only decodes the visible rows."""
+        self.output_viewer.set_buffer(buffer)
 
     # --- Recipe and UI Management (Common to both frames) ---
 
     def clear_recipe(self):
-        for widget in self.recipe_scrollable_frame.winfo_children():
-            widget.destroy()
-        self.recipe_placeholder = None
-        self.update_recipe_placeholder()
-        self.reset_step_state()
+        self.recipe.clear()
+        self.live_baker = None
 
     def add_recipe_step(self, operation_name, args=None):
-        if args is None: args = {}
-        self.update_recipe_placeholder()
-
-        step_frame = customtkinter.CTkFrame(self.recipe_scrollable_frame)
-        step_frame.pack(fill="x", padx=10, pady=4)
-        step_frame.op_name = operation_name
-        step_frame.op_args = args
-
-        customtkinter.CTkLabel(step_frame, text="⠿", font=("", 20), fg_color="transparent").pack(side="left",
-                                                                                                 padx=(10, 5), pady=5)
-
-        param_container = customtkinter.CTkFrame(step_frame, fg_color="transparent")
-        param_container.pack(side="left", fill="x", expand=True, padx=5, pady=5)
-        customtkinter.CTkLabel(param_container, text=operation_name).pack(side="left", padx=(0, 10))
-
-        if "Caesar" in operation_name:
-            shift_val = args.get("shift", "")
-            entry = customtkinter.CTkEntry(param_container, placeholder_text="Shift (1-25)", width=120)
-            entry.insert(0, str(shift_val))
-            entry.pack(side="left", fill="x", expand=True)
-            step_frame.param_entry = entry
-        elif "AES" in operation_name:
-            key = args.get("key", "")
-            entry = customtkinter.CTkEntry(param_container, placeholder_text="Enter Key...")
-            entry.insert(0, key)
-            entry.pack(side="left", fill="x", expand=True)
-            step_frame.param_entry = entry
-
-        remove_button = customtkinter.CTkButton(step_frame, text="✖", width=28, height=28, fg_color="transparent",
-                                                hover_color="#333333")
-        remove_button.pack(side="right", padx=(0, 5), pady=5)
-        remove_button.configure(
-            command=lambda sf=step_frame: (sf.destroy(), self.update_recipe_placeholder(), self.reset_step_state()))
-
-        self.reset_step_state()
-        self.update_recipe_placeholder()
+        """Appends a step, filling in the registry defaults of any parameter not given in `args`."""
+        args = self.step_args(operation_name, args or {})
+        if args is not None:
+            self.recipe.append(operation_name, args)
+
+    def load_recipe_steps(self, steps):
+        """Replaces the recipe with (operation, args) pairs in one update, however many there are."""
+        steps = [(name, self.step_args(name, args or {})) for name, args in steps]
+        self.recipe.replace([{"operation": name, "args": args} for name, args in steps if args is not None])
+        self.live_baker = None
+
+    def step_args(self, operation_name, args: dict) -> dict:
+        """
+        The step's arguments as the panel shows them: one string per parameter
+        declared in the registry. Returns None, after telling the user, when
+        the operation is unknown (e.g. from a recipe made with a plugin that
+        is not installed) or its plugin fails to load, so the step is skipped.
+        """
+        try:
+            operation = registry.get(operation_name)
+        except RecipeError as e:
+            self.app.show_toast("Plugin Error", str(e), toast_type="error")
+            return None
+        if operation is None:
+            self.app.show_toast("Recipe Error", f"Unknown operation: {operation_name}", toast_type="error")
+            return None
+        return {param.name: str(args.get(param.name, param.default)) for param in operation.params}
 
     def save_recipe(self):
-        recipe_steps = [child for child in self.recipe_scrollable_frame.winfo_children() if
-                        isinstance(child, customtkinter.CTkFrame)]
-        if not recipe_steps:
+        from tkinter import filedialog
+        recipe_data = self.get_recipe_data()
+        if not recipe_data:
             self.app.show_toast("Warning", "Recipe is empty, nothing to save.", toast_type="warning")
             return
-        recipe_data = []
-        for step_frame in recipe_steps:
-            operation_name = step_frame.op_name
-            args = {}
-            if hasattr(step_frame, 'param_entry'):
-                param_value = step_frame.param_entry.get()
-                if "Caesar" in operation_name:
-                    args["shift"] = param_value
-                elif "AES" in operation_name:
-                    args["key"] = param_value
-            recipe_data.append({"operation": operation_name, "args": args})
         filepath = filedialog.asksaveasfilename(title="Save Recipe As", defaultextension=".json",
                                                 filetypes=[("JSON files", "*.json")])
         if not filepath: return
@@ -228,20 +466,37 @@ class BaseFrame(customtkinter.CTkFrame):
         except Exception as e:
             self.app.show_toast("File Error", f"Failed to save recipe: {e}", toast_type="error")
 
-    def update_recipe_placeholder(self):
-        step_frames_exist = any(
-            isinstance(child, customtkinter.CTkFrame) for child in self.recipe_scrollable_frame.winfo_children())
-        if not step_frames_exist:
-            if self.recipe_placeholder is None or not self.recipe_placeholder.winfo_exists():
-                self.recipe_placeholder = customtkinter.CTkLabel(self.recipe_scrollable_frame,
-                                                                 text=self.placeholder_text, font=("", 14),
-                                                                 text_color="gray60")
-            self.recipe_placeholder.pack(expand=True)
-        else:
-            if self.recipe_placeholder is not None and self.recipe_placeholder.winfo_exists():
-                self.recipe_placeholder.pack_forget()
-
     # --- UI Panels (Common to both frames) ---
+    def create_operations_sidebar(self):
+        """Builds one button per registered operation for this frame's side, grouped by category."""
+        sidebar_frame = customtkinter.CTkFrame(self)
+        sidebar_frame.grid(row=0, column=0, sticky="nsew", padx=(10, 5), pady=10)
+        sidebar_frame.grid_rowconfigure(1, weight=1);
+        sidebar_frame.grid_columnconfigure(0, weight=1)
+        customtkinter.CTkLabel(sidebar_frame, text="Operations",
+                               font=customtkinter.CTkFont(size=18, weight="bold")).grid(row=0, column=0, padx=20,
+                                                                                        pady=(10, 10))
+        scrollable_frame = customtkinter.CTkScrollableFrame(sidebar_frame, fg_color="transparent", corner_radius=0)
+        scrollable_frame.grid(row=1, column=0, sticky="nsew", pady=(10, 0));
+        scrollable_frame.grid_columnconfigure(0, weight=1)
+
+        sections = {}
+        for name in registry.names(self.side):
+            sections.setdefault(registry.get(name).category, []).append(name)
+        if registry.plugin_names():
+            sections["Plugins"] = registry.plugin_names()
+
+        row = 0
+        for category, names in sections.items():
+            customtkinter.CTkLabel(scrollable_frame, text=category, font=customtkinter.CTkFont(weight="bold")).grid(
+                row=row, column=0, pady=(5 if row == 0 else 15, 2), padx=10, sticky="w")
+            row += 1
+            for name in names:
+                customtkinter.CTkButton(scrollable_frame, text=name, anchor="w",
+                                        command=lambda n=name: self.add_recipe_step(n)).grid(
+                    row=row, column=0, sticky="ew", padx=10, pady=2)
+                row += 1
+
     def create_recipe_panel(self):
         recipe_frame = customtkinter.CTkFrame(self)
         recipe_frame.grid(row=0, column=1, sticky="nsew", padx=5, pady=10)
@@ -257,8 +512,8 @@ class BaseFrame(customtkinter.CTkFrame):
                                                                                                        padx=(5, 0))
         customtkinter.CTkButton(recipe_header, text="Clear All", width=80, command=self.clear_recipe, fg_color="gray40",
                                 hover_color="gray30").pack(side="right")
-        self.recipe_scrollable_frame = customtkinter.CTkScrollableFrame(recipe_frame)
-        self.recipe_scrollable_frame.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
+        self.recipe_list = RecipeList(recipe_frame, self.recipe, self.placeholder_text)
+        self.recipe_list.grid(row=1, column=0, padx=10, pady=10, sticky="nsew")
         button_frame = customtkinter.CTkFrame(recipe_frame, fg_color="transparent")
         button_frame.grid(row=2, column=0, padx=10, pady=10, sticky="ew")
         button_frame.grid_columnconfigure((0, 1), weight=1)
@@ -270,6 +525,17 @@ class BaseFrame(customtkinter.CTkFrame):
                                                    font=customtkinter.CTkFont(size=16, weight="bold"),
                                                    command=self.bake_recipe)
         self.bake_button.grid(row=0, column=1, padx=(5, 0), sticky="ew")
+        self.create_control_buttons(button_frame)
+
+    def create_control_buttons(self, button_frame):
+        """Adds Cancel and Explain next to Step and Bake."""
+        self.cancel_button = customtkinter.CTkButton(button_frame, text="⏹ Cancel", width=90, height=40,
+                                                     fg_color="#B03A2E", hover_color="#922B21", state="disabled",
+                                                     command=self.cancel_processing)
+        self.cancel_button.grid(row=0, column=2, padx=(10, 0), sticky="ew")
+        customtkinter.CTkButton(button_frame, text="🔍", width=40, height=40, fg_color="#494949",
+                                hover_color="#333333", command=self.explain_recipe).grid(row=0, column=3,
+                                                                                         padx=(5, 0), sticky="ew")
 
     def create_io_panel(self):
         io_frame = customtkinter.CTkFrame(self, fg_color="transparent")
@@ -285,9 +551,11 @@ class BaseFrame(customtkinter.CTkFrame):
                                                                                                            padx=(5, 0))
         customtkinter.CTkButton(input_controls, text="📋 Paste", width=80, command=self.paste_to_input).pack(
             side="right", padx=(5, 0))
+        self.live_switch = customtkinter.CTkSwitch(input_controls, text="⚡ Live", width=80, command=self.toggle_live)
+        self.live_switch.pack(side="right", padx=(5, 0))
         self.input_textbox = customtkinter.CTkTextbox(io_frame)
         self.input_textbox.grid(row=1, column=0, padx=10, pady=(0, 10), sticky="nsew")
-        self.input_textbox.bind("<KeyRelease>", self.reset_step_state)
+        self.input_textbox.bind("<KeyRelease>", self.on_input_edited)
         output_controls = customtkinter.CTkFrame(io_frame, fg_color="transparent")
         output_controls.grid(row=2, column=0, padx=10, pady=(10, 5), sticky="ew")
         customtkinter.CTkLabel(output_controls, text="Final Output", font=customtkinter.CTkFont(size=16)).pack(
@@ -298,64 +566,92 @@ class BaseFrame(customtkinter.CTkFrame):
                                                                                                           padx=(5, 0))
         customtkinter.CTkButton(output_controls, text="📝 Copy", width=80, command=self.copy_output).pack(side="right",
                                                                                                          padx=(5, 0))
-        self.output_textbox = customtkinter.CTkTextbox(io_frame, state="disabled")
-        self.output_textbox.grid(row=3, column=0, padx=10, pady=(0, 0), sticky="nsew")
+        customtkinter.CTkButton(output_controls, text="⏱ Trace", width=80, command=self.export_trace,
+                                fg_color="#494949", hover_color="#333333").pack(side="right", padx=(5, 0))
+        # Off by default: measuring each step's peak memory (tracemalloc) makes bakes much slower.
+        self.memory_switch = customtkinter.CTkSwitch(output_controls, text="Profile memory", width=80)
+        self.memory_switch.pack(side="right", padx=(5, 0))
+        self.output_viewer = OutputViewer(io_frame)
+        self.output_viewer.grid(row=3, column=0, padx=10, pady=(0, 0), sticky="nsew")
 
     def copy_output(self):
-        content = self.output_textbox.get("1.0", "end-1c")
-        if content:
-            pyperclip.copy(content)
-            self.status_bar.configure(text="Output copied to clipboard.", text_color="gray70")
-        else:
+        import pyperclip
+        buffer = self.output_viewer.buffer
+        if not len(buffer):
             self.app.show_toast("Warning", "Output is empty.", toast_type="warning")
+            return
+        if len(buffer) > COPY_LIMIT:
+            self.app.show_toast("Warning", "Output is too large for the clipboard. Use Save instead.",
+                                toast_type="warning")
+            return
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pyperclip.copy("".join(decoder.decode(chunk) for chunk in buffer.iter_chunks()) + decoder.decode(b"", True))
+        self.status_bar.configure(text="Output copied to clipboard.", text_color="gray70")
 
     def open_from_file(self):
+        from tkinter import filedialog
         filepath = filedialog.askopenfilename(title="Open Text File",
                                               filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
         if not filepath: return
         try:
+            if os.path.getsize(filepath) >= LARGE_INPUT_THRESHOLD:
+                # Large files are baked from a memory map and never go through the Tk text widget.
+                self.attach_input_source(FileSource(filepath))
+                return
             with open(filepath, 'r', encoding='utf-8') as f:
-                self.input_textbox.delete("1.0", "end");
-                self.input_textbox.insert("1.0", f.read())
+                self.set_input_text(f.read())
             self.reset_step_state()
         except Exception as e:
             self.app.show_toast("File Error", f"Failed to read file: {e}", toast_type="error")
 
+    def attach_input_source(self, source: FileSource):
+        """Shows a read-only summary and preview of a large file in place of its contents."""
+        self.set_input_text(source.summary())
+        self.input_source = source
+        self.input_textbox.configure(state="disabled")
+        self.step_cache.clear()
+        self.reset_step_state()
+        self.status_bar.configure(text=f"Attached {source.name} ({source.size:,} bytes) as a memory-mapped input.",
+                                  text_color="gray70")
+
+    def set_input_text(self, text: str):
+        """Replaces the input box contents, detaching any memory-mapped input first."""
+        self.input_source = None
+        self.input_textbox.configure(state="normal")
+        self.input_textbox.delete("1.0", "end")
+        self.input_textbox.insert("1.0", text)
+        self.schedule_live_bake()
+
     def save_to_file(self):
-        content = self.output_textbox.get("1.0", "end-1c")
-        if not content: self.app.show_toast("Warning", "Output is empty.", toast_type="warning"); return
+        from tkinter import filedialog
+        buffer = self.output_viewer.buffer
+        if not len(buffer): self.app.show_toast("Warning", "Output is empty.", toast_type="warning"); return
         filepath = filedialog.asksaveasfilename(title="Save Output As", defaultextension=".txt",
                                                 filetypes=[("Text files", "*.txt"), ("All files", "*.*")])
         if not filepath: return
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # The raw bytes are streamed from the buffer, so binary results survive the round trip.
+            with open(filepath, 'wb') as f:
+                for chunk in buffer.iter_chunks():
+                    f.write(chunk)
         except Exception as e:
             self.app.show_toast("Error", f"Failed to save file: {e}", toast_type="error")
 
     def paste_to_input(self):
+        import pyperclip
         try:
-            self.input_textbox.delete("1.0", "end");
-            self.input_textbox.insert("1.0", pyperclip.paste())
+            self.set_input_text(pyperclip.paste())
             self.reset_step_state()
         except Exception as e:
             self.app.show_toast("Error", f"Could not paste from clipboard: {e}", toast_type="error")
 
     def clear_input(self):
-        self.input_textbox.delete("1.0", "end")
+        self.set_input_text("")
         self.reset_step_state()
 
     def clear_output(self):
-        self.output_textbox.configure(state="normal");
-        self.output_textbox.delete("1.0", "end");
-        self.output_textbox.configure(state="disabled")
+        self.output_viewer.clear()
 
     # --- Methods to be implemented by child classes ---
-    def execute_operation(self, operation_name, input_data, step_frame):
-        raise NotImplementedError("This method must be implemented by a subclass")
-
-    def create_operations_sidebar(self):
-        raise NotImplementedError("This method must be implemented by a subclass")
-
     def load_recipe(self):
         raise NotImplementedError("This method must be implemented by a subclass")
\ No newline at end of file
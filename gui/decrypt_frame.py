@@ -1,112 +1,81 @@
 import customtkinter
 import json
-from tkinter import filedialog
 from gui.base_frame import BaseFrame
-from operations.encoders import from_base64
-from operations.ciphers import caesar_cipher
-from operations.hex import from_hex
+from gui.recipe_list import RecipeList
+from operations.registry import registry
 
 
 class DecryptFrame(BaseFrame):
     def __init__(self, master, app, status_bar, **kwargs):
         # --- Set unique properties for this frame ---
+        self.side = "decrypt"
         self.recipe_title = "Decryption Recipe"
         self.placeholder_text = "Click an operation or load & invert a recipe..."
         self.load_button_text = "📂 Load & Invert"
         self.load_button_width = 110
 
-        self.inverse_operations = {
-            "To Base64": "From Base64", "From Base64": "To Base64",
-            "To Hex": "From Hex", "From Hex": "To Hex",
-            "Caesar Encrypt": "Caesar Decrypt", "Caesar Decrypt": "Caesar Encrypt",
-            "AES Encrypt": "AES Decrypt", "AES Decrypt": "AES Encrypt"
-        }
-
         super().__init__(master, app, status_bar, **kwargs)
 
-    def execute_operation(self, operation_name, input_data, step_frame):
-        if operation_name == "From Base64":
-            return from_base64(input_data)
-        elif operation_name == "From Hex":
-            return from_hex(input_data)
-        elif operation_name == "Caesar Decrypt":
-            try:
-                shift = int(step_frame.param_entry.get())
-                if not 1 <= shift <= 25:
-                    return False, "Shift must be between 1 and 25."
-                return caesar_cipher(input_data, shift, decrypt=True)
-            except (ValueError, TypeError):
-                return False, "Invalid shift value. Must be an integer."
-            except AttributeError:
-                return False, "Could not find shift parameter."
-        else:
-            return False, f"Unknown operation: {operation_name}"
-
-    def create_operations_sidebar(self):
-        sidebar_frame = customtkinter.CTkFrame(self)
-        sidebar_frame.grid(row=0, column=0, sticky="nsew", padx=(10, 5), pady=10)
-        sidebar_frame.grid_rowconfigure(1, weight=1);
-        sidebar_frame.grid_columnconfigure(0, weight=1)
-        customtkinter.CTkLabel(sidebar_frame, text="Operations",
-                               font=customtkinter.CTkFont(size=18, weight="bold")).grid(row=0, column=0, padx=20,
-                                                                                        pady=(10, 10))
-        scrollable_frame = customtkinter.CTkScrollableFrame(sidebar_frame, fg_color="transparent", corner_radius=0)
-        scrollable_frame.grid(row=1, column=0, sticky="nsew", pady=(10, 0));
-        scrollable_frame.grid_columnconfigure(0, weight=1)
-
-        decoder_label = customtkinter.CTkLabel(scrollable_frame, text="Decoders",
-                                               font=customtkinter.CTkFont(weight="bold"))
-        decoder_label.grid(row=0, column=0, pady=(5, 2), padx=10, sticky="w")
-
-        from_base64_btn = customtkinter.CTkButton(scrollable_frame, text="From Base64", anchor="w",
-                                                  command=lambda: self.add_recipe_step("From Base64"))
-        from_base64_btn.grid(row=1, column=0, sticky="ew", padx=10, pady=2)
-
-        from_hex_btn = customtkinter.CTkButton(scrollable_frame, text="From Hex", anchor="w",
-                                               command=lambda: self.add_recipe_step("From Hex"))
-        from_hex_btn.grid(row=2, column=0, sticky="ew", padx=10, pady=2)
-
-        cipher_label = customtkinter.CTkLabel(scrollable_frame, text="Ciphers",
-                                              font=customtkinter.CTkFont(weight="bold"))
-        cipher_label.grid(row=3, column=0, pady=(15, 2), padx=10, sticky="w")
-
-        caesar_decrypt_btn = customtkinter.CTkButton(scrollable_frame, text="Caesar Decrypt", anchor="w",
-                                                     command=lambda: self.add_recipe_step("Caesar Decrypt"))
-        caesar_decrypt_btn.grid(row=4, column=0, sticky="ew", padx=10, pady=2)
-
-        aes_decrypt_btn = customtkinter.CTkButton(scrollable_frame, text="AES Decrypt", anchor="w",
-                                                  command=lambda: self.add_recipe_step("AES Decrypt"))
-        aes_decrypt_btn.grid(row=5, column=0, sticky="ew", padx=10, pady=2)
-
     def load_recipe(self):
+        from tkinter import filedialog
         filepath = filedialog.askopenfilename(title="Load and Invert Recipe", filetypes=[("JSON files", "*.json")])
         if not filepath: return
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 recipe_data = json.load(f)
-            self.clear_recipe()
-
+            steps = []
             for step in reversed(recipe_data):
                 original_op_name = step.get("operation")
-                inverted_op_name = self.inverse_operations.get(original_op_name, "Unknown")
+                inverted_op_name = registry.inverse(original_op_name)
 
-                if inverted_op_name == "Unknown":
+                if inverted_op_name is None:
                     self.app.show_toast("Warning", f"Could not find an inverse for '{original_op_name}'. Skipping.",
                                         "warning")
                     continue
 
-                args = step.get("args", {})
-                self.add_recipe_step(inverted_op_name, args=args)
+                steps.append((inverted_op_name, step.get("args", {})))
+            self.load_recipe_steps(steps)
 
             self.status_bar.configure(text=f"Recipe loaded and inverted!", text_color="gray70")
         except Exception as e:
             self.app.show_toast("File Error", f"Failed to load and invert recipe: {e}", toast_type="error")
 
-    # --- NEW: Placeholder function for the Auto-Detect button ---
-    def auto_detect_placeholder(self):
-        """Shows a toast notification for the coming soon feature."""
-        self.app.show_toast("Coming Soon!", "The Auto-Detect feature is currently under development.",
-                            toast_type="info")
+    def auto_detect(self):
+        """Analyses the input on the frame's executor; the best-ranked recipe is loaded when it reports back."""
+        input_data = self.get_input()
+        if self.input_source is not None:
+            # Detection only samples its input; confirming on the first MB keeps it quick for huge files.
+            input_data = self.input_source.preview(1024 * 1024)
+        if not input_data:
+            self.app.show_toast("Input Error", "The input field is empty.", toast_type="error")
+            return
+
+        self.set_processing_state(True)
+        self.status_bar.configure(text="Auto-Detect: analysing the input...", text_color="orange")
+        self.executor.submit(self._worker_auto_detect, input_data)
+
+    def _worker_auto_detect(self, job, input_data):
+        """Worker function for Auto-Detect (runs in background, never touches widgets)."""
+        from operations.detect import detect
+        candidates = detect(input_data)
+        job.cancel.check()
+        job.report("detect_success", candidates)
+
+    def handle_result(self, msg_type, data):
+        if msg_type != "detect_success":
+            super().handle_result(msg_type, data)
+            return
+        self.set_processing_state(False)
+        if not data:
+            self.status_bar.configure(text="Ready", text_color="gray70")
+            self.app.show_toast("Auto-Detect", "No known encoding was detected in the input.", toast_type="info")
+            return
+
+        self.load_recipe_steps((step["operation"], step["args"]) for step in data[0].recipe)
+        ranking = "\n".join(f"{i}. {candidate.describe()} ({candidate.score:.2f})"
+                             for i, candidate in enumerate(data[:3], start=1))
+        self.app.show_toast("Auto-Detect", f"Loaded the best match:\n{ranking}", toast_type="success")
+        self.status_bar.configure(text=f"Auto-Detect: {data[0].describe()}", text_color="gray70")
 
     def create_recipe_panel(self):
         # --- MODIFIED: This panel now includes the Auto-Detect button again ---
@@ -128,11 +97,11 @@ class DecryptFrame(BaseFrame):
 
         # The Auto-Detect button is added back here
         auto_detect_button = customtkinter.CTkButton(recipe_frame, text="Auto-Detect Magic ✨", height=40,
-                                                     command=self.auto_detect_placeholder)
+                                                     command=self.auto_detect)
         auto_detect_button.grid(row=1, column=0, padx=10, pady=(5, 10), sticky="ew")
 
-        self.recipe_scrollable_frame = customtkinter.CTkScrollableFrame(recipe_frame)
-        self.recipe_scrollable_frame.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
+        self.recipe_list = RecipeList(recipe_frame, self.recipe, self.placeholder_text)
+        self.recipe_list.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
 
         button_frame = customtkinter.CTkFrame(recipe_frame, fg_color="transparent")
         button_frame.grid(row=3, column=0, padx=10, pady=10, sticky="ew")
@@ -145,4 +114,5 @@ class DecryptFrame(BaseFrame):
         self.bake_button = customtkinter.CTkButton(button_frame, text="🏭 Bake Recipe!", height=40,
                                                    font=customtkinter.CTkFont(size=16, weight="bold"),
                                                    command=self.bake_recipe)
-        self.bake_button.grid(row=0, column=1, padx=(5, 0), sticky="ew")
\ No newline at end of file
+        self.bake_button.grid(row=0, column=1, padx=(5, 0), sticky="ew")
+        self.create_control_buttons(button_frame)
\ No newline at end of file
@@ -0,0 +1,139 @@
+# File: gui/output_viewer.py
+
+import customtkinter
+from gui.result_buffer import ResultBuffer
+
+
+class OutputViewer(customtkinter.CTkFrame):
+    """
+    A read-only, virtualized view of a ResultBuffer.
+
+    Only the rows that fit in the widget are ever decoded and inserted into the
+    underlying textbox, so rendering costs the same for a 10-byte and a 10 GB
+    result. A row ends at a newline or after `row_width` bytes (the number of
+    characters that fit on one line), and the scrollbar maps to byte offsets.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.textbox = customtkinter.CTkTextbox(self, state="disabled", activate_scrollbars=False, wrap="char")
+        self.textbox.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.buffer = ResultBuffer()
+        self.offset = 0
+        self.row_width = 80
+        self.visible_rows = 20
+
+        self.textbox.bind("<Configure>", self._on_resize)
+        self.textbox.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.textbox.bind("<Button-4>", lambda event: self._scroll_rows(-3))
+        self.textbox.bind("<Button-5>", lambda event: self._scroll_rows(3))
+        self.textbox.bind("<Prior>", lambda event: self._scroll_rows(-self.visible_rows))
+        self.textbox.bind("<Next>", lambda event: self._scroll_rows(self.visible_rows))
+
+    # --- Public API ---
+
+    def set_buffer(self, buffer: ResultBuffer):
+        if buffer is not self.buffer:
+            self.buffer.close()
+        self.buffer = buffer
+        self.offset = 0
+        self.render()
+
+    def clear(self):
+        self.set_buffer(ResultBuffer())
+
+    def render(self):
+        """Draws the rows starting at self.offset; reads at most one screenful from the buffer."""
+        window = self.buffer.read(self.offset, self.row_width * (self.visible_rows + 1))
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", window.decode("utf-8", errors="replace"))
+        self.textbox.configure(state="disabled")
+
+        size = len(self.buffer)
+        if size:
+            self.scrollbar.set(self.offset / size, (self.offset + len(window)) / size)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Row navigation (all in byte offsets) ---
+
+    def _skip_continuation_bytes(self, offset: int) -> int:
+        """Moves forward to the start of a UTF-8 character so a row never begins mid-character."""
+        for byte in self.buffer.read(offset, 3):
+            if byte & 0xC0 != 0x80:
+                break
+            offset += 1
+        return offset
+
+    def _next_row(self, offset: int) -> int:
+        data = self.buffer.read(offset, self.row_width)
+        newline = data.find(b"\n")
+        return offset + (newline + 1 if newline >= 0 else len(data))
+
+    def _previous_row(self, offset: int) -> int:
+        if offset <= 0:
+            return 0
+        # Find where the line containing offset - 1 starts, then walk its rows forward
+        # so that scrolling up wraps long lines exactly like scrolling down does.
+        start = max(0, offset - 1 - self.row_width * 64)
+        newline = self.buffer.read(start, offset - 1 - start).rfind(b"\n")
+        if newline < 0 and start > 0:
+            return max(0, offset - self.row_width)
+        row = start + newline + 1 if newline >= 0 else 0
+        while True:
+            following = self._next_row(row)
+            if following >= offset:
+                return row
+            row = following
+
+    def _snap_to_row(self, offset: int) -> int:
+        start = max(0, offset - self.row_width)
+        newline = self.buffer.read(start, offset - start).rfind(b"\n")
+        return start + newline + 1 if newline >= 0 else offset
+
+    def _last_top(self) -> int:
+        """The offset at which the last screenful of rows starts."""
+        offset = len(self.buffer)
+        for _ in range(self.visible_rows):
+            offset = self._previous_row(offset)
+        return offset
+
+    def _scroll_rows(self, rows: int):
+        offset = self.offset
+        for _ in range(abs(rows)):
+            offset = self._next_row(offset) if rows > 0 else self._previous_row(offset)
+        self.offset = self._skip_continuation_bytes(min(offset, self._last_top()))
+        self.render()
+        return "break"
+
+    # --- Event handlers ---
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            offset = int(float(value) * len(self.buffer))
+            self.offset = self._skip_continuation_bytes(self._snap_to_row(offset))
+            self.render()
+        elif action == "scroll":
+            rows = int(value) * (self.visible_rows if unit == "pages" else 1)
+            self._scroll_rows(rows)
+
+    def _on_mouse_wheel(self, event):
+        return self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_resize(self, event):
+        try:
+            font = self.textbox.cget("font")
+            char_width = max(font.measure("0"), 1)
+            line_height = max(font.metrics("linespace"), 1)
+        except (AttributeError, TypeError):
+            char_width, line_height = 8, 16
+        self.row_width = max(event.width // char_width - 1, 16)
+        self.visible_rows = max(event.height // line_height, 1)
+        self.render()
@@ -0,0 +1,220 @@
+# File: gui/recipe_list.py
+
+import customtkinter
+from operations.recipe import Recipe, RecipeChange
+from operations.registry import registry, RecipeError
+
+ROW_HEIGHT = 66
+ROW_GAP = 6
+
+
+class _StepRow(customtkinter.CTkFrame):
+    """One recycled row of the list; `show` binds it to whichever step it currently displays."""
+
+    def __init__(self, recipe_list, **kwargs):
+        super().__init__(recipe_list.viewport, height=ROW_HEIGHT - ROW_GAP, **kwargs)
+        # Keep the fixed row height whatever the children ask for.
+        self.pack_propagate(False)
+        self.recipe_list = recipe_list
+        self.index = None
+        self.operation = None
+        self.entries = {}
+
+        self.handle = customtkinter.CTkLabel(self, text="⠿", font=("", 20), fg_color="transparent", cursor="fleur")
+        self.handle.pack(side="left", padx=(10, 5), pady=5)
+        self.handle.bind("<ButtonPress-1>", lambda event: recipe_list.start_drag(self.index))
+        self.handle.bind("<ButtonRelease-1>", recipe_list.end_drag)
+
+        self.remove_button = customtkinter.CTkButton(self, text="✖", width=28, height=28, fg_color="transparent",
+                                                     hover_color="#333333",
+                                                     command=lambda: recipe_list.recipe.remove(self.index))
+        self.remove_button.pack(side="right", padx=(0, 5), pady=5)
+
+        # The body holds the parameter row and an info line below it.
+        body = customtkinter.CTkFrame(self, fg_color="transparent")
+        body.pack(side="left", fill="both", expand=True, padx=5, pady=(5, 0))
+        self.param_container = customtkinter.CTkFrame(body, fg_color="transparent")
+        self.param_container.pack(side="top", fill="x")
+        self.name_label = customtkinter.CTkLabel(self.param_container, text="")
+        self.name_label.pack(side="left", padx=(0, 10))
+        self.info_label = customtkinter.CTkLabel(body, text="", height=16, text_color="gray60", anchor="w",
+                                                 font=customtkinter.CTkFont(size=11), justify="left")
+        self.info_label.pack(side="top", fill="x")
+        # Progress while a bake runs: a thin bar along the bottom edge.
+        self.progress_bar = customtkinter.CTkProgressBar(self, height=4)
+
+        for widget in (self, self.handle, self.name_label, self.info_label, body, self.param_container):
+            recipe_list.bind_scrolling(widget)
+
+    def show(self, index: int, step, highlighted: bool):
+        self.index = index
+        if step.operation != self.operation:
+            self._build_entries(step.operation)
+        self.name_label.configure(text=f"{index + 1}. {step.operation}")
+        for name, entry in self.entries.items():
+            value = str(step.args.get(name, entry.default))
+            if entry.get() != value:
+                entry.delete(0, "end")
+                entry.insert(0, value)
+        self.info_label.configure(text=step.info)
+        if step.progress is None:
+            self.progress_bar.place_forget()
+        else:
+            if not self.progress_bar.winfo_ismapped():
+                self.progress_bar.place(relx=0.02, rely=1.0, relwidth=0.96, anchor="sw", y=-3)
+            self.progress_bar.set(step.progress)
+        self.configure(border_width=2 if highlighted else 0, border_color="#3498DB")
+
+    def _build_entries(self, operation_name: str):
+        """One entry per parameter declared in the registry; unknown operations get none."""
+        for entry in self.entries.values():
+            entry.destroy()
+        self.entries = {}
+        self.operation = operation_name
+        try:
+            operation = registry.get(operation_name)
+        except RecipeError:
+            operation = None
+        for param in (operation.params if operation is not None else ()):
+            entry_options = {"width": param.width} if param.width else {}
+            entry = customtkinter.CTkEntry(self.param_container, placeholder_text=param.label, **entry_options)
+            entry.default = param.default
+            entry.pack(side="left", fill="x", expand=True)
+            entry.bind("<KeyRelease>", lambda event, name=param.name, entry=entry:
+                       self.recipe_list.recipe.set_arg(self.index, name, entry.get()))
+            self.entries[param.name] = entry
+
+
+class RecipeList(customtkinter.CTkFrame):
+    """
+    A virtualized view of a Recipe.
+
+    Only as many row widgets as fit in the viewport are ever built; scrolling
+    rebinds them to other steps. Loading, saving, reordering and scrolling a
+    recipe therefore cost the same for 5 steps and for 5,000. All state lives
+    in the Recipe (including the per-step info and progress of the last bake),
+    so nothing is lost when a row is recycled.
+    """
+
+    def __init__(self, master, recipe: Recipe, placeholder_text: str, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.viewport = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.placeholder = customtkinter.CTkLabel(self.viewport, text=placeholder_text, font=("", 14),
+                                                  text_color="gray60")
+
+        self.recipe = recipe
+        self.rows = []
+        self.first = 0
+        self.visible_rows = 1
+        self.highlighted = None
+        self._drag_from = None
+
+        self.bind_scrolling(self.viewport)
+        self.viewport.bind("<Configure>", self._on_resize)
+        recipe.subscribe(self.on_recipe_changed)
+        self.render()
+
+    # --- Public API ---
+
+    def highlight(self, index):
+        """Outlines the step at `index` (None for no step) and scrolls it into view."""
+        self.highlighted = index
+        if index is not None:
+            self.scroll_to(index)
+        self.render()
+
+    def scroll_to(self, index: int):
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible_rows:
+            self.first = index - self.visible_rows + 1
+
+    def render(self):
+        """Rebinds every row to the steps from self.first on; costs one screenful whatever the recipe length."""
+        count = len(self.recipe)
+        self.first = max(0, min(self.first, count - self.visible_rows))
+        if count:
+            self.placeholder.place_forget()
+        else:
+            self.placeholder.place(relx=0.5, rely=0.5, anchor="center")
+        for position, row in enumerate(self.rows):
+            index = self.first + position
+            if index < count:
+                row.place(x=0, y=position * ROW_HEIGHT, relwidth=1.0)
+                row.show(index, self.recipe[index], index == self.highlighted)
+            else:
+                row.place_forget()
+        if count:
+            self.scrollbar.set(self.first / count, min(1.0, (self.first + self.visible_rows) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Model notifications ---
+
+    def on_recipe_changed(self, change: RecipeChange):
+        if change.kind in ("annotate", "update") and change.index is not None:
+            # A single step changed: redraw its row, if it is on screen at all.
+            position = change.index - self.first
+            if 0 <= position < len(self.rows) and change.index < len(self.recipe):
+                self.rows[position].show(change.index, self.recipe[change.index],
+                                         change.index == self.highlighted)
+            return
+        if change.kind == "reset":
+            self.first, self.highlighted = 0, None
+        elif change.kind == "insert":
+            self.scroll_to(change.index)
+        elif change.kind == "move":
+            self.scroll_to(change.new_index)
+        self.render()
+
+    # --- Reordering by dragging the ⠿ handle ---
+
+    def start_drag(self, index: int):
+        self._drag_from = index
+
+    def end_drag(self, event):
+        if self._drag_from is None:
+            return
+        index, self._drag_from = self._drag_from, None
+        y = event.y_root - self.viewport.winfo_rooty()
+        target = self.first + int(y // self._row_pitch())
+        self.recipe.move(index, target)
+
+    # --- Scrolling ---
+
+    def bind_scrolling(self, widget):
+        widget.bind("<MouseWheel>", lambda event: self._scroll_rows(-1 if event.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda event: self._scroll_rows(-1))
+        widget.bind("<Button-5>", lambda event: self._scroll_rows(1))
+
+    def _scroll_rows(self, rows: int):
+        self.first += rows
+        self.render()
+        return "break"
+
+    def on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.first = int(float(value) * len(self.recipe))
+            self.render()
+        elif action == "scroll":
+            self._scroll_rows(int(value) * (self.visible_rows if unit == "pages" else 1))
+
+    def _row_pitch(self) -> float:
+        """Height of one row in screen pixels (place() coordinates are scaled by CustomTkinter)."""
+        return ROW_HEIGHT * self._get_widget_scaling()
+
+    def _on_resize(self, event):
+        self.visible_rows = max(int(event.height // self._row_pitch()), 1)
+        # One spare row, so a partially visible last row is still drawn.
+        wanted = self.visible_rows + 1
+        while len(self.rows) < wanted:
+            self.rows.append(_StepRow(self))
+        while len(self.rows) > wanted:
+            self.rows.pop().destroy()
+        self.render()
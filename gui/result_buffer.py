@@ -0,0 +1,120 @@
+# File: gui/result_buffer.py
+
+import tempfile
+import threading
+
+DEFAULT_SPILL_THRESHOLD = 64 * 1024 * 1024
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class ResultBuffer:
+    """
+    Holds a bake result for the output panel, in memory or spilled to a temp file.
+
+    Results up to `spill_threshold` bytes stay in memory (a bytes result is kept
+    as-is, without a copy); larger ones are written to an anonymous temporary
+    file. Readers only ever ask for small windows or stream it in chunks, so a
+    huge result never has to be materialised as one Python string.
+
+    No Tk code lives here: workers fill the buffer off the UI thread.
+    """
+
+    def __init__(self, spill_threshold: int = DEFAULT_SPILL_THRESHOLD):
+        self.spill_threshold = spill_threshold
+        self._size = 0
+        self._memory = bytearray()
+        self._frozen = None
+        self._live = False
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_bytes(cls, data, spill_threshold: int = DEFAULT_SPILL_THRESHOLD) -> "ResultBuffer":
+        buffer = cls(spill_threshold)
+        if isinstance(data, bytes) and len(data) <= spill_threshold:
+            buffer._frozen = data
+            buffer._size = len(data)
+        else:
+            buffer.write(data)
+        return buffer
+
+    @classmethod
+    def live(cls, source: bytearray, lock) -> "ResultBuffer":
+        """
+        Wraps a bytearray that its owner keeps updating in place (the live
+        preview's IncrementalBaker), without a copy. Reads take the owner's
+        lock, so they never see a half-applied update. The owner may resize it,
+        so its length is read under the lock too rather than cached.
+        """
+        buffer = cls()
+        buffer._frozen = source
+        buffer._live = True
+        buffer._lock = lock
+        return buffer
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def _length(self) -> int:
+        """The current size; the caller holds the lock."""
+        return len(self._frozen) if self._live else self._size
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._length()
+
+    def __len__(self):
+        return self.size
+
+    def write(self, data):
+        """Appends data, moving everything to a temp file once the threshold is crossed."""
+        with self._lock:
+            if self._frozen is not None:
+                self._memory, self._frozen, self._live = bytearray(self._frozen), None, False
+                self._size = len(self._memory)
+            if self._file is None and self._size + len(data) > self.spill_threshold:
+                self._file = tempfile.TemporaryFile(prefix="cryptosuite-")
+                self._file.write(self._memory)
+                self._memory = bytearray()
+            if self._file is not None:
+                self._file.seek(0, 2)
+                self._file.write(data)
+            else:
+                self._memory += data
+            self._size += len(data)
+
+    def read(self, offset: int, length: int) -> bytes:
+        """Returns up to `length` bytes starting at `offset`."""
+        with self._lock:
+            size = self._length()
+            offset = max(0, min(offset, size))
+            length = max(0, min(length, size - offset))
+            if self._file is not None:
+                self._file.seek(offset)
+                return self._file.read(length)
+            source = self._frozen if self._frozen is not None else self._memory
+            return bytes(source[offset:offset + length])
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """Yields the whole content in chunks, for saving or copying without one big copy."""
+        offset = 0
+        # Read until an empty chunk rather than up to a size taken up front: a live buffer may change meanwhile.
+        while chunk := self.read(offset, chunk_size):
+            yield chunk
+            offset += len(chunk)
+
+    def getvalue(self) -> bytes:
+        """Returns the whole content; only meant for small results."""
+        return self.read(0, self.size)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._memory = bytearray()
+            self._frozen = None
+            self._live = False
+            self._size = 0
@@ -0,0 +1,26 @@
+# File: gui/text_dialog.py
+
+import customtkinter
+
+
+class TextDialog(customtkinter.CTkToplevel):
+    """A window showing read-only, selectable text that stays open until the user closes it."""
+
+    def __init__(self, master, title, text, width=640, height=420):
+        super().__init__(master)
+        self.title(title)
+        self.geometry(f"{width}x{height}")
+        self.transient(master.winfo_toplevel())
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.textbox = customtkinter.CTkTextbox(self, wrap="none", font=customtkinter.CTkFont(family="Courier"))
+        self.textbox.grid(row=0, column=0, padx=10, pady=(10, 5), sticky="nsew")
+        self.textbox.insert("1.0", text)
+        self.textbox.configure(state="disabled")
+
+        customtkinter.CTkButton(self, text="Close", width=80, command=self.destroy).grid(row=1, column=0, padx=10,
+                                                                                          pady=(5, 10), sticky="e")
+        self.bind("<Escape>", lambda event: self.destroy())
+        # Raise above the main window once it has been mapped.
+        self.after(50, self.focus_force)
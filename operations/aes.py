@@ -0,0 +1,441 @@
+# File: operations/aes.py
+
+import functools
+import hashlib
+import hmac
+import os
+import struct
+
+from operations.stream import StreamStage
+
+# Ciphertext layout: MAGIC | version | mode | iterations (uint32) | salt | nonce | ciphertext | tag (GCM only).
+# The whole header is authenticated as GCM associated data.
+MAGIC = b"CS"
+VERSION = 1
+MODES = {"CTR": 1, "GCM": 2}
+_NONCE_SIZES = {1: 16, 2: 12}  # CTR uses a full 128-bit counter block, GCM the standard 96-bit nonce.
+SALT_SIZE = 16
+TAG_SIZE = 16
+KEY_SIZE = 32  # AES-256
+PBKDF2_ITERATIONS = 200_000
+# Upper bound accepted from a ciphertext header, so a crafted input cannot stall the KDF.
+MAX_ITERATIONS = 10_000_000
+_PREFIX = struct.Struct(">2sBBI")
+
+# The accelerated backend (the 'cryptography' package) is optional and imported on first use.
+_backend = False
+
+
+def _load_backend():
+    """Returns cryptography's cipher primitives, or None to use the pure-Python implementation."""
+    global _backend
+    if _backend is False:
+        try:
+            from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+            _backend = (Cipher, algorithms, modes)
+        except ImportError:
+            _backend = None
+    return _backend
+
+
+# --- Key derivation ---
+
+@functools.lru_cache(maxsize=32)
+def derive_key(password: str, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+    """
+    Derives a 256-bit AES key with PBKDF2-HMAC-SHA256.
+
+    Cached per (password, salt, iterations): re-baking a recipe, or decrypting
+    several messages encrypted in the same session, pays the KDF cost once.
+    """
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=KEY_SIZE)
+
+
+@functools.lru_cache(maxsize=32)
+def _session_salt(password: str, iterations: int) -> bytes:
+    """
+    A random salt reused for every encryption with this password during the
+    session, so that repeated encryptions hit the derive_key cache. Every
+    message still gets a fresh random nonce.
+
+    Only used with reuse_salt=True: ciphertexts that share a salt also share
+    a key, which shows they were encrypted with the same password.
+    """
+    return os.urandom(SALT_SIZE)
+
+
+def clear_key_cache():
+    """Forgets every cached key and session salt."""
+    derive_key.cache_clear()
+    _session_salt.cache_clear()
+
+
+# --- Pure-Python AES (encryption direction only, which is all CTR and GCM need) ---
+
+def _xtime(value: int) -> int:
+    value <<= 1
+    return value ^ 0x11B if value & 0x100 else value
+
+
+def _build_sbox() -> bytes:
+    # Walks the multiplicative group with generator 3 to get every inverse, then applies the affine map.
+    sbox = bytearray(256)
+    p = q = 1
+    while True:
+        p = p ^ _xtime(p)
+        q ^= q << 1
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xFF
+        if q & 0x80:
+            q ^= 0x09
+        x = q ^ (q << 1 | q >> 7) ^ (q << 2 | q >> 6) ^ (q << 3 | q >> 5) ^ (q << 4 | q >> 4)
+        sbox[p] = (x ^ 0x63) & 0xFF
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    return bytes(sbox)
+
+
+_SBOX = _build_sbox()
+# T-tables: SubBytes, ShiftRows and MixColumns of one byte as a 32-bit column, rotated per row.
+_TE0 = tuple((_xtime(s) & 0xFF) << 24 | s << 16 | s << 8 | (_xtime(s) ^ s) & 0xFF for s in _SBOX)
+_TE1 = tuple((t >> 8 | t << 24) & 0xFFFFFFFF for t in _TE0)
+_TE2 = tuple((t >> 16 | t << 16) & 0xFFFFFFFF for t in _TE0)
+_TE3 = tuple((t >> 24 | t << 8) & 0xFFFFFFFF for t in _TE0)
+
+
+def _expand_key(key: bytes) -> tuple:
+    """Returns the AES round keys as a flat tuple of 32-bit words."""
+    nk = len(key) // 4
+    rounds = nk + 6
+    words = list(struct.unpack(f">{nk}I", key))
+    rcon = 1
+    sbox = _SBOX
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = words[i - 1]
+        if i % nk == 0:
+            temp = (temp << 8 | temp >> 24) & 0xFFFFFFFF
+            temp = (sbox[temp >> 24] << 24 | sbox[temp >> 16 & 0xFF] << 16
+                    | sbox[temp >> 8 & 0xFF] << 8 | sbox[temp & 0xFF]) ^ rcon << 24
+            rcon = _xtime(rcon)
+        elif nk > 6 and i % nk == 4:
+            temp = (sbox[temp >> 24] << 24 | sbox[temp >> 16 & 0xFF] << 16
+                    | sbox[temp >> 8 & 0xFF] << 8 | sbox[temp & 0xFF])
+        words.append(words[i - nk] ^ temp)
+    return tuple(words)
+
+
+def _encrypt_block(round_keys: tuple, block: int) -> int:
+    """Encrypts one 128-bit block given as an integer, with the table-driven round function."""
+    te0, te1, te2, te3, sbox = _TE0, _TE1, _TE2, _TE3, _SBOX
+    s0 = (block >> 96) ^ round_keys[0]
+    s1 = (block >> 64 & 0xFFFFFFFF) ^ round_keys[1]
+    s2 = (block >> 32 & 0xFFFFFFFF) ^ round_keys[2]
+    s3 = (block & 0xFFFFFFFF) ^ round_keys[3]
+    k = 4
+    for _ in range(len(round_keys) // 4 - 2):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[s1 >> 16 & 0xFF] ^ te2[s2 >> 8 & 0xFF] ^ te3[s3 & 0xFF] ^ round_keys[k],
+            te0[s1 >> 24] ^ te1[s2 >> 16 & 0xFF] ^ te2[s3 >> 8 & 0xFF] ^ te3[s0 & 0xFF] ^ round_keys[k + 1],
+            te0[s2 >> 24] ^ te1[s3 >> 16 & 0xFF] ^ te2[s0 >> 8 & 0xFF] ^ te3[s1 & 0xFF] ^ round_keys[k + 2],
+            te0[s3 >> 24] ^ te1[s0 >> 16 & 0xFF] ^ te2[s1 >> 8 & 0xFF] ^ te3[s2 & 0xFF] ^ round_keys[k + 3],
+        )
+        k += 4
+    return (
+        ((sbox[s0 >> 24] << 24 | sbox[s1 >> 16 & 0xFF] << 16 | sbox[s2 >> 8 & 0xFF] << 8 | sbox[s3 & 0xFF])
+         ^ round_keys[k]) << 96
+        | ((sbox[s1 >> 24] << 24 | sbox[s2 >> 16 & 0xFF] << 16 | sbox[s3 >> 8 & 0xFF] << 8 | sbox[s0 & 0xFF])
+           ^ round_keys[k + 1]) << 64
+        | ((sbox[s2 >> 24] << 24 | sbox[s3 >> 16 & 0xFF] << 16 | sbox[s0 >> 8 & 0xFF] << 8 | sbox[s1 & 0xFF])
+           ^ round_keys[k + 2]) << 32
+        | ((sbox[s3 >> 24] << 24 | sbox[s0 >> 16 & 0xFF] << 16 | sbox[s1 >> 8 & 0xFF] << 8 | sbox[s2 & 0xFF])
+           ^ round_keys[k + 3])
+    )
+
+
+class _PyCTR:
+    """Counter-mode keystream; `wrap32` increments only the low 32 bits, as GCM does."""
+
+    def __init__(self, round_keys: tuple, counter: int, wrap32: bool = False):
+        self._round_keys = round_keys
+        self._counter = counter
+        self._wrap32 = wrap32
+        self._leftover = b""
+
+    def _next_counter(self):
+        counter = self._counter
+        if self._wrap32:
+            self._counter = counter & ~0xFFFFFFFF | (counter + 1) & 0xFFFFFFFF
+        else:
+            self._counter = (counter + 1) & (1 << 128) - 1
+        return counter
+
+    def update(self, data) -> bytes:
+        if not data:
+            return b""
+        needed = len(data) - len(self._leftover)
+        blocks = [self._leftover]
+        round_keys, encrypt, next_counter = self._round_keys, _encrypt_block, self._next_counter
+        for _ in range((needed + 15) // 16 if needed > 0 else 0):
+            blocks.append(encrypt(round_keys, next_counter()).to_bytes(16, "big"))
+        keystream = b"".join(blocks)
+        self._leftover = keystream[len(data):]
+        size = len(data)
+        # One big-integer XOR instead of a Python loop over bytes.
+        return (int.from_bytes(data, "big") ^ int.from_bytes(keystream[:size], "big")).to_bytes(size, "big")
+
+
+class _GHash:
+    """GCM's universal hash over GF(2^128), with 16 per-byte-position multiplication tables for H."""
+
+    _R = 0xE1 << 120
+
+    def __init__(self, h: int):
+        # powers[j] = H * x^j in GCM's bit order, where x^0 is the most significant bit.
+        powers = [h]
+        for _ in range(127):
+            v = powers[-1]
+            powers.append(v >> 1 ^ self._R if v & 1 else v >> 1)
+        tables = []
+        for position in range(16):
+            table = [0] * 256
+            for value in range(1, 256):
+                low_bit = value & -value
+                table[value] = table[value ^ low_bit] ^ powers[8 * position + 7 - low_bit.bit_length() + 1]
+            tables.append(table)
+        self._tables = tables
+        self._state = 0
+        self._carry = b""
+
+    def _absorb(self, data: bytes):
+        tables, state = self._tables, self._state
+        for offset in range(0, len(data), 16):
+            x = (state ^ int.from_bytes(data[offset:offset + 16], "big")).to_bytes(16, "big")
+            state = 0
+            for position in range(16):
+                state ^= tables[position][x[position]]
+        self._state = state
+
+    def update(self, data: bytes):
+        data = self._carry + bytes(data)
+        cut = len(data) - len(data) % 16
+        self._absorb(data[:cut])
+        self._carry = data[cut:]
+
+    def pad(self):
+        """Zero-pads the pending partial block, as GCM does at the end of the AAD and of the ciphertext."""
+        if self._carry:
+            self._absorb(self._carry.ljust(16, b"\0"))
+            self._carry = b""
+
+    def digest(self, aad_length: int, ciphertext_length: int) -> int:
+        self.pad()
+        self._absorb(struct.pack(">QQ", aad_length * 8, ciphertext_length * 8))
+        return self._state
+
+
+class _PyCipher:
+    """Streaming AES-CTR / AES-GCM context in pure Python, mirroring the accelerated backend's interface."""
+
+    def __init__(self, key: bytes, mode: int, nonce: bytes, header: bytes, decrypt: bool):
+        round_keys = _expand_key(key)
+        self._decrypt = decrypt
+        self._ghash = None
+        if mode == MODES["GCM"]:
+            self._ghash = _GHash(_encrypt_block(round_keys, 0))
+            self._ghash.update(header)
+            self._ghash.pad()
+            j0 = int.from_bytes(nonce + b"\0\0\0\1", "big")
+            self._tag_mask = _encrypt_block(round_keys, j0)
+            self._ctr = _PyCTR(round_keys, j0 + 1, wrap32=True)
+        else:
+            self._ctr = _PyCTR(round_keys, int.from_bytes(nonce, "big"))
+        self._aad_length = len(header)
+        self._length = 0
+
+    def update(self, data) -> bytes:
+        out = self._ctr.update(data)
+        if self._ghash is not None:
+            self._ghash.update(data if self._decrypt else out)
+        self._length += len(data)
+        return out
+
+    def tag(self) -> bytes:
+        return (self._ghash.digest(self._aad_length, self._length) ^ self._tag_mask).to_bytes(16, "big")
+
+    def finalize(self, tag: bytes = None) -> bytes:
+        """Returns the tag when encrypting; checks `tag` when decrypting. CTR has no tag."""
+        if self._ghash is None:
+            return b""
+        if not self._decrypt:
+            return self.tag()
+        if not hmac.compare_digest(self.tag(), tag):
+            raise ValueError("Authentication failed: wrong key or corrupted data.")
+        return b""
+
+
+class _BackendCipher:
+    """The same interface on top of the 'cryptography' package."""
+
+    def __init__(self, key: bytes, mode: int, nonce: bytes, header: bytes, decrypt: bool):
+        Cipher, algorithms, modes = _load_backend()
+        self._gcm = mode == MODES["GCM"]
+        cipher = Cipher(algorithms.AES(key), modes.GCM(nonce) if self._gcm else modes.CTR(nonce))
+        self._context = cipher.decryptor() if decrypt else cipher.encryptor()
+        self._decrypt = decrypt
+        if self._gcm:
+            self._context.authenticate_additional_data(header)
+
+    def update(self, data) -> bytes:
+        return self._context.update(data)
+
+    def finalize(self, tag: bytes = None) -> bytes:
+        if not self._gcm:
+            return self._context.finalize()
+        if not self._decrypt:
+            self._context.finalize()
+            return self._context.tag
+        from cryptography.exceptions import InvalidTag
+        try:
+            return self._context.finalize_with_tag(tag)
+        except InvalidTag:
+            raise ValueError("Authentication failed: wrong key or corrupted data.")
+
+
+def _new_cipher(key: bytes, mode: int, nonce: bytes, header: bytes, decrypt: bool):
+    cipher_class = _BackendCipher if _load_backend() is not None else _PyCipher
+    return cipher_class(key, mode, nonce, header, decrypt)
+
+
+def _check_key(key) -> str:
+    if not isinstance(key, str) or not key:
+        raise ValueError("Key must not be empty.")
+    return key
+
+
+# --- Stream stages and operations ---
+
+class AESEncryptStage(StreamStage):
+    """Writes the header first, then encrypts chunk by chunk; the GCM tag is appended at flush()."""
+
+    def __init__(self, key: str, mode: str = "GCM", iterations: int = PBKDF2_ITERATIONS, reuse_salt: bool = False):
+        super().__init__()
+        self.mode = MODES[mode.upper()]
+        self.iterations = iterations
+        password = _check_key(key)
+        salt = _session_salt(password, iterations) if reuse_salt else os.urandom(SALT_SIZE)
+        nonce = os.urandom(_NONCE_SIZES[self.mode])
+        self._header = _PREFIX.pack(MAGIC, VERSION, self.mode, iterations) + salt + nonce
+        self._cipher = _new_cipher(derive_key(password, salt, iterations), self.mode, nonce, self._header,
+                                   decrypt=False)
+
+    def feed(self, chunk):
+        header, self._header = self._header, b""
+        return header + self._cipher.update(chunk)
+
+    def flush(self):
+        header, self._header = self._header, b""
+        return header + self._cipher.finalize()
+
+
+class AESDecryptStage(StreamStage):
+    """
+    Parses the header from the first bytes, then decrypts chunk by chunk.
+
+    For GCM the last 16 bytes seen so far are always held back, since they
+    may be the tag; it is checked at flush(), which raises if it does not
+    match. Plaintext is streamed before that check, so a failed bake's
+    partial output must be discarded.
+    """
+
+    def __init__(self, key: str):
+        super().__init__()
+        self._password = _check_key(key)
+        self._cipher = None
+        self._tag_size = 0
+        self._pending = b""
+
+    def _start(self, data: bytes):
+        """Sets up the cipher once the whole header has arrived; returns the bytes after it, or None."""
+        if len(data) < _PREFIX.size:
+            return None
+        magic, version, mode, iterations = _PREFIX.unpack_from(data)
+        if magic != MAGIC or version != VERSION or mode not in _NONCE_SIZES:
+            raise ValueError("Input is not AES ciphertext produced by CryptoSuite.")
+        if not 1 <= iterations <= MAX_ITERATIONS:
+            raise ValueError("Invalid key derivation settings in the ciphertext header.")
+        header_size = _PREFIX.size + SALT_SIZE + _NONCE_SIZES[mode]
+        if len(data) < header_size:
+            return None
+        salt = data[_PREFIX.size:_PREFIX.size + SALT_SIZE]
+        nonce = data[_PREFIX.size + SALT_SIZE:header_size]
+        key = derive_key(self._password, salt, iterations)
+        self._cipher = _new_cipher(key, mode, nonce, data[:header_size], decrypt=True)
+        self._tag_size = TAG_SIZE if mode == MODES["GCM"] else 0
+        return data[header_size:]
+
+    def feed(self, chunk):
+        data = self._pending + bytes(chunk)
+        if self._cipher is None:
+            body = self._start(data)
+            if body is None:
+                self._pending = data
+                return b""
+            data = body
+        cut = max(len(data) - self._tag_size, 0)
+        self._pending = data[cut:]
+        return self._cipher.update(data[:cut]) if cut else b""
+
+    def flush(self):
+        if self._cipher is None:
+            raise ValueError("Input is too short to be AES ciphertext.")
+        if len(self._pending) < self._tag_size:
+            raise ValueError("Input is truncated: the authentication tag is missing.")
+        tag, self._pending = self._pending, b""
+        return self._cipher.finalize(tag if self._tag_size else None)
+
+
+def aes_encrypt(data, key: str, mode: str = "GCM", reuse_salt: bool = False) -> tuple[bool, bytes]:
+    """
+    Encrypts data with AES-256 in GCM (authenticated) or CTR mode.
+
+    The key is derived from the password with PBKDF2-HMAC-SHA256; the salt,
+    nonce and KDF settings are stored in a small header in front of the
+    ciphertext, so 'AES Decrypt' only needs the password.
+
+    Args:
+        data (bytes | bytearray | memoryview | str): The plaintext.
+        key (str): The password.
+        mode (str): "GCM" or "CTR".
+        reuse_salt (bool): Reuse one salt per password for the session, so
+                           repeated encryptions skip the key derivation.
+                           Their ciphertexts then show a shared password.
+
+    Returns:
+        A tuple containing a boolean for success and the header plus ciphertext.
+    """
+    try:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        stage = AESEncryptStage(key, mode, reuse_salt=reuse_salt)
+        return True, stage.feed(data) + stage.flush()
+    except (ValueError, KeyError) as e:
+        return False, f"AES encryption failed: {e}"
+
+
+def aes_decrypt(data, key: str) -> tuple[bool, bytes]:
+    """
+    Decrypts the output of aes_encrypt. For GCM, fails if the data was
+    modified or the password is wrong.
+
+    Returns:
+        A tuple containing a boolean for success and the plaintext.
+    """
+    try:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        stage = AESDecryptStage(key)
+        return True, stage.feed(data) + stage.flush()
+    except ValueError as e:
+        return False, str(e)
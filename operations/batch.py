@@ -0,0 +1,123 @@
+# File: operations/batch.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from operations.engine import compile_recipe
+from operations.sources import map_file
+from operations.stream import stream_path
+
+# Compiled once per worker process by _init_worker.
+_pipeline = None
+
+
+@dataclass
+class BakeResult:
+    """Outcome of baking one input file."""
+    path: str
+    success: bool
+    bytes_in: int = 0
+    bytes_out: int = 0
+    output: bytes = None
+    error: str = None
+
+
+def _init_worker(recipe_data, optimize: bool = True):
+    global _pipeline
+    _pipeline = compile_recipe(recipe_data, optimize=optimize)
+
+
+def bake_one(path: str, output_path: str = None) -> BakeResult:
+    """
+    Bakes a single file with the worker's compiled recipe.
+
+    With an output path the file is streamed chunk by chunk straight to disk;
+    otherwise the recipe runs over a memory map of the file (so e.g. a Hash
+    step never copies it) and the whole result is returned in BakeResult.output.
+    """
+    try:
+        size = os.path.getsize(path)
+        if output_path is not None:
+            success, result = stream_path(_pipeline, path, output_path)
+            if not success:
+                return BakeResult(path, False, size, error=result)
+            return BakeResult(path, True, size, result)
+        with map_file(path) as view:
+            success, result = _pipeline.run(view)
+            if isinstance(result, memoryview):
+                # Nothing may keep pointing into the mapping once it is closed.
+                result = bytes(result)
+    except OSError as e:
+        return BakeResult(path, False, error=f"File error: {e}")
+    if not success:
+        return BakeResult(path, False, size, error=result)
+    return BakeResult(path, True, size, len(result), output=result)
+
+
+def _bake_job(job):
+    return bake_one(*job)
+
+
+@dataclass
+class BatchStats:
+    """Aggregate throughput of a batch run."""
+    files: int = 0
+    failed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+    def add(self, result: BakeResult):
+        self.files += 1
+        self.failed += not result.success
+        self.bytes_in += result.bytes_in
+        self.bytes_out += result.bytes_out
+
+    def summary(self) -> str:
+        seconds = max(self.seconds, 1e-9)
+        return (f"Baked {self.files} file(s), {self.failed} failed, in {self.seconds:.3f}s: "
+                f"{self.files / seconds:.1f} files/s, {self.bytes_in / seconds / 1e6:.2f} MB/s in, "
+                f"{self.bytes_out / seconds / 1e6:.2f} MB/s out")
+
+
+def bake_files(recipe_data, jobs, workers: int = None, ordered: bool = True, chunksize: int = 16,
+               optimize: bool = True):
+    """
+    Bakes many files with one recipe across a process pool.
+
+    Args:
+        recipe_data (list): The recipe in the 'Save Recipe' JSON format.
+        jobs (list): (input_path, output_path_or_None) pairs.
+        workers (int): Pool size; defaults to os.cpu_count(). 1 runs in-process.
+        ordered (bool): Yield results in input order, or as soon as they finish.
+        optimize (bool): Remove inverse pairs and fuse shifts before baking.
+
+    Yields:
+        A BakeResult per job. The recipe is compiled up front, so an invalid
+        recipe raises RecipeError before any work is scheduled.
+    """
+    compile_recipe(recipe_data)
+    if workers == 1:
+        _init_worker(recipe_data, optimize)
+        yield from map(_bake_job, jobs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(recipe_data, optimize)) as executor:
+        if ordered:
+            yield from executor.map(_bake_job, jobs, chunksize=chunksize)
+        else:
+            futures = [executor.submit(_bake_job, job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def timed(results, stats: BatchStats):
+    """Passes results through while accumulating them and the elapsed time into stats."""
+    start = time.perf_counter()
+    for result in results:
+        stats.add(result)
+        stats.seconds = time.perf_counter() - start
+        yield result
@@ -0,0 +1,97 @@
+# File: operations/cache.py
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from operations.engine import execute_step
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def input_digest(data) -> bytes:
+    """Returns a short, collision-resistant digest identifying an input buffer."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class StepCache:
+    """
+    An LRU cache of intermediate recipe results, bounded by their total size in bytes.
+
+    Entries are keyed by (input digest, recipe-prefix fingerprint). Because the
+    fingerprint of step k covers every step up to k including its args, editing
+    step k only changes the keys from k onward; the earlier results keep hitting
+    and the stale ones simply age out of the LRU.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value: bytes):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old)
+            self._entries[key] = value
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def run_prefix(self, pipeline, data, step_index: int, progress=None, cancel=None,
+                   digest: bytes = None) -> tuple[bool, bytes]:
+        """
+        Returns the result of steps 0..step_index, executing only the steps
+        that are not already cached for this input. `progress` and `cancel`
+        are passed on to execute_step for the steps that do run. `digest`
+        replaces input_digest(data) when the caller can identify the input
+        more cheaply, e.g. a memory-mapped FileSource.
+
+        Returns:
+            A tuple containing a boolean for success and either the result
+            bytes or an error message naming the failing step.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if digest is None:
+            digest = input_digest(data)
+        fingerprints = pipeline.fingerprints
+
+        start, current = 0, data
+        for i in range(step_index, -1, -1):
+            cached = self.get((digest, fingerprints[i]))
+            if cached is not None:
+                start, current = i + 1, cached
+                break
+
+        for i in range(start, step_index + 1):
+            step = pipeline.steps[i]
+            success, current = execute_step(step, current, i, progress, cancel)
+            if not success:
+                return False, f"Step '{step.name}' failed: {current}"
+            current = bytes(current)
+            self.put((digest, fingerprints[i]), current)
+        return True, current
@@ -1,5 +1,58 @@
 # File: operations/ciphers.py
 
+import string
+
+_LOWER = string.ascii_lowercase
+_UPPER = string.ascii_uppercase
+
+# Relative letter frequencies of English text, a..z.
+ENGLISH_FREQUENCIES = (
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094, 0.06966, 0.00153,
+    0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056,
+    0.02758, 0.00978, 0.02360, 0.00150, 0.01974, 0.00074,
+)
+
+# Caesar Brute Force picks its shift from at most this many leading bytes, whole or streamed.
+BRUTE_FORCE_SAMPLE = 1024 * 1024
+
+# NumPy is optional and only imported the first time a histogram is needed.
+_numpy = False
+# Row `shift` holds the ciphertext index of every plaintext letter for that shift.
+_ROTATIONS = None
+
+
+def _load_numpy():
+    """Returns the numpy module, or None if it is not installed; imported once on first use."""
+    global _numpy, _ROTATIONS
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:  # The histogram falls back to bytes.count.
+            numpy = None
+        if numpy is not None:
+            _ROTATIONS = (numpy.arange(26)[None, :] + numpy.arange(26)[:, None]) % 26
+        _numpy = numpy
+    return _numpy
+
+
+def _build_str_table(shift: int) -> dict:
+    """Builds a str.translate table mapping every letter to the letter `shift` places later."""
+    return str.maketrans(_LOWER + _UPPER,
+                         _LOWER[shift:] + _LOWER[:shift] + _UPPER[shift:] + _UPPER[:shift])
+
+
+def _build_bytes_table(shift: int) -> bytes:
+    """Builds a 256-byte bytes.translate table for the given shift."""
+    lower, upper = _LOWER.encode("ascii"), _UPPER.encode("ascii")
+    return bytes.maketrans(lower + upper,
+                           lower[shift:] + lower[:shift] + upper[shift:] + upper[:shift])
+
+
+# Precomputed once for all 26 shifts so every call is a single C-level translate pass.
+_STR_TABLES = tuple(_build_str_table(shift) for shift in range(26))
+_BYTES_TABLES = tuple(_build_bytes_table(shift) for shift in range(26))
+
+
 def caesar_cipher(text: str, shift: int, decrypt: bool = False) -> tuple[bool, str]:
     """
     Encrypts or decrypts text using the Caesar cipher method.
@@ -19,18 +72,111 @@ def caesar_cipher(text: str, shift: int, decrypt: bool = False) -> tuple[bool, s
     if decrypt:
         shift = -shift
 
-    result = ""
-    for char in text:
-        if 'a' <= char <= 'z':
-            # Handle lowercase letters
-            shifted_char = chr(((ord(char) - ord('a') + shift) % 26) + ord('a'))
-            result += shifted_char
-        elif 'A' <= char <= 'Z':
-            # Handle uppercase letters
-            shifted_char = chr(((ord(char) - ord('A') + shift) % 26) + ord('A'))
-            result += shifted_char
-        else:
-            # Keep non-alphabetic characters unchanged
-            result += char
-
-    return True, result
\ No newline at end of file
+    # Non-alphabetic characters have no entry in the table and are kept unchanged.
+    return True, text.translate(_STR_TABLES[shift % 26])
+
+
+def caesar_cipher_bytes(data, shift: int, decrypt: bool = False) -> tuple[bool, bytes]:
+    """
+    Bytes fast path of caesar_cipher for binary pipelines.
+
+    Args:
+        data (bytes | bytearray | memoryview): The input buffer. Only the ASCII
+                                               letters are shifted, every other
+                                               byte is kept unchanged.
+        shift (int): The number of positions to shift letters.
+        decrypt (bool): If True, the function will decrypt the data.
+
+    Returns:
+        A tuple containing a boolean for success and the resulting bytes.
+    """
+    if not isinstance(shift, int):
+        return False, "Shift value must be an integer."
+
+    if decrypt:
+        shift = -shift
+
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    return True, bytes(data.translate(_BYTES_TABLES[shift % 26]))
+
+
+def letter_histogram(data) -> list:
+    """Counts the letters a..z in a bytes-like object, case-insensitively, in a single pass."""
+    numpy = _load_numpy()
+    if numpy is not None:
+        counts = numpy.bincount(numpy.frombuffer(data, dtype=numpy.uint8), minlength=256)
+        return (counts[97:123] + counts[65:91]).tolist()
+    if not isinstance(data, (bytes, bytearray)):
+        data = bytes(data)
+    lower, upper = _LOWER.encode("ascii"), _UPPER.encode("ascii")
+    return [data.count(low) + data.count(up) for low, up in zip(lower, upper)]
+
+
+def rank_caesar_shifts(histogram) -> list:
+    """
+    Scores every decryption shift 1..25 against English in one pass over a letter histogram.
+
+    Decrypting by `shift` turns ciphertext letter (i + shift) into plaintext
+    letter i, so the plaintext histogram for every shift is a rotation of the
+    ciphertext histogram. The chi-squared distance of each rotation to the
+    English model is computed at once instead of decrypting 25 times.
+
+    Returns:
+        A list of (shift, chi_squared) tuples, best (lowest) first.
+    """
+    total = sum(histogram)
+    if not total:
+        return [(shift, 0.0) for shift in range(1, 26)]
+    numpy = _load_numpy()
+    if numpy is not None:
+        observed = numpy.asarray(histogram, dtype=numpy.float64)[_ROTATIONS]
+        expected = numpy.asarray(ENGLISH_FREQUENCIES) * total
+        scores = (((observed - expected) ** 2) / expected).sum(axis=1).tolist()
+    else:
+        expected = [f * total for f in ENGLISH_FREQUENCIES]
+        scores = [sum((histogram[(i + shift) % 26] - expected[i]) ** 2 / expected[i] for i in range(26))
+                  for shift in range(26)]
+    return sorted(((shift, scores[shift]) for shift in range(1, 26)), key=lambda item: item[1])
+
+
+def rank_caesar_sample(data) -> list:
+    """
+    Ranks the shifts of a ciphertext from its first BRUTE_FORCE_SAMPLE bytes,
+    the rule both caesar_brute_force and its stream stage follow, so they
+    pick the same shift however the input arrives.
+
+    Returns:
+        rank_caesar_shifts' list, or an empty list if the sample has no letters.
+    """
+    histogram = letter_histogram(data[:BRUTE_FORCE_SAMPLE])
+    return rank_caesar_shifts(histogram) if sum(histogram) else []
+
+
+def describe_caesar_ranking(data, count: int = 3) -> str:
+    """The best shifts of a ciphertext with their scores, e.g. 'shift 3 (χ² 12.4), then 17 (χ² 310.2), ...'."""
+    ranking = rank_caesar_sample(data)
+    if not ranking:
+        return "no letters to analyse"
+    (shift, score), others = ranking[0], ranking[1:count]
+    text = f"shift {shift} (χ² {score:.1f})"
+    if others:
+        text += ", then " + ", ".join(f"{shift} (χ² {score:.1f})" for shift, score in others)
+    return text
+
+
+def caesar_brute_force(data) -> tuple[bool, bytes]:
+    """
+    Finds the most likely Caesar shift of an English ciphertext and decrypts it.
+
+    The shift is chosen from the first BRUTE_FORCE_SAMPLE bytes (see
+    rank_caesar_sample), then applied to the whole input; describe_caesar_ranking
+    shows the runners-up.
+
+    Returns:
+        A tuple containing a boolean for success and the decrypted bytes.
+    """
+    ranking = rank_caesar_sample(data)
+    if not ranking:
+        return False, "Input contains no letters to analyse."
+    return caesar_cipher_bytes(data, ranking[0][0], decrypt=True)
@@ -0,0 +1,248 @@
+# File: operations/compression.py
+
+import bz2
+import lzma
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from operations.stream import StreamStage
+
+FORMATS = ("zlib", "gzip", "bz2", "lzma")
+DEFAULT_LEVEL = 6
+MAX_WINDOW_BITS = 15
+# Gzip blocks compressed independently in parallel mode. Each one is primed with the
+# last 32 KB of the block before it, so the boundaries cost almost nothing in ratio.
+PARALLEL_BLOCK_SIZE = 1024 * 1024
+# Default cap on what one decompression may produce, so a small "zip bomb" cannot exhaust memory.
+DEFAULT_MAX_OUTPUT_MB = 1024
+# Parallel gzip header: no file name, no timestamp and OS "unknown", so the output is reproducible.
+_GZIP_MAGIC = b"\x1f\x8b\x08\x00\x00\x00\x00\x00"
+_GZIP_OS_UNKNOWN = 255
+
+
+def new_compressor(format: str, level: int = DEFAULT_LEVEL, window: int = None):
+    """
+    Creates a streaming compressor with compress(data) and flush() methods.
+
+    `window` is the log2 of the history size: 9-15 for zlib and gzip, the
+    LZMA2 dictionary size for lzma; bz2 has none (its level is the block size).
+    """
+    if format == "zlib":
+        return zlib.compressobj(level, zlib.DEFLATED, window or MAX_WINDOW_BITS)
+    if format == "gzip":
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + (window or MAX_WINDOW_BITS))
+    if format == "bz2":
+        return bz2.BZ2Compressor(level)
+    if format == "lzma":
+        options = {"id": lzma.FILTER_LZMA2, "preset": level}
+        if window:
+            options["dict_size"] = 1 << window
+        return lzma.LZMACompressor(format=lzma.FORMAT_XZ, filters=[options])
+    raise ValueError(f"Unknown compression format '{format}'.")
+
+
+def new_decompressor(format: str):
+    """Creates a streaming decompressor; the window size is read from the stream header."""
+    if format == "zlib":
+        return zlib.decompressobj(0)
+    if format == "gzip":
+        return zlib.decompressobj(16 + MAX_WINDOW_BITS)
+    if format == "bz2":
+        return bz2.BZ2Decompressor()
+    if format == "lzma":
+        return lzma.LZMADecompressor(format=lzma.FORMAT_AUTO)
+    raise ValueError(f"Unknown compression format '{format}'.")
+
+
+def _deflate_block(block: bytes, dictionary: bytes, level: int, window: int, final: bool) -> bytes:
+    """Compresses one block as raw deflate, ending on a byte boundary so blocks can be concatenated."""
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -window, zdict=dictionary)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -window)
+    return compressor.compress(block) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipCompressor:
+    """
+    A pigz-style gzip compressor that deflates fixed-size blocks on several
+    threads and writes them out, in order, as one ordinary gzip member.
+
+    Every block but the last ends with a sync flush (an empty stored block,
+    so it stops on a byte boundary without marking the end of the stream),
+    and every block but the first is primed with the window of input that
+    precedes it, so back-references still reach across block boundaries.
+    Any gzip reader decompresses the result. zlib releases the GIL while it
+    compresses, so threads scale across cores. The CRC-32 is computed on the
+    calling thread while the blocks compress.
+
+    The output depends on the block size but not on the number of threads,
+    and an input shorter than one block is compressed on the calling thread.
+    """
+
+    def __init__(self, level: int = DEFAULT_LEVEL, window: int = None, threads: int = 0,
+                 block_size: int = PARALLEL_BLOCK_SIZE):
+        self.level = level
+        self.window = window or MAX_WINDOW_BITS
+        self.threads = threads or os.cpu_count() or 1
+        self.block_size = block_size
+        self._carry = b""
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._started = False
+        self._pending = deque()
+        self._pool = None
+
+    def _header(self) -> bytes:
+        if self._started:
+            return b""
+        self._started = True
+        extra_flags = 2 if self.level == 9 else 4 if self.level < 2 else 0
+        return _GZIP_MAGIC + bytes((extra_flags, _GZIP_OS_UNKNOWN))
+
+    def _submit(self, block: bytes):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads)
+        self._pending.append(self._pool.submit(_deflate_block, block, self._dictionary,
+                                               self.level, self.window, False))
+        self._dictionary = block[-(1 << self.window):]
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+
+    def _collect(self, wait_for: int) -> list:
+        """Takes the finished blocks off the front of the queue, waiting while more than `wait_for` are queued."""
+        parts = []
+        while self._pending and (len(self._pending) > wait_for or self._pending[0].done()):
+            parts.append(self._pending.popleft().result())
+        return parts
+
+    def compress(self, data) -> bytes:
+        parts = [self._header()]
+        with memoryview(data) as source, source.cast("B") as view:
+            offset = 0
+            if self._carry:
+                offset = min(len(view), self.block_size - len(self._carry))
+                self._carry += view[:offset]
+                if len(self._carry) < self.block_size:
+                    return parts[0]
+                self._submit(self._carry)
+                self._carry = b""
+            while len(view) - offset >= self.block_size:
+                self._submit(bytes(view[offset:offset + self.block_size]))
+                offset += self.block_size
+            self._carry = bytes(view[offset:])
+        # Keep a couple of blocks per thread in flight: enough to keep every core busy, bounded memory.
+        parts += self._collect(2 * self.threads)
+        return b"".join(parts)
+
+    def flush(self) -> bytes:
+        parts = [self._header()] + self._collect(0)
+        parts.append(_deflate_block(self._carry, self._dictionary, self.level, self.window, True))
+        self._crc = zlib.crc32(self._carry, self._crc)
+        self._size += len(self._carry)
+        parts.append(struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF))
+        self._carry = self._dictionary = b""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        return b"".join(parts)
+
+
+def _compressor(format: str, level: int, window: int, threads: int):
+    if format == "gzip" and threads != 1:
+        return ParallelGzipCompressor(level, window, threads)
+    return new_compressor(format, level, window)
+
+
+def compress(data, format: str, level: int = DEFAULT_LEVEL, window: int = None,
+             threads: int = 1) -> tuple[bool, bytes]:
+    """
+    Compresses data as a zlib, gzip, bz2 or xz (lzma) stream.
+
+    Args:
+        threads (int): gzip only; anything but 1 compresses in parallel
+                       blocks (0 means one thread per core).
+
+    Returns:
+        A tuple containing a boolean for success and the compressed bytes or an error message.
+    """
+    try:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        compressor = _compressor(format, level, window, threads)
+        return True, compressor.compress(data) + compressor.flush()
+    except (ValueError, zlib.error, lzma.LZMAError) as e:
+        return False, f"Failed to compress: {e}"
+
+
+def decompress(data, format: str, max_mb: int = DEFAULT_MAX_OUTPUT_MB) -> tuple[bool, bytes]:
+    """
+    Decompresses a zlib, gzip, bz2 or xz/lzma stream, including several
+    concatenated members. Fails once the output would exceed `max_mb` MB.
+    """
+    try:
+        stage = DecompressStage(format, max_mb)
+        return True, stage.feed(data) + stage.flush()
+    except ValueError as e:
+        return False, str(e)
+
+
+class CompressStage(StreamStage):
+    def __init__(self, format: str, level: int = DEFAULT_LEVEL, window: int = None, threads: int = 1):
+        super().__init__()
+        self._compressor = _compressor(format, level, window, threads)
+
+    def feed(self, chunk):
+        return self._compressor.compress(chunk)
+
+    def flush(self):
+        return self._compressor.flush()
+
+
+class DecompressStage(StreamStage):
+    """
+    Decompresses a stream as chunks arrive. A new member that starts after
+    the end of the previous one (`cat a.gz b.gz`, pigz -i, pbzip2, xz
+    concatenation) is decompressed too, as the command-line tools do.
+
+    The output is capped at `max_mb` MB over the whole stream: every call
+    asks the decompressor for at most one byte more than is still allowed,
+    so exceeding the cap fails the step before anything larger is produced.
+    """
+
+    def __init__(self, format: str, max_mb: int = DEFAULT_MAX_OUTPUT_MB):
+        super().__init__()
+        self.format = format
+        self.max_output = max_mb * 1024 * 1024
+        self._decompressor = new_decompressor(format)
+        self._fed = False
+        self._produced = 0
+
+    def feed(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        parts = []
+        try:
+            while chunk:
+                self._fed = True
+                if self._decompressor.eof:
+                    self._decompressor = new_decompressor(self.format)
+                part = self._decompressor.decompress(chunk, self.max_output - self._produced + 1)
+                self._produced += len(part)
+                if self._produced > self.max_output:
+                    raise ValueError(f"Decompressed data exceeds the {self.max_output // (1024 * 1024):,} MB limit.")
+                parts.append(part)
+                # Short of the requested length, the decompressor has consumed the whole chunk.
+                chunk = self._decompressor.unused_data if self._decompressor.eof else b""
+        except (zlib.error, lzma.LZMAError, OSError, EOFError) as e:
+            raise ValueError(f"Invalid {self.format} data: {e}")
+        return b"".join(parts)
+
+    def flush(self):
+        if self._fed and not self._decompressor.eof:
+            raise ValueError(f"Invalid {self.format} data: the stream is truncated.")
+        return b""
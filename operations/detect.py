@@ -0,0 +1,230 @@
+# File: operations/detect.py
+
+import heapq
+import itertools
+import math
+import string
+import time
+from dataclasses import dataclass, field
+
+from operations.engine import compile_recipe
+from operations.encoders import from_base64
+from operations.hex import from_hex
+from operations.ciphers import (caesar_cipher_bytes, letter_histogram, rank_caesar_shifts,
+                                ENGLISH_FREQUENCIES)
+
+DEFAULT_SAMPLE_SIZE = 4096
+DEFAULT_MAX_DEPTH = 4
+DEFAULT_TIME_BUDGET = 0.05
+DEFAULT_MAX_RESULTS = 5
+CAESAR_BRANCHES = 3
+
+_ENGLISH_NORM = math.sqrt(sum(f * f for f in ENGLISH_FREQUENCIES))
+
+
+def _complement(members: bytes) -> bytes:
+    """Returns every byte value NOT in `members`, for use as a bytes.translate delete table."""
+    return bytes(b for b in range(256) if b not in members)
+
+
+# Byte-class tables: len(data.translate(None, _NOT_X)) counts the class members at C speed.
+_WHITESPACE = string.whitespace.encode("ascii")
+_NOT_BASE64 = _complement((string.ascii_letters + string.digits + "+/=").encode("ascii"))
+_NOT_HEX = _complement(string.hexdigits.encode("ascii"))
+_NOT_PRINTABLE = _complement(string.printable.encode("ascii"))
+_NOT_LETTER = _complement(string.ascii_letters.encode("ascii"))
+
+
+def _count(data: bytes, not_class: bytes) -> int:
+    return len(data.translate(None, not_class))
+
+
+@dataclass
+class Profile:
+    """Byte-class statistics of a buffer, computed with a handful of C-level passes."""
+    length: int
+    printable_ratio: float
+    letter_ratio: float
+    base64_ratio: float
+    hex_ratio: float
+    looks_base64: bool
+    looks_hex: bool
+
+
+def profile(data: bytes) -> Profile:
+    """Classifies a buffer by its byte classes (Base64 alphabet and padding, hex parity, printables)."""
+    length = len(data)
+    if not length:
+        return Profile(0, 0.0, 0.0, 0.0, 0.0, False, False)
+    compact = data.translate(None, _WHITESPACE)
+    compact_length = len(compact) or 1
+
+    base64_ratio = _count(compact, _NOT_BASE64) / compact_length
+    stripped = compact.rstrip(b"=")
+    padding = len(compact) - len(stripped)
+    looks_base64 = (base64_ratio == 1.0 and padding <= 2 and b"=" not in stripped
+                    and (len(compact) % 4 == 0 or padding == 0))
+
+    cleaned = compact.replace(b"0x", b"")
+    hex_ratio = _count(cleaned, _NOT_HEX) / (len(cleaned) or 1)
+    looks_hex = hex_ratio == 1.0 and len(cleaned) % 2 == 0 and len(cleaned) > 0
+
+    return Profile(length, _count(data, _NOT_PRINTABLE) / length, _count(data, _NOT_LETTER) / length,
+                   base64_ratio, hex_ratio, looks_base64, looks_hex)
+
+
+def english_score(histogram) -> float:
+    """Cosine similarity between a letter histogram and English letter frequencies (0..1)."""
+    norm = math.sqrt(sum(c * c for c in histogram))
+    if not norm:
+        return 0.0
+    return sum(c * f for c, f in zip(histogram, ENGLISH_FREQUENCIES)) / (norm * _ENGLISH_NORM)
+
+
+def text_score(data: bytes) -> float:
+    """Scores how much a buffer looks like readable English text, from 0 to 1."""
+    if not data:
+        return 0.0
+    stats = profile(data)
+    spaces = data.count(b" ") / len(data)
+    return (stats.printable_ratio ** 2) * (0.2 + 0.6 * english_score(letter_histogram(data))
+                                           + 0.2 * min(spaces / 0.15, 1.0))
+
+
+def _sample_base64(data: bytes) -> bytes:
+    compact = data.translate(None, _WHITESPACE)
+    return compact[:len(compact) - len(compact) % 4]
+
+
+def _sample_hex(data: bytes) -> bytes:
+    compact = data.translate(None, _WHITESPACE).replace(b"0x", b"")
+    return compact[:len(compact) - len(compact) % 2]
+
+
+@dataclass
+class Candidate:
+    """A ranked Auto-Detect suggestion."""
+    recipe: list
+    score: float
+    preview: str = ""
+
+    def describe(self) -> str:
+        names = []
+        for step in self.recipe:
+            shift = step["args"].get("shift")
+            names.append(f"{step['operation']}({shift})" if shift is not None else step["operation"])
+        return " → ".join(names)
+
+
+@dataclass(order=True)
+class _Node:
+    priority: float
+    order: int
+    depth: int = field(compare=False)
+    recipe: tuple = field(compare=False)
+    sample: bytes = field(compare=False)
+    is_full: bool = field(compare=False)
+
+
+def _expand(node: _Node):
+    """Yields (operation, args, decoded_sample) for every decoding that applies to the node's sample."""
+    stats = profile(node.sample)
+    last = node.recipe[-1]["operation"] if node.recipe else None
+
+    if stats.looks_base64:
+        sample = node.sample if node.is_full else _sample_base64(node.sample)
+        success, decoded = from_base64(sample)
+        if success and decoded:
+            yield "From Base64", {}, decoded
+    if stats.looks_hex:
+        sample = node.sample if node.is_full else _sample_hex(node.sample)
+        success, decoded = from_hex(sample)
+        if success and decoded:
+            yield "From Hex", {}, decoded
+    if last != "Caesar Decrypt" and stats.letter_ratio > 0.05 and stats.printable_ratio > 0.95:
+        # All shifts are ranked from one histogram; only the most promising ones are
+        # decrypted. Stacking Caesar steps is never useful.
+        histogram = letter_histogram(node.sample)
+        hex_shifts = _hex_shifts(histogram)
+        ranked = [shift for shift, _ in rank_caesar_shifts(histogram) if shift not in hex_shifts]
+        for shift in hex_shifts + ranked[:CAESAR_BRANCHES]:
+            yield "Caesar Decrypt", {"shift": shift}, caesar_cipher_bytes(node.sample, shift, decrypt=True)[1]
+
+
+def _hex_shifts(histogram) -> list:
+    """Shifts that map every letter present into a..f, i.e. that would turn the data into hex."""
+    present = [i for i, count in enumerate(histogram) if count]
+    return [shift for shift in range(1, 26) if all((i - shift) % 26 < 6 for i in present)]
+
+
+def _promise(decoded: bytes, score: float) -> float:
+    """Search priority: readable text first, but an intermediate that is valid hex is worth decoding further."""
+    if profile(decoded).looks_hex:
+        return score + 1.0
+    return score
+
+
+def detect(data, sample_size: int = DEFAULT_SAMPLE_SIZE, max_depth: int = DEFAULT_MAX_DEPTH,
+           time_budget: float = DEFAULT_TIME_BUDGET, max_results: int = DEFAULT_MAX_RESULTS) -> list:
+    """
+    Searches for the stack of decodings that turns the input into readable text.
+
+    A best-first search explores 'From Base64', 'From Hex' and 'Caesar Decrypt'
+    (all shifts) on a sampled prefix of the input, pruning decodings that do
+    not apply, within a depth limit and a time budget. The best candidates are
+    then confirmed by running their recipe on the full data.
+
+    Args:
+        data (bytes | str): The input to analyse.
+        sample_size (int): Bytes of the input used during the search.
+        max_depth (int): Maximum number of stacked decodings.
+        time_budget (float): Seconds allowed for the search itself.
+        max_results (int): Number of candidates to return.
+
+    Returns:
+        A list of Candidate objects, best first. Empty if nothing applies.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    data = bytes(data)
+    sample = data[:sample_size]
+    # Scored before the clock starts: the first score imports NumPy, a one-off
+    # cost that would otherwise eat the whole budget of a process's first search.
+    base_score = text_score(sample)
+    deadline = time.perf_counter() + time_budget
+    counter = itertools.count()
+
+    frontier = [_Node(-base_score, next(counter), 0, (), sample, len(sample) == len(data))]
+    found, seen = [], set()
+    while frontier and time.perf_counter() < deadline:
+        node = heapq.heappop(frontier)
+        if node.depth >= max_depth:
+            continue
+        for operation, args, decoded in _expand(node):
+            recipe = node.recipe + ({"operation": operation, "args": args},)
+            key = (decoded[:64], len(recipe))
+            if key in seen:
+                continue
+            seen.add(key)
+            score = text_score(decoded)
+            found.append((score, recipe))
+            heapq.heappush(frontier, _Node(-_promise(decoded, score), next(counter), node.depth + 1, recipe,
+                                           decoded, node.is_full))
+
+    return _confirm(data, found, base_score, max_results)
+
+
+def _confirm(data: bytes, found: list, base_score: float, max_results: int) -> list:
+    """Runs the best sampled candidates on the full data and drops the ones that fail there."""
+    candidates = []
+    for score, recipe in sorted(found, key=lambda item: (-item[0], len(item[1]))):
+        if score <= base_score:
+            break
+        success, result = compile_recipe(list(recipe)).run(data)
+        if not success or not result:
+            continue
+        candidates.append(Candidate(list(recipe), round(score, 4),
+                                    result[:120].decode("utf-8", errors="replace")))
+        if len(candidates) >= max_results:
+            break
+    return candidates
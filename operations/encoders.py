@@ -1,30 +1,35 @@
 # File: operations/encoders.py
 
 import base64
+import binascii
+import re
 
+# b64decode stops at the first complete padding and silently drops the rest; that is rejected
+# instead, so the result cannot depend on where a stream happens to be split into chunks.
+_DATA_AFTER_PADDING = re.compile(rb"=[^A-Za-z0-9+/]*[A-Za-z0-9+/]")
 
-def to_base64(input_string: str) -> tuple[bool, str]:
-    """Encodes a standard string to Base64."""
+
+def to_base64(data) -> tuple[bool, bytes]:
+    """Encodes a bytes-like object (or a UTF-8 string) to Base64."""
     try:
-        # The base64 library works on bytes, so we encode the string first.
-        input_bytes = input_string.encode('utf-8')
-        base64_bytes = base64.b64encode(input_bytes)
-        # Decode the result back to a string for the GUI.
-        base64_string = base64_bytes.decode('utf-8')
-        return True, base64_string
+        # Strings only appear at the GUI/CLI boundary; buffers are encoded without copying.
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return True, base64.b64encode(data)
     except Exception as e:
         return False, f"Failed to encode: {e}"
 
 
-def from_base64(input_string: str) -> tuple[bool, str]:
-    """Decodes a Base64 string back to a standard string."""
+def from_base64(data) -> tuple[bool, bytes]:
+    """Decodes Base64 back to raw bytes, which may be arbitrary binary data."""
     try:
-        # We need to encode the string back to bytes to be decoded.
-        base64_bytes = input_string.encode('utf-8')
-        decoded_bytes = base64.b64decode(base64_bytes)
-        # Decode the final bytes into a readable string.
-        decoded_string = decoded_bytes.decode('utf-8')
-        return True, decoded_string
-    except Exception as e:
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        # bytes.find is a memchr; only the input from the first "=" on needs the regex.
+        start = data.find(b"=") if hasattr(data, "find") else 0
+        if start != -1 and _DATA_AFTER_PADDING.search(data, start):
+            return False, "Invalid Base64 input: data after padding."
+        return True, base64.b64decode(data)
+    except (binascii.Error, ValueError) as e:
         # This usually happens if the input isn't valid Base64.
         return False, f"Invalid Base64 input: {e}"
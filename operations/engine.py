@@ -0,0 +1,187 @@
+# File: operations/engine.py
+
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable
+
+from operations.registry import registry, RecipeError
+from operations.progress import PROGRESS_CHUNK_SIZE
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    A single compiled recipe step: the operation name, its parsed args and the
+    bound callables. `stage_type` is the class new_stage() builds, for reading
+    its block_size and output_size without building one. `note(data)`, when
+    the operation has one, describes what the step decides on that input.
+    """
+    name: str
+    args: dict
+    func: Callable[[bytes], tuple[bool, bytes]]
+    new_stage: Callable[[], object]
+    stage_type: type
+    note: Callable[[bytes], str] = None
+
+    def to_dict(self) -> dict:
+        return {"operation": self.name, "args": dict(self.args)}
+
+
+class CompiledRecipe:
+    """
+    An immutable pipeline of bound operations that can be executed many times.
+
+    origins[k] holds the indices of the recipe steps that step k stands for:
+    just (k,) as written, or several after the optimizer fused or removed steps.
+    """
+
+    __slots__ = ("steps", "fingerprints", "origins")
+
+    def __init__(self, steps, origins=None):
+        self.steps = tuple(steps)
+        self.origins = tuple(origins) if origins is not None else tuple((i,) for i in range(len(self.steps)))
+        # fingerprints[k] identifies the prefix steps[0..k] including all args,
+        # so two recipes share fingerprints exactly as far as their steps agree.
+        fingerprints, running = [], hashlib.blake2b(digest_size=16)
+        for step in self.steps:
+            running.update(json.dumps(step.to_dict(), sort_keys=True).encode("utf-8"))
+            fingerprints.append(running.copy().digest())
+        self.fingerprints = tuple(fingerprints)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CompiledRecipe(self.steps[index], self.origins[index])
+        return self.steps[index]
+
+    def run(self, data, progress=None, cancel=None) -> tuple[bool, bytes]:
+        """
+        Executes every step in order on the given data.
+
+        Args:
+            data (bytes | bytearray | memoryview | str): The input buffer. Steps
+                exchange bytes; a str is encoded as UTF-8 once up front.
+            progress (callable): Optional progress(step_index, step_name, done, total)
+                                 callback, called from this thread as bytes are processed.
+            cancel (CancelToken): Optional token checked before every chunk.
+
+        Returns:
+            A tuple containing a boolean for success and either the final
+            bytes or an error message naming the failing step.
+
+        Raises:
+            BakeCancelled: If the cancel token is set while running.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        for index, step in enumerate(self.steps):
+            success, data = execute_step(step, data, index, progress, cancel)
+            if not success:
+                return False, f"Step '{step.name}' failed: {data}"
+        return True, data
+
+    def to_json(self) -> list:
+        """Returns the recipe in the same format written by 'Save Recipe'."""
+        return [step.to_dict() for step in self.steps]
+
+
+def execute_step(step: Step, data, index: int = 0, progress=None, cancel=None) -> tuple[bool, bytes]:
+    """
+    Runs one step, feeding it through its stream stage chunk by chunk when
+    progress or cancellation is requested, so both happen within one chunk.
+
+    Without either, or for small inputs and operations that need the whole
+    input at once, the bound function is called directly.
+
+    Returns:
+        The operation's (success, result) tuple.
+    """
+    if progress is None and cancel is None:
+        return step.func(data)
+    total = len(data)
+    if cancel is not None:
+        cancel.check()
+    if progress is not None:
+        progress(index, step.name, 0, total)
+
+    stage = step.new_stage() if total > PROGRESS_CHUNK_SIZE else None
+    if stage is None or not stage.incremental:
+        result = step.func(data)
+    else:
+        parts = []
+        # Released on the way out, even when BakeCancelled propagates: a traceback still holding
+        # the view would keep a memory-mapped input exported and make closing the mapping fail.
+        with memoryview(data) as view:
+            try:
+                for offset in range(0, total, PROGRESS_CHUNK_SIZE):
+                    if cancel is not None:
+                        cancel.check()
+                    parts.append(stage.feed(view[offset:offset + PROGRESS_CHUNK_SIZE]))
+                    # Held one byte short of the total: the step only finishes once flush() has run.
+                    if progress is not None:
+                        progress(index, step.name, min(offset + PROGRESS_CHUNK_SIZE, total) - 1, total)
+                parts.append(stage.flush())
+            except ValueError as e:
+                return False, str(e)
+        result = True, b"".join(parts)
+
+    if progress is not None and result[0]:
+        progress(index, step.name, total, total)
+    return result
+
+
+def compile_step(operation_name: str, args: dict = None) -> Step:
+    """Validates a single operation and its arguments against the registry and binds it."""
+    operation = registry.get(operation_name)
+    if operation is None:
+        raise RecipeError(f"Unknown operation: {operation_name}")
+    if not operation.available:
+        raise RecipeError(f"Operation '{operation_name}' is not available yet.")
+    try:
+        parsed_args = operation.parse_args(args or {})
+    except (RecipeError, ValueError, TypeError) as e:
+        raise RecipeError(f"Step '{operation_name}': {e}")
+
+    # The dispatch happens here, once: the step keeps the bound callables.
+    bound_args = {**operation.fixed_args, **parsed_args}
+    function = operation.load_function()
+    func = partial(function, **bound_args) if bound_args else function
+    note = operation.load_note()
+    if note is not None and bound_args:
+        note = partial(note, **bound_args)
+    return Step(operation_name, parsed_args, func, partial(operation.load_stage(), **bound_args),
+                operation.load_stage_type(), note)
+
+
+def compile_recipe(recipe_data, optimize: bool = False) -> CompiledRecipe:
+    """
+    Compiles a recipe into an immutable pipeline.
+
+    Args:
+        recipe_data (list): A list of {"operation": ..., "args": {...}} dicts,
+                            the same JSON format produced by 'Save Recipe'.
+        optimize (bool): Run the optimizer (see operations.optimizer), which
+                         removes inverse pairs and fuses Caesar shifts. The
+                         output is identical; only wasted passes are skipped.
+
+    Returns:
+        A CompiledRecipe ready to be executed any number of times.
+
+    Raises:
+        RecipeError: If an operation is unknown or its arguments are invalid.
+    """
+    if not isinstance(recipe_data, list):
+        raise RecipeError("A recipe must be a list of steps.")
+    steps = []
+    for step in recipe_data:
+        if not isinstance(step, dict) or not step.get("operation"):
+            raise RecipeError("Every recipe step needs an 'operation' name.")
+        steps.append(compile_step(step["operation"], step.get("args") or {}))
+    if optimize:
+        from operations.optimizer import optimize as optimize_pipeline
+        return optimize_pipeline(CompiledRecipe(steps)).optimized
+    return CompiledRecipe(steps)
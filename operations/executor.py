@@ -0,0 +1,116 @@
+# File: operations/executor.py
+
+import threading
+from dataclasses import dataclass, field
+
+from operations.progress import BakeCancelled, CancelToken
+
+
+@dataclass(eq=False)
+class Job:
+    """One submission to a LatestWinsExecutor; the worker function receives it as its first argument."""
+    id: int
+    func: object
+    args: tuple
+    executor: "LatestWinsExecutor" = field(repr=False)
+    cancel: CancelToken = field(default_factory=CancelToken)
+
+    @property
+    def current(self) -> bool:
+        """False once a newer job was submitted to the same executor: the result will be dropped."""
+        return self.executor.is_current(self)
+
+    def report(self, msg_type: str, data=None):
+        """Sends a message to the executor's listener, unless this job has been superseded."""
+        self.executor.post(self, msg_type, data)
+
+
+class LatestWinsExecutor:
+    """
+    Runs jobs one at a time on a single long-lived thread, where only the
+    most recent submission matters.
+
+    Submitting a job supersedes the previous one: if it has not started yet it
+    is dropped, and if it is running its CancelToken is cancelled so that it
+    stops at its next chunk boundary. Messages a superseded job reports are
+    discarded, so a listener only ever hears from the latest job, in order.
+
+    `on_message(job, msg_type, data)` is called on the worker thread; a GUI
+    forwards it to its own thread (see BaseFrame.post_result) and must check
+    `job.current` again there, because a newer job may have been submitted in
+    between.
+    """
+
+    def __init__(self, on_message, name: str = "executor"):
+        self.on_message = on_message
+        self._condition = threading.Condition()
+        self._next_id = 0
+        self._latest_id = 0
+        self._pending = None
+        self._running = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, func, *args) -> Job:
+        """Queues `func(job, *args)` in place of any pending job and cancels the running one."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The executor has been shut down.")
+            self._next_id += 1
+            job = Job(self._next_id, func, args, self)
+            self._latest_id = job.id
+            if self._running is not None:
+                self._running.cancel.cancel()
+            self._pending = job
+            self._condition.notify()
+        return job
+
+    def cancel(self):
+        """
+        Cancels the latest job. A running job reports "cancelled" itself when
+        it notices; one that never started is reported here.
+        """
+        with self._condition:
+            job, self._pending = self._pending, None
+            if self._running is not None:
+                self._running.cancel.cancel()
+        if job is not None:
+            job.cancel.cancel()
+            self.post(job, "cancelled", "Bake cancelled.")
+
+    def is_current(self, job: Job) -> bool:
+        return job.id == self._latest_id
+
+    def post(self, job: Job, msg_type: str, data=None):
+        if self.is_current(job):
+            self.on_message(job, msg_type, data)
+
+    def shutdown(self):
+        """Cancels everything and lets the thread exit; it is a daemon, so nothing waits for it."""
+        with self._condition:
+            self._closed = True
+            self._pending = None
+            if self._running is not None:
+                self._running.cancel.cancel()
+            self._condition.notify()
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                job, self._pending = self._pending, None
+                self._running = job
+            try:
+                job.func(job, *job.args)
+            except BakeCancelled as e:
+                job.report("cancelled", str(e))
+            except Exception as e:
+                # A bug in a worker must not kill the thread every later job runs on.
+                job.report("error", ("Unexpected Error", f"{type(e).__name__}: {e}"))
+            finally:
+                with self._condition:
+                    self._running = None
@@ -0,0 +1,266 @@
+# File: operations/fanout.py
+
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from operations.engine import compile_recipe, execute_step, RecipeError
+from operations.optimizer import describe_step
+from operations.registry import registry
+
+PREVIEW_LENGTH = 48
+# Inputs smaller than this are fanned out in the calling process: starting workers
+# and shipping them the intermediate buffers would cost more than it saves.
+PARALLEL_THRESHOLD = 256 * 1024
+
+
+@dataclass
+class TrieNode:
+    """
+    One step shared by every recipe whose prefix leads here.
+
+    `leaves` are the indices of the recipes that end at this node, so they
+    all get its output; the root stands for the input itself.
+    """
+    step: object = None
+    children: dict = field(default_factory=dict)
+    leaves: list = field(default_factory=list)
+
+    def count_steps(self) -> int:
+        """Steps below this node, i.e. how many a fan-out of its subtree runs."""
+        count, stack = 0, list(self.children.values())
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
+
+
+def step_key(step) -> tuple:
+    """Operation plus parsed args: two steps with equal keys always compute the same thing."""
+    return step.name, json.dumps(step.args, sort_keys=True, default=str)
+
+
+def build_trie(pipelines) -> TrieNode:
+    """Builds the prefix trie of (recipe_index, CompiledRecipe) pairs."""
+    root = TrieNode()
+    for index, pipeline in pipelines:
+        node = root
+        for step in pipeline.steps:
+            key = step_key(step)
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = TrieNode(step)
+            node = child
+        node.leaves.append(index)
+    return root
+
+
+@dataclass
+class FanoutResult:
+    """The outcome of one recipe of a fan-out."""
+    index: int
+    description: str = ""
+    success: bool = False
+    # The whole output with keep_outputs, otherwise only enough of it for the preview.
+    output: bytes = b""
+    output_size: int = 0
+    error: str = None
+    # What baking this recipe alone would have taken: the time of every step on its path.
+    seconds: float = 0.0
+
+    def preview(self, length: int = PREVIEW_LENGTH) -> str:
+        """The start of the output as one line of text, with unprintable characters shown as '.'."""
+        if not self.success:
+            return self.error
+        text = bytes(self.output[:length]).decode("utf-8", errors="replace")
+        text = "".join(char if char.isprintable() else "." for char in text)[:length]
+        return text + ("…" if self.output_size > length else "")
+
+
+@dataclass
+class FanoutStats:
+    recipes: int = 0
+    # Steps the recipes contain, which is what baking them one by one runs.
+    steps_total: int = 0
+    # Steps in the prefix trie: each shared prefix is run once.
+    steps_run: int = 0
+    wall: float = 0.0
+    workers: int = 1
+
+    @property
+    def steps_saved(self) -> int:
+        return self.steps_total - self.steps_run
+
+
+def _leaf_result(index: int, data, seconds: float, keep_outputs: bool, preview_length: int) -> FanoutResult:
+    output = data if keep_outputs else data[:preview_length * 4]
+    return FanoutResult(index, success=True, output=bytes(output), output_size=len(data), seconds=seconds)
+
+
+def _fail_subtree(node: TrieNode, error: str, seconds: float, results: list):
+    """Reports the failure of `node`'s step to every recipe that goes through it."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        results.extend(FanoutResult(index, error=error, seconds=seconds) for index in current.leaves)
+        stack.extend(current.children.values())
+
+
+def _run_item(item, keep_outputs: bool, preview_length: int, results: list) -> list:
+    """
+    Runs one node's step on its parent's output, records the recipes that
+    end there, and returns the pending items for its children.
+    """
+    node, data, seconds = item
+    if node.step is not None:
+        start = time.perf_counter()
+        success, data = execute_step(node.step, data)
+        seconds += time.perf_counter() - start
+        if not success:
+            _fail_subtree(node, f"Step '{node.step.name}' failed: {data}", seconds, results)
+            return []
+    results.extend(_leaf_result(index, data, seconds, keep_outputs, preview_length) for index in node.leaves)
+    return [(child, data, seconds) for child in node.children.values()]
+
+
+def bake_subtree(item, keep_outputs: bool = False, preview_length: int = PREVIEW_LENGTH) -> list:
+    """
+    Bakes the subtree of one pending (node, parent_output, seconds) item,
+    depth first, so only one intermediate buffer per level is alive at once.
+    Used in the calling process and as the process pool job.
+    """
+    results, stack = [], [item]
+    while stack:
+        # Reversed, so siblings run in recipe order.
+        stack.extend(reversed(_run_item(stack.pop(), keep_outputs, preview_length, results)))
+    return results
+
+
+def fanout(recipes: list, data, workers: int = None, optimize: bool = True, keep_outputs: bool = False,
+           preview_length: int = PREVIEW_LENGTH, executor: ProcessPoolExecutor = None) -> tuple[list, FanoutStats]:
+    """
+    Bakes many recipes over one input, running every shared prefix once.
+
+    The recipes are compiled and merged into a prefix trie keyed on operation
+    and args, so e.g. 25 variants of "From Base64 → Caesar Decrypt(n)" decode
+    the Base64 once and branch its output to 25 Caesar steps. The trie is
+    expanded breadth first in this process until there are enough independent
+    subtrees to keep every worker busy; each subtree is then baked depth
+    first in a process pool (or in this process for small inputs).
+
+    Args:
+        recipes (list): Recipes in the 'Save Recipe' JSON format.
+        workers (int): Worker processes (default: CPU count); 1 bakes here.
+        optimize (bool): Optimize each recipe before merging it into the trie.
+        keep_outputs (bool): Return every whole output, not just its preview.
+
+    Returns:
+        One FanoutResult per recipe, in the order given (a recipe that does
+        not compile gets an error result), and the FanoutStats of the run.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    start = time.perf_counter()
+    results, pipelines, descriptions = [], [], {}
+    for index, recipe_data in enumerate(recipes):
+        try:
+            pipeline = compile_recipe(recipe_data, optimize=optimize)
+            written = compile_recipe(recipe_data) if optimize else pipeline
+        except RecipeError as e:
+            results.append(FanoutResult(index, description=_describe_data(recipe_data), error=str(e)))
+            continue
+        pipelines.append((index, pipeline))
+        descriptions[index] = " → ".join(describe_step(step) for step in written.steps) or "(empty recipe)"
+
+    root = build_trie(pipelines)
+    stats = FanoutStats(len(recipes), sum(len(pipeline) for _, pipeline in pipelines), root.count_steps())
+    workers = workers or os.cpu_count() or 1
+    if len(data) < PARALLEL_THRESHOLD and executor is None:
+        workers = 1
+
+    pending = deque([(root, data, 0.0)])
+    # Run the shared levels here until there are enough independent subtrees for the pool.
+    while pending and len(pending) < workers:
+        pending.extend(_run_item(pending.popleft(), keep_outputs, preview_length, results))
+    if workers == 1 or len(pending) <= 1:
+        for item in pending:
+            results.extend(bake_subtree(item, keep_outputs, preview_length))
+    else:
+        owns_executor = executor is None
+        if owns_executor:
+            executor = ProcessPoolExecutor(max_workers=min(workers, len(pending)))
+        try:
+            # Workers get a bytes copy of the branch point's output; the subtree ships with its compiled steps.
+            futures = [executor.submit(bake_subtree, (node, bytes(parent), seconds), keep_outputs, preview_length)
+                       for node, parent, seconds in pending]
+            for future in futures:
+                results.extend(future.result())
+        finally:
+            if owns_executor:
+                executor.shutdown()
+        stats.workers = min(workers, len(pending))
+
+    for result in results:
+        result.description = result.description or descriptions.get(result.index, "")
+    results.sort(key=lambda result: result.index)
+    stats.wall = time.perf_counter() - start
+    return results, stats
+
+
+def _describe_data(recipe_data) -> str:
+    """Label for a recipe that did not compile, straight from its JSON."""
+    if not isinstance(recipe_data, list):
+        return "(invalid recipe)"
+    return " → ".join(str(step.get("operation")) if isinstance(step, dict) else "?" for step in recipe_data)
+
+
+def parse_values(text: str) -> list:
+    """Turns '1-25' into ['1', ..., '25'] and 'a,b,c' into ['a', 'b', 'c']."""
+    values = []
+    for part in text.split(","):
+        part = part.strip()
+        low, separator, high = part.partition("-")
+        if separator and low.strip().isdigit() and high.strip().isdigit():
+            values.extend(str(value) for value in range(int(low), int(high) + 1))
+        elif part:
+            values.append(part)
+    return values
+
+
+def _param_names(operation_name) -> set:
+    try:
+        operation = registry.get(operation_name)
+    except RecipeError:
+        return set()
+    return {param.name for param in operation.params} if operation is not None else set()
+
+
+def vary(recipes: list, name: str, values: list) -> list:
+    """
+    Expands every recipe with a step taking a parameter called `name` into
+    one variant per value, e.g. vary(recipes, "shift", parse_values("1-25"))
+    for every Caesar shift. Recipes without such a step are kept as they are.
+    """
+    expanded = []
+    for recipe_data in recipes:
+        positions = [i for i, step in enumerate(recipe_data) if name in _param_names(step.get("operation"))]
+        if not positions:
+            expanded.append(recipe_data)
+            continue
+        for value in values:
+            variant = [dict(step) for step in recipe_data]
+            for i in positions:
+                variant[i]["args"] = {**(variant[i].get("args") or {}), name: value}
+            expanded.append(variant)
+    return expanded
+
+
+def vary_all(recipes: list, variations: dict) -> list:
+    """Applies several vary() expansions, giving their cartesian product."""
+    for name, values in variations.items():
+        recipes = vary(recipes, name, values)
+    return recipes
@@ -1,29 +1,39 @@
 # File: operations/hex.py
 
-def to_hex(input_string: str) -> tuple[bool, str]:
-    """Encodes a standard string to a Hexadecimal string."""
+import binascii
+import string
+
+# Stripped before decoding, like FromHexStage does chunk by chunk, so both paths accept the same input.
+_WHITESPACE = string.whitespace.encode("ascii")
+
+
+def to_hex(data) -> tuple[bool, bytes]:
+    """Encodes a bytes-like object (or a UTF-8 string) to a Hexadecimal representation."""
     try:
-        # Convert the string to bytes, then to a hex representation.
-        input_bytes = input_string.encode('utf-8')
-        hex_string = input_bytes.hex()
-        return True, hex_string
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        return True, binascii.hexlify(data)
     except Exception as e:
         return False, f"Failed to encode to Hex: {e}"
 
 
-def from_hex(input_string: str) -> tuple[bool, str]:
-    """Decodes a Hexadecimal string back to a standard string."""
+def from_hex(data) -> tuple[bool, bytes]:
+    """Decodes Hexadecimal back to raw bytes, which may be arbitrary binary data."""
     try:
-        # Remove common prefixes and spaces
-        cleaned_string = input_string.replace("0x", "").replace(" ", "").strip()
-        if len(cleaned_string) % 2 != 0:
-            return False, "Invalid Hex string: odd length."
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        try:
+            # Fast path: clean hex is decoded straight from the buffer, without copies.
+            return True, binascii.unhexlify(data)
+        except binascii.Error:
+            pass
 
-        # Convert the hex string back to bytes, then to a readable string.
-        decoded_bytes = bytes.fromhex(cleaned_string)
-        decoded_string = decoded_bytes.decode('utf-8')
-        return True, decoded_string
-    except ValueError:
+        # Remove whitespace (spaces, line breaks) and "0x" prefixes
+        cleaned = bytes(data).translate(None, _WHITESPACE).replace(b"0x", b"")
+        if len(cleaned) % 2 != 0:
+            return False, "Invalid Hex string: odd length."
+        return True, bytes.fromhex(cleaned.decode('ascii'))
+    except (binascii.Error, ValueError):
         return False, "Invalid characters in Hex string."
     except Exception as e:
-        return False, f"Failed to decode from Hex: {e}"
\ No newline at end of file
+        return False, f"Failed to decode from Hex: {e}"
@@ -0,0 +1,142 @@
+# File: operations/incremental.py
+
+import threading
+import time
+from dataclasses import dataclass
+
+from operations.parallel import segment_alignment, pipeline_output_size
+
+# Inputs are compared in slices of this size when looking for the edited range:
+# small enough that the temporary copies stay in the CPU cache.
+COMPARE_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class Update:
+    """What the last IncrementalBaker.bake call recomputed."""
+    incremental: bool
+    input_start: int
+    input_end: int
+    input_size: int
+    seconds: float
+
+    @property
+    def rebaked(self) -> int:
+        """Bytes of input the recipe actually ran over."""
+        return self.input_end - self.input_start
+
+
+def common_prefix(a, b) -> int:
+    """Length of the longest common prefix of two byte strings."""
+    size = min(len(a), len(b))
+    start = 0
+    while start < size:
+        end = min(size, start + COMPARE_CHUNK_SIZE)
+        if a[start:end] != b[start:end]:
+            while a[start:start + 256] == b[start:start + 256]:
+                start += 256
+            while a[start] == b[start]:
+                start += 1
+            return start
+        start = end
+    return size
+
+
+def common_suffix(a, b, limit: int) -> int:
+    """Length of the longest common suffix of two byte strings, at most `limit`."""
+    end_a, end_b, length = len(a), len(b), 0
+    while length < limit:
+        step = min(limit - length, COMPARE_CHUNK_SIZE)
+        if a[end_a - length - step:end_a - length] != b[end_b - length - step:end_b - length]:
+            while step > 256 and a[end_a - length - 256:end_a - length] == b[end_b - length - 256:end_b - length]:
+                length += 256
+                step -= 256
+            while length < limit and a[end_a - length - 1] == b[end_b - length - 1]:
+                length += 1
+            return length
+        length += step
+    return limit
+
+
+class IncrementalBaker:
+    """
+    Re-bakes an edited input by recomputing only the blocks the edit touched.
+
+    This works when every step is block-local, i.e. has a fixed output size
+    per input block (To Base64 on 3-byte groups, To Hex per byte, Caesar per
+    byte): the recipe maps each aligned input segment to a fixed slice of the
+    output, the same property `cryptosuite bake --split` relies on. The
+    baker keeps the previous input and output, finds the edited range by
+    comparing the common prefix and suffix, widens it to whole blocks, and
+    splices the re-baked slice into the previous output in place.
+
+    The output is a bytearray owned by the baker and updated by later calls,
+    so readers on other threads must hold `lock` while reading it.
+
+    An edit that changes the input length by a non-multiple of the block
+    size shifts every later block, so everything from the edit onward is
+    re-baked (e.g. typing one character before the end of a Base64 input).
+    Recipes with a step that is not block-local (decoders, AES, hashes) fall
+    back to a full bake every time.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.alignment = segment_alignment(pipeline)
+        self.last_update = None
+        self.lock = threading.Lock()
+        self._input = None
+        self._output = None
+
+    @property
+    def block_local(self) -> bool:
+        return self.alignment is not None
+
+    def reset(self):
+        self._input = self._output = None
+
+    def bake(self, data) -> tuple[bool, bytes | bytearray]:
+        """
+        Bakes `data`, reusing the previous output where the input is unchanged.
+
+        Returns:
+            A tuple containing a boolean for success and either the whole new
+            output or an error message; `last_update` describes the work done.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        start = time.perf_counter()
+        if not self.block_local or self._input is None:
+            success, result = self.pipeline.run(data)
+            self.last_update = Update(False, 0, len(data), len(data), time.perf_counter() - start)
+            if self.block_local and success:
+                output = bytearray(result)
+                with self.lock:
+                    self._input, self._output = data, output
+                return True, output
+            return success, result
+
+        old_input, old_output, alignment = self._input, self._output, self.alignment
+        prefix = common_prefix(old_input, data)
+        suffix = common_suffix(old_input, data, min(len(old_input), len(data)) - prefix)
+        delta = len(data) - len(old_input)
+
+        begin = prefix - prefix % alignment
+        if delta % alignment:
+            end = len(data)
+        else:
+            end = len(data) - suffix
+            end = min(len(data), end + (-end) % alignment)
+        success, middle = self.pipeline.run(memoryview(data)[begin:end])
+        if not success:
+            self.reset()
+            return False, middle
+
+        # The unchanged tail keeps its alignment, so its output is reused as is.
+        old_end = end - delta
+        tail = pipeline_output_size(self.pipeline, old_end) if end < len(data) else len(old_output)
+        with self.lock:
+            old_output[pipeline_output_size(self.pipeline, begin):tail] = middle
+            self._input = data
+        self.last_update = Update(True, begin, end, len(data), time.perf_counter() - start)
+        return True, old_output
@@ -0,0 +1,107 @@
+# File: operations/optimizer.py
+
+from dataclasses import dataclass, field
+
+from operations.engine import CompiledRecipe, Step, compile_step
+from operations.registry import registry
+
+_CAESAR = {"Caesar Encrypt": 1, "Caesar Decrypt": -1}
+
+
+@dataclass
+class Plan:
+    """The result of optimizing a recipe: both pipelines and what was changed, for the explain view."""
+    original: CompiledRecipe
+    optimized: CompiledRecipe
+    changes: list = field(default_factory=list)
+
+    @property
+    def passes_saved(self) -> int:
+        """Every step is one full pass over its input, so each removed step saves one."""
+        return len(self.original) - len(self.optimized)
+
+    def explain(self) -> str:
+        lines = [f"Original plan ({_passes(len(self.original))}):"]
+        lines += [f"  {i}. {describe_step(step)}" for i, step in enumerate(self.original.steps, start=1)]
+        lines.append(f"Optimized plan ({_passes(len(self.optimized))}):")
+        lines += [f"  {i}. {describe_step(step)}" for i, step in enumerate(self.optimized.steps, start=1)]
+        if not self.optimized.steps:
+            lines.append("  (nothing to do: the output is the input)")
+        if self.changes:
+            lines.append("Changes:")
+            lines += [f"  - {change}" for change in self.changes]
+        else:
+            lines.append("No optimization applies.")
+        lines.append(f"Estimated passes saved: {self.passes_saved}")
+        return "\n".join(lines)
+
+
+def _passes(count: int) -> str:
+    return f"{count} pass" if count == 1 else f"{count} passes"
+
+
+def describe_step(step: Step) -> str:
+    """'Caesar Encrypt(3)' style label; AES keys are never echoed."""
+    shown = [str(value) for name, value in step.args.items() if name != "key"]
+    return f"{step.name}({', '.join(shown)})" if shown else step.name
+
+
+def _cancels(first: Step, second: Step) -> bool:
+    """
+    True when `second` exactly undoes `first`: a forward (encrypt-side)
+    operation followed by its registered inverse, with the same shared args.
+    The reverse order is not an identity (e.g. From Base64 then To Base64
+    normalises whitespace and padding), so it is left alone.
+    """
+    forward = registry.get(first.name)
+    if forward is None or forward.side != "encrypt" or forward.inverse != second.name:
+        return False
+    inverse = registry.get(second.name)
+    # Only the args both sides take must agree, e.g. the AES key, but not a decompression cap.
+    shared = {param.name for param in forward.params} & {param.name for param in inverse.params}
+    return all(first.args.get(name) == second.args.get(name) for name in shared)
+
+
+def _signed_shift(step: Step) -> int:
+    return _CAESAR[step.name] * step.args["shift"]
+
+
+def optimize(pipeline: CompiledRecipe) -> Plan:
+    """
+    Rewrites a compiled recipe into an equivalent one with fewer passes.
+
+    - adjacent inverse pairs (To Hex → From Hex, Caesar Encrypt(3) → Caesar
+      Decrypt(3), AES Encrypt → AES Decrypt with the same key, ...) are removed;
+    - consecutive Caesar steps are fused into one shift mod 26;
+    - a fused Caesar shift of 0, the only identity step, is dropped.
+
+    The rewrite works like a stack, so removing a pair can expose a new one
+    (To Base64, To Hex, From Hex, From Base64 reduces to nothing). Each
+    optimized step records the original step indices it came from in
+    `origins`, so progress and profiles can be shown on the right steps.
+    """
+    stack, changes = [], []
+    for index, step in enumerate(pipeline.steps):
+        origins = pipeline.origins[index]
+        if stack and _cancels(stack[-1][0], step):
+            previous, _ = stack.pop()
+            changes.append(f"Removed {describe_step(previous)} → {describe_step(step)}: inverse pair")
+            continue
+        if stack and stack[-1][0].name in _CAESAR and step.name in _CAESAR:
+            previous, previous_origins = stack.pop()
+            shift = (_signed_shift(previous) + _signed_shift(step)) % 26
+            if shift == 0:
+                changes.append(f"Removed {describe_step(previous)} + {describe_step(step)}: the shifts cancel out")
+                continue
+            # Keep the direction of the first step, so the fused step reads naturally.
+            if previous.name == "Caesar Decrypt":
+                fused = compile_step("Caesar Decrypt", {"shift": 26 - shift})
+            else:
+                fused = compile_step("Caesar Encrypt", {"shift": shift})
+            changes.append(f"Fused {describe_step(previous)} + {describe_step(step)} into {describe_step(fused)}")
+            stack.append((fused, previous_origins + origins))
+            continue
+        stack.append((step, origins))
+
+    optimized = CompiledRecipe([step for step, _ in stack], [origins for _, origins in stack])
+    return Plan(pipeline, optimized, changes)
@@ -0,0 +1,223 @@
+# File: operations/parallel.py
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from multiprocessing import shared_memory
+
+from operations.engine import compile_recipe
+from operations.stream import stream_path
+
+DEFAULT_MIN_SEGMENT = 4 * 1024 * 1024
+
+# Per-process cache of compiled recipes, keyed by their fingerprint.
+_compiled = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attaches to a block owned by the parent without taking over its lifetime."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no 'track' argument. Pool workers share the parent's
+        # resource tracker, where registering the same name again is a no-op.
+        return shared_memory.SharedMemory(name=name)
+
+
+def segment_alignment(pipeline):
+    """
+    Returns the smallest input length that every step can process as whole
+    blocks, or None if a step's output size depends on its content.
+
+    A segment of that many bytes (or any multiple) keeps every step aligned:
+    e.g. 'To Hex -> To Base64' needs multiples of 3 because 3 input bytes
+    become 6 hex digits, which is exactly two Base64 blocks.
+    """
+    alignment, ratio = 1, Fraction(1)
+    for step in pipeline.steps:
+        block_size, output_size = _stage_sizes(step)
+        if output_size is None or output_size(block_size) is None:
+            return None
+        # The input of this step is `ratio` times the segment length.
+        needed = Fraction(block_size) / ratio
+        alignment = math.lcm(alignment, needed.numerator)
+        ratio *= Fraction(output_size(block_size), block_size)
+    return alignment
+
+
+def _stage_sizes(step) -> tuple:
+    """A step's block size and output_size function, read from its stage class without building a stage."""
+    stage_type = step.stage_type
+    return getattr(stage_type, "block_size", 1), getattr(stage_type, "output_size", None)
+
+
+def pipeline_output_size(pipeline, input_size: int) -> int:
+    """Output size of a pipeline for which segment_alignment() is not None."""
+    for step in pipeline.steps:
+        input_size = step.stage_type.output_size(input_size)
+    return input_size
+
+
+def _run_segment(recipe_data, fingerprint, in_name, in_start, in_end, out_name, out_start, out_end):
+    """Worker: runs the recipe on one slice of the input block and writes it into the output block."""
+    pipeline = _compiled.get(fingerprint)
+    if pipeline is None:
+        pipeline = _compiled[fingerprint] = compile_recipe(recipe_data)
+
+    source, sink = _attach(in_name), _attach(out_name)
+    try:
+        view = source.buf[in_start:in_end]
+        try:
+            success, result = pipeline.run(view)
+        finally:
+            view.release()
+        if not success:
+            return False, result
+        if len(result) != out_end - out_start:
+            return False, "Segment produced an unexpected output size."
+        sink.buf[out_start:out_end] = result
+        return True, len(result)
+    finally:
+        source.close()
+        sink.close()
+
+
+def plan_segments(pipeline, size: int, workers: int, min_segment: int = DEFAULT_MIN_SEGMENT):
+    """
+    Splits an input of `size` bytes into aligned (in_start, in_end, out_start, out_end)
+    segments, or returns None when the recipe cannot be split.
+    """
+    alignment = segment_alignment(pipeline)
+    if alignment is None or not pipeline.steps:
+        return None
+    count = max(1, min(workers, size // max(min_segment, 1)))
+    segment = max(alignment, math.ceil(size / count / alignment) * alignment)
+
+    segments, out_start = [], 0
+    for in_start in range(0, size, segment):
+        in_end = min(in_start + segment, size)
+        out_end = out_start + pipeline_output_size(pipeline, in_end - in_start)
+        segments.append((in_start, in_end, out_start, out_end))
+        out_start = out_end
+    return segments
+
+
+def run_parallel_shared(pipeline, source: shared_memory.SharedMemory, size: int, workers: int = None,
+                        executor: ProcessPoolExecutor = None, min_segment: int = DEFAULT_MIN_SEGMENT):
+    """
+    Runs a recipe over an input already placed in shared memory.
+
+    Returns:
+        A tuple (success, result). On success, result is a new SharedMemory
+        block holding the output in its first pipeline_output_size(size)
+        bytes; the caller must close() and unlink() it. On failure, result is
+        the error message.
+    """
+    workers = workers or os.cpu_count() or 1
+    segments = plan_segments(pipeline, size, workers, min_segment)
+    if segments is None:
+        return False, "This recipe cannot be split into independent segments."
+
+    out_size = segments[-1][3] if segments else 0
+    sink = shared_memory.SharedMemory(create=True, size=max(out_size, 1))
+    recipe_data = pipeline.to_json()
+    fingerprint = pipeline.fingerprints[-1]
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(segments)) or 1)
+    try:
+        futures = [executor.submit(_run_segment, recipe_data, fingerprint, source.name, *segment[:2],
+                                   sink.name, *segment[2:]) for segment in segments]
+        for future in futures:
+            success, result = future.result()
+            if not success:
+                sink.close()
+                sink.unlink()
+                return False, result
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return True, sink
+
+
+def run_parallel(pipeline, data, workers: int = None, executor: ProcessPoolExecutor = None,
+                 min_segment: int = DEFAULT_MIN_SEGMENT) -> tuple[bool, bytes]:
+    """
+    Runs a recipe on one large input split across worker processes.
+
+    The input is copied once into shared memory, workers read their aligned
+    segment and write their output in place, and the output is reassembled
+    in order without pickling any large buffer. Recipes that cannot be split
+    (decoders) or inputs smaller than two segments run serially instead.
+
+    Returns:
+        A tuple containing a boolean for success and the result bytes or an
+        error message.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    size = len(data)
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or size < 2 * min_segment or segment_alignment(pipeline) is None:
+        return pipeline.run(data)
+
+    source = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        source.buf[:size] = data
+        success, result = run_parallel_shared(pipeline, source, size, workers, executor, min_segment)
+    finally:
+        source.close()
+        source.unlink()
+    if not success:
+        return False, result
+    try:
+        return True, bytes(result.buf[:pipeline_output_size(pipeline, size)])
+    finally:
+        result.close()
+        result.unlink()
+
+
+def run_parallel_file(pipeline, input_path: str, output_path: str, workers: int = None,
+                      executor: ProcessPoolExecutor = None,
+                      min_segment: int = DEFAULT_MIN_SEGMENT) -> tuple[bool, int]:
+    """
+    Like run_parallel, but reads the input file straight into shared memory and
+    writes the output file straight from it, so the data is never held in a
+    Python bytes object.
+
+    Returns:
+        A tuple containing a boolean for success and the number of bytes
+        written or an error message.
+    """
+    try:
+        size = os.path.getsize(input_path)
+    except OSError as e:
+        return False, f"File error: {e}"
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or size < 2 * min_segment or segment_alignment(pipeline) is None:
+        return stream_path(pipeline, input_path, output_path)
+
+    try:
+        source = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    except OSError as e:
+        return False, f"File error: {e}"
+    try:
+        with open(input_path, "rb") as f, source.buf[:size] as view:
+            f.readinto(view)
+        success, result = run_parallel_shared(pipeline, source, size, workers, executor, min_segment)
+        if not success:
+            return False, result
+        try:
+            out_size = pipeline_output_size(pipeline, size)
+            with open(output_path, "wb") as f, result.buf[:out_size] as view:
+                f.write(view)
+            return True, out_size
+        finally:
+            result.close()
+            result.unlink()
+    except OSError as e:
+        return False, f"File error: {e}"
+    finally:
+        source.close()
+        source.unlink()
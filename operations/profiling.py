@@ -0,0 +1,163 @@
+# File: operations/profiling.py
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field, asdict
+
+from operations.engine import execute_step
+
+
+@dataclass
+class StepProfile:
+    """Measurements of one executed recipe step."""
+    index: int
+    name: str
+    start: float  # Seconds since the start of the run.
+    wall: float
+    cpu: float
+    bytes_in: int
+    bytes_out: int
+    allocated_blocks: int
+    peak_bytes: int = None  # Only measured when memory tracing is on.
+    note: str = None  # What the step decided on this input (see Operation.note).
+
+    @property
+    def throughput(self) -> float:
+        """Input bytes processed per second of wall time."""
+        return self.bytes_in / self.wall if self.wall else 0.0
+
+    def describe(self) -> str:
+        """One-line summary shown under the step in the recipe panel."""
+        text = (f"{format_seconds(self.wall)} · {format_bytes(self.throughput)}/s · "
+                f"{format_bytes(self.bytes_in)} → {format_bytes(self.bytes_out)} · "
+                f"CPU {format_seconds(self.cpu)} · {self.allocated_blocks:+,} blocks")
+        if self.peak_bytes is not None:
+            text += f" · peak {format_bytes(self.peak_bytes)}"
+        if self.note:
+            text += f" · {self.note}"
+        return text
+
+
+@dataclass
+class RecipeProfile:
+    """The profile of a whole run: one StepProfile per step that ran, in order."""
+    steps: list = field(default_factory=list)
+    wall: float = 0.0
+    cpu: float = 0.0
+    started_at: float = field(default_factory=time.time)
+    thread_id: int = field(default_factory=threading.get_native_id)
+
+    def slowest(self):
+        return max(self.steps, key=lambda step: step.wall, default=None)
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Returns the run in the Chrome trace event format (loadable in
+        chrome://tracing and ui.perfetto.dev): one complete event for the
+        bake with the steps nested inside it, timestamps in microseconds.
+        """
+        pid = os.getpid()
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": self.thread_id, "args": {"name": "CryptoSuite"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": self.thread_id, "args": {"name": "bake"}},
+            {"name": "Bake", "cat": "recipe", "ph": "X", "pid": pid, "tid": self.thread_id, "ts": 0,
+             "dur": self.wall * 1e6, "args": {"steps": len(self.steps), "cpu_ms": self.cpu * 1e3}},
+        ]
+        for step in self.steps:
+            events.append({
+                "name": step.name, "cat": "step", "ph": "X", "pid": pid, "tid": self.thread_id,
+                "ts": step.start * 1e6, "dur": step.wall * 1e6,
+                "args": {"index": step.index, "cpu_ms": step.cpu * 1e3, "bytes_in": step.bytes_in,
+                         "bytes_out": step.bytes_out, "mb_per_s": step.throughput / 1024 ** 2,
+                         "allocated_blocks": step.allocated_blocks, "peak_bytes": step.peak_bytes},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "cpu_count": os.cpu_count(),
+                "steps": [asdict(step) for step in self.steps],
+            },
+        }
+
+    def save_trace(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, indent=1)
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds * 1e6:.0f} µs"
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def run_profiled(pipeline, data, progress=None, cancel=None, trace_memory: bool = False):
+    """
+    Runs a compiled recipe like CompiledRecipe.run while measuring every step.
+
+    Wall time uses perf_counter and CPU time the worker thread's own clock.
+    `allocated_blocks` is the change in live interpreter memory blocks across
+    the step (process-wide, so other threads add a little noise). With
+    `trace_memory`, tracemalloc also records each step's peak allocation;
+    it is left running if it was already on.
+
+    Returns:
+        A tuple (success, result, profile), where success and result are
+        the usual pair from CompiledRecipe.run and profile covers every
+        step that ran, including a failing one.
+
+    Raises:
+        BakeCancelled: If the cancel token is set while running.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    profile = RecipeProfile()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    run_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        for index, step in enumerate(pipeline.steps):
+            if trace_memory:
+                tracemalloc.reset_peak()
+                traced_before = tracemalloc.get_traced_memory()[0]
+            blocks_before = sys.getallocatedblocks()
+            step_start, step_cpu = time.perf_counter(), time.thread_time()
+
+            success, result = execute_step(step, data, index, progress, cancel)
+
+            wall, cpu = time.perf_counter() - step_start, time.thread_time() - step_cpu
+            peak = tracemalloc.get_traced_memory()[1] - traced_before if trace_memory else None
+            blocks = sys.getallocatedblocks() - blocks_before
+            # Outside the measured span: the note re-reads the step's input.
+            note = step.note(data) if success and step.note is not None else None
+            profile.steps.append(StepProfile(index, step.name, step_start - run_start, wall, cpu, len(data),
+                                             len(result) if success else 0, blocks, peak, note))
+            if not success:
+                return False, f"Step '{step.name}' failed: {result}", profile
+            data = result
+    finally:
+        profile.wall = time.perf_counter() - run_start
+        profile.cpu = time.thread_time() - cpu_start
+        if started_tracing:
+            tracemalloc.stop()
+    return True, data, profile
@@ -0,0 +1,104 @@
+# File: operations/progress.py
+
+import threading
+import time
+from dataclasses import dataclass
+
+# Inputs are fed to a step in chunks of this size when progress or cancellation is requested.
+PROGRESS_CHUNK_SIZE = 1024 * 1024
+# Upper bound on progress events forwarded per second, whatever the worker's speed.
+MAX_UPDATES_PER_SECOND = 30
+
+
+class BakeCancelled(Exception):
+    """Raised inside a worker when the user cancels the bake."""
+
+
+class CancelToken:
+    """A thread-safe flag the UI sets and the worker checks between chunks."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Raises BakeCancelled if the token has been cancelled."""
+        if self._event.is_set():
+            raise BakeCancelled("Bake cancelled.")
+
+
+@dataclass(frozen=True)
+class Progress:
+    """A snapshot of how far one step has got through its input."""
+    step_index: int
+    step_name: str
+    done: int
+    total: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+    @property
+    def eta(self):
+        """Seconds left for this step at the current rate, or None before the rate is known."""
+        if self.finished:
+            return 0.0
+        if not self.done or not self.elapsed:
+            return None
+        return self.elapsed * (self.total - self.done) / self.done
+
+
+class ProgressThrottle:
+    """
+    Coalesces progress reports so that `callback` runs at most MAX_UPDATES_PER_SECOND times a second.
+
+    The latest report of every step is held, and each call of `callback`
+    hands over a tuple of them (in step order) for the steps that moved since
+    the previous call. A step that finished in between is still delivered at
+    100%, but a recipe of many short steps costs no more calls than one long
+    step. flush() sends whatever is still held when the run ends. Used as the
+    `progress` argument of CompiledRecipe.run; it is called on the worker thread.
+    """
+
+    def __init__(self, callback, max_rate: int = MAX_UPDATES_PER_SECOND):
+        self.callback = callback
+        self.interval = 1.0 / max_rate
+        self._last = float("-inf")
+        self._started = {}
+        self._pending = {}
+
+    def __call__(self, step_index: int, step_name: str, done: int, total: int):
+        now = time.monotonic()
+        started = self._started.setdefault(step_index, now)
+        self._pending[step_index] = Progress(step_index, step_name, done, total, now - started)
+        if now - self._last >= self.interval:
+            self._last = now
+            self.flush()
+
+    def flush(self):
+        """Sends the reports held back since the last call of `callback`, if any."""
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            self.callback(tuple(pending.values()))
+
+
+def format_eta(seconds) -> str:
+    """Formats an ETA for the recipe panel: '', '<1s', '42s' or '3m05s'."""
+    if seconds is None:
+        return ""
+    if seconds < 1:
+        return "<1s"
+    seconds = int(seconds)
+    return f"{seconds // 60}m{seconds % 60:02d}s" if seconds >= 60 else f"{seconds}s"
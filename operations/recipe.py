@@ -0,0 +1,150 @@
+# File: operations/recipe.py
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RecipeStep:
+    """
+    One step of an editable recipe.
+
+    `info` and `progress` are display annotations (the profile line or
+    progress of the last bake); they are never saved with the recipe.
+    """
+    operation: str
+    args: dict = field(default_factory=dict)
+    info: str = ""
+    progress: float = None
+
+    def to_dict(self) -> dict:
+        return {"operation": self.operation, "args": dict(self.args)}
+
+
+@dataclass(frozen=True)
+class RecipeChange:
+    """
+    Describes one change to a Recipe, for its listeners.
+
+    kind is one of:
+      "insert"   - a step was inserted at `index`
+      "remove"   - the step at `index` was removed
+      "move"     - the step at `index` moved to `new_index`
+      "update"   - an argument of the step at `index` changed
+      "reset"    - the whole recipe was replaced or cleared
+      "annotate" - only display annotations changed (of the step at `index`,
+                   or of every step when index is None)
+    """
+    kind: str
+    index: int = None
+    new_index: int = None
+
+    @property
+    def structural(self) -> bool:
+        """False for annotation-only changes, which never alter what the recipe computes."""
+        return self.kind != "annotate"
+
+
+class Recipe:
+    """
+    The recipe being edited: an ordered list of steps that notifies its
+    listeners of every change.
+
+    The GUI keeps all recipe state here instead of in widgets, so views can
+    show any window of a recipe of any length, and saving or compiling it
+    never has to walk the widget tree. Loading replaces every step with a
+    single "reset" notification, however many steps there are.
+    """
+
+    def __init__(self, recipe_data=None):
+        self._steps = []
+        self._listeners = []
+        # Increases on every structural change; a cheap way to tell that a compiled recipe is stale.
+        self.version = 0
+        if recipe_data:
+            self.replace(recipe_data)
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __iter__(self):
+        return iter(self._steps)
+
+    def __getitem__(self, index) -> RecipeStep:
+        return self._steps[index]
+
+    # --- Listeners ---
+
+    def subscribe(self, callback):
+        """Calls `callback(change)` with a RecipeChange after every modification."""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, kind: str, index: int = None, new_index: int = None):
+        change = RecipeChange(kind, index, new_index)
+        if change.structural:
+            self.version += 1
+        for callback in list(self._listeners):
+            callback(change)
+
+    # --- Editing ---
+
+    def insert(self, index: int, operation: str, args: dict = None) -> int:
+        index = max(0, min(index, len(self._steps)))
+        self._steps.insert(index, RecipeStep(operation, dict(args or {})))
+        self._notify("insert", index)
+        return index
+
+    def append(self, operation: str, args: dict = None) -> int:
+        return self.insert(len(self._steps), operation, args)
+
+    def remove(self, index: int):
+        del self._steps[index]
+        self._notify("remove", index)
+
+    def move(self, index: int, new_index: int):
+        """Moves a step so that it ends up at `new_index`."""
+        new_index = max(0, min(new_index, len(self._steps) - 1))
+        if new_index == index:
+            return
+        self._steps.insert(new_index, self._steps.pop(index))
+        self._notify("move", index, new_index)
+
+    def set_arg(self, index: int, name: str, value: str):
+        step = self._steps[index]
+        if step.args.get(name) == value:
+            return
+        step.args[name] = value
+        self._notify("update", index)
+
+    def replace(self, recipe_data):
+        """Replaces every step, from the 'Save Recipe' JSON format or RecipeStep objects."""
+        self._steps = [step if isinstance(step, RecipeStep) else
+                       RecipeStep(step.get("operation"), dict(step.get("args") or {}))
+                       for step in recipe_data]
+        self._notify("reset")
+
+    def clear(self):
+        self.replace([])
+
+    def to_data(self) -> list:
+        """The recipe in the JSON format used by 'Save Recipe' and compile_recipe."""
+        return [step.to_dict() for step in self._steps]
+
+    # --- Display annotations ---
+
+    def annotate(self, index: int, info: str = None, progress=...):
+        """Sets the info line and/or progress (a fraction, or None to hide it) shown for one step."""
+        step = self._steps[index]
+        if info is not None:
+            step.info = info
+        if progress is not ...:
+            step.progress = progress
+        self._notify("annotate", index)
+
+    def reset_annotations(self, info: str = ""):
+        """Clears every step's progress and sets every info line to `info`."""
+        for step in self._steps:
+            step.info, step.progress = info, None
+        self._notify("annotate")
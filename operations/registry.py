@@ -0,0 +1,307 @@
+# File: operations/registry.py
+
+import importlib
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+
+ENTRY_POINT_GROUP = "cryptosuite.operations"
+HASH_ALGORITHMS = ("md5", "sha1", "sha224", "sha256", "sha384", "sha512", "sha3_256", "sha3_512",
+                   "blake2b", "blake2s")
+
+
+class RecipeError(ValueError):
+    """Raised when a recipe cannot be compiled (unknown operation or bad arguments)."""
+
+
+def parse_shift(value) -> int:
+    """Validates and converts a Caesar shift."""
+    try:
+        shift = int(value)
+    except (ValueError, TypeError):
+        raise RecipeError("Invalid shift value. Must be an integer.")
+    if not 1 <= shift <= 25:
+        raise RecipeError("Shift must be between 1 and 25.")
+    return shift
+
+
+def parse_key(value) -> str:
+    """Validates an AES password."""
+    if not isinstance(value, str) or not value:
+        raise RecipeError("Key must not be empty.")
+    return value
+
+
+def parse_aes_mode(value) -> str:
+    """Validates an AES mode of operation."""
+    mode = str(value).strip().upper()
+    if mode not in ("GCM", "CTR"):
+        raise RecipeError("Mode must be GCM or CTR.")
+    return mode
+
+
+def parse_hash_algorithms(value) -> str:
+    """Validates a comma-separated list of digests, e.g. 'md5, SHA-256'; returns it normalised ('md5,sha256')."""
+    names = [name.strip().lower().replace("-", "") for name in str(value).split(",") if name.strip()]
+    names = [name.replace("sha3", "sha3_") if name.startswith("sha3") and "_" not in name else name for name in names]
+    if not names:
+        raise RecipeError("Choose at least one hash algorithm.")
+    for name in names:
+        if name not in HASH_ALGORITHMS:
+            raise RecipeError(f"Unknown hash algorithm '{name}'. Choose from: {', '.join(HASH_ALGORITHMS)}.")
+    return ",".join(dict.fromkeys(names))
+
+
+def parse_flag(value) -> bool:
+    """Validates a yes/no switch ('yes', 'no', 'true', 'false', '1', '0', 'on', 'off')."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("yes", "true", "1", "on"):
+        return True
+    if text in ("no", "false", "0", "off", ""):
+        return False
+    raise RecipeError(f"Invalid switch value '{value}'. Use yes or no.")
+
+
+def _parse_int(value, what: str, low: int, high: int) -> int:
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        raise RecipeError(f"Invalid {what}. Must be an integer.")
+    if not low <= number <= high:
+        raise RecipeError(f"{what.capitalize()} must be between {low} and {high}.")
+    return number
+
+
+def parse_level(value) -> int:
+    """Validates a zlib, gzip or lzma compression level (0 = fastest/none, 9 = smallest)."""
+    return _parse_int(value, "compression level", 0, 9)
+
+
+def parse_bz2_level(value) -> int:
+    """Validates a bzip2 level, which is its block size in units of 100 KB."""
+    return _parse_int(value, "compression level", 1, 9)
+
+
+def parse_window(value) -> int:
+    """Validates a deflate window size, as log2 of the history (9 = 512 bytes, 15 = 32 KB)."""
+    return _parse_int(value, "window size", 9, 15)
+
+
+def parse_dict_size(value) -> int:
+    """Validates an LZMA dictionary size, as log2 of its size (12 = 4 KB, 30 = 1 GB)."""
+    return _parse_int(value, "dictionary size", 12, 30)
+
+
+def parse_max_output(value) -> int:
+    """Validates a decompression output cap in MB (at most 16 GB, the service's body limit)."""
+    return _parse_int(value, "output limit", 1, 16 * 1024)
+
+
+def parse_threads(value) -> int:
+    """Validates a thread count; 0 means one per CPU core."""
+    return _parse_int(value, "thread count", 0, 256)
+
+
+def _resolve(target):
+    """Turns a 'package.module:attribute' string into the object, importing the module on first use."""
+    if not isinstance(target, str):
+        return target
+    module_name, _, attribute = target.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+@dataclass(frozen=True)
+class Param:
+    """One user-editable argument of an operation, as shown in the recipe panel."""
+    name: str
+    label: str
+    parse: Callable = str
+    default: str = ""
+    width: int = None
+
+
+@dataclass
+class Operation:
+    """
+    Everything the app needs to know about an operation.
+
+    `function` and `stage` may be given as 'module:attribute' strings so that
+    the implementing module is only imported the first time the operation
+    is compiled. `function(data, **fixed_args, **args)` returns the usual
+    (success, result) tuple; `stage(**fixed_args, **args)` builds the
+    StreamStage used for chunked execution and declares the block alignment.
+    The optional `note(data, **fixed_args, **args)` describes what the step
+    decides on a given input (e.g. the shifts Caesar Brute Force ranked);
+    profiles show it next to the step's timings.
+    """
+    name: str
+    category: str
+    side: str = "both"
+    function: object = None
+    stage: object = None
+    inverse: str = None
+    params: tuple = ()
+    fixed_args: dict = field(default_factory=dict)
+    note: object = None
+
+    @property
+    def available(self) -> bool:
+        return self.function is not None
+
+    def load_function(self) -> Callable:
+        self.function = _resolve(self.function)
+        return self.function
+
+    def load_note(self):
+        self.note = _resolve(self.note)
+        return self.note
+
+    def load_stage(self):
+        """Returns the callable that builds this operation's StreamStage from its bound args."""
+        if self.stage is None:
+            from operations.stream import BufferedStage
+            return partial(BufferedStage, self.load_function())
+        self.stage = _resolve(self.stage)
+        return self.stage
+
+    def load_stage_type(self) -> type:
+        """The StreamStage class load_stage() builds, whose block_size and output_size are static."""
+        if self.stage is None:
+            from operations.stream import BufferedStage
+            return BufferedStage
+        return self.load_stage()
+
+    def parse_args(self, args: dict) -> dict:
+        """Validates the raw recipe args (usually strings typed in the GUI) against the schema."""
+        return {param.name: param.parse(args.get(param.name, param.default)) for param in self.params}
+
+
+class Registry:
+    """
+    The central table of operations, with O(1) lookup by name.
+
+    Plugins are discovered through the 'cryptosuite.operations' entry point
+    group: each entry point is named after the operation and points to an
+    Operation object. Only the names are read at discovery time; the plugin
+    module itself is imported the first time the operation is looked up.
+    """
+
+    def __init__(self):
+        self._operations = {}
+        self._plugins = None
+
+    def register(self, operation: Operation) -> Operation:
+        self._operations[operation.name] = operation
+        return operation
+
+    def _discover(self) -> dict:
+        if self._plugins is None:
+            self._plugins = {}
+            try:
+                from importlib.metadata import entry_points
+                for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                    if entry_point.name not in self._operations:
+                        self._plugins[entry_point.name] = entry_point
+            except Exception:
+                # A broken installation must never stop the built-in operations from working.
+                pass
+        return self._plugins
+
+    def get(self, name: str) -> Operation:
+        """Returns the operation called `name`, loading its plugin on first use, or None."""
+        operation = self._operations.get(name)
+        if operation is not None:
+            return operation
+        entry_point = self._discover().pop(name, None)
+        if entry_point is None:
+            return None
+        try:
+            operation = entry_point.load()
+            if callable(operation) and not isinstance(operation, Operation):
+                operation = operation()
+        except Exception as e:
+            raise RecipeError(f"Failed to load plugin operation '{name}': {e}")
+        return self.register(operation)
+
+    def __contains__(self, name):
+        return name in self._operations or name in self._discover()
+
+    def names(self, side: str = None) -> list:
+        """Names of the built-in operations for one side of the app, in registration order."""
+        return [name for name, operation in self._operations.items()
+                if side is None or operation.side in (side, "both")]
+
+    def plugin_names(self) -> list:
+        """Names of discovered plugin operations that have not been loaded yet."""
+        return list(self._discover())
+
+    def inverse(self, name: str):
+        operation = self.get(name)
+        return operation.inverse if operation is not None else None
+
+
+registry = Registry()
+
+_SHIFT = Param("shift", "Shift (1-25)", parse=parse_shift, width=120)
+_KEY = Param("key", "Enter Key...", parse=parse_key)
+_ALGORITHMS = Param("algorithms", "md5,sha256,...", parse=parse_hash_algorithms, default="sha256")
+_MODE = Param("mode", "Mode (GCM/CTR)", parse=parse_aes_mode, default="GCM", width=70)
+_REUSE_SALT = Param("reuse_salt", "Reuse salt (yes/no)", parse=parse_flag, default="no", width=130)
+_LEVEL = Param("level", "Level (0-9)", parse=parse_level, default="6", width=80)
+_BZ2_LEVEL = Param("level", "Level (1-9)", parse=parse_bz2_level, default="9", width=80)
+_WINDOW = Param("window", "Window (9-15)", parse=parse_window, default="15", width=90)
+_DICT_SIZE = Param("window", "Dict 2^n (12-30)", parse=parse_dict_size, default="23", width=110)
+_MAX_OUTPUT = Param("max_mb", "Max output MB", parse=parse_max_output, default="1024", width=110)
+_THREADS = Param("threads", "Threads (0 = all)", parse=parse_threads, default="0", width=110)
+
+for _operation in (
+    Operation("To Base64", "Encoders / Decoders", "encrypt", "operations.encoders:to_base64",
+              "operations.stream:ToBase64Stage", inverse="From Base64"),
+    Operation("From Base64", "Decoders", "decrypt", "operations.encoders:from_base64",
+              "operations.stream:FromBase64Stage", inverse="To Base64"),
+    Operation("To Hex", "Encoders / Decoders", "encrypt", "operations.hex:to_hex",
+              "operations.stream:ToHexStage", inverse="From Hex"),
+    Operation("From Hex", "Decoders", "decrypt", "operations.hex:from_hex",
+              "operations.stream:FromHexStage", inverse="To Hex"),
+    Operation("Caesar Encrypt", "Ciphers", "encrypt", "operations.ciphers:caesar_cipher_bytes",
+              "operations.stream:CaesarStage", inverse="Caesar Decrypt", params=(_SHIFT,),
+              fixed_args={"decrypt": False}),
+    Operation("Caesar Decrypt", "Ciphers", "decrypt", "operations.ciphers:caesar_cipher_bytes",
+              "operations.stream:CaesarStage", inverse="Caesar Encrypt", params=(_SHIFT,),
+              fixed_args={"decrypt": True}),
+    Operation("Caesar Brute Force", "Ciphers", "decrypt", "operations.ciphers:caesar_brute_force",
+              "operations.stream:CaesarBruteForceStage", note="operations.ciphers:describe_caesar_ranking"),
+    Operation("AES Encrypt", "Ciphers", "encrypt", "operations.aes:aes_encrypt", "operations.aes:AESEncryptStage",
+              inverse="AES Decrypt", params=(_KEY, _MODE, _REUSE_SALT)),
+    Operation("AES Decrypt", "Ciphers", "decrypt", "operations.aes:aes_decrypt", "operations.aes:AESDecryptStage",
+              inverse="AES Encrypt", params=(_KEY,)),
+    Operation("Hash", "Hashing", "encrypt", "operations.hashing:hash_data", "operations.hashing:HashStage",
+              params=(_ALGORITHMS,)),
+    Operation("Zlib Compress", "Compression", "encrypt", "operations.compression:compress",
+              "operations.compression:CompressStage", inverse="Zlib Decompress", params=(_LEVEL, _WINDOW),
+              fixed_args={"format": "zlib"}),
+    Operation("Zlib Decompress", "Compression", "decrypt", "operations.compression:decompress",
+              "operations.compression:DecompressStage", inverse="Zlib Compress",
+              params=(_MAX_OUTPUT,), fixed_args={"format": "zlib"}),
+    Operation("Gzip Compress", "Compression", "encrypt", "operations.compression:compress",
+              "operations.compression:CompressStage", inverse="Gzip Decompress",
+              params=(_LEVEL, _WINDOW, _THREADS), fixed_args={"format": "gzip"}),
+    Operation("Gzip Decompress", "Compression", "decrypt", "operations.compression:decompress",
+              "operations.compression:DecompressStage", inverse="Gzip Compress",
+              params=(_MAX_OUTPUT,), fixed_args={"format": "gzip"}),
+    Operation("Bzip2 Compress", "Compression", "encrypt", "operations.compression:compress",
+              "operations.compression:CompressStage", inverse="Bzip2 Decompress", params=(_BZ2_LEVEL,),
+              fixed_args={"format": "bz2"}),
+    Operation("Bzip2 Decompress", "Compression", "decrypt", "operations.compression:decompress",
+              "operations.compression:DecompressStage", inverse="Bzip2 Compress",
+              params=(_MAX_OUTPUT,), fixed_args={"format": "bz2"}),
+    Operation("LZMA Compress", "Compression", "encrypt", "operations.compression:compress",
+              "operations.compression:CompressStage", inverse="LZMA Decompress", params=(_LEVEL, _DICT_SIZE),
+              fixed_args={"format": "lzma"}),
+    Operation("LZMA Decompress", "Compression", "decrypt", "operations.compression:decompress",
+              "operations.compression:DecompressStage", inverse="LZMA Compress",
+              params=(_MAX_OUTPUT,), fixed_args={"format": "lzma"}),
+):
+    registry.register(_operation)
@@ -0,0 +1,86 @@
+# File: operations/sources.py
+
+import mmap
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def map_file(path: str):
+    """
+    Memory-maps a file read-only and yields a memoryview of its contents.
+
+    Slicing the view never copies, so operations that accept bytes-like
+    input (hashing, encoders) read straight from the page cache. Every slice
+    taken from the view must be released (or converted to bytes) before the
+    block exits, or closing the mapping raises BufferError.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped.
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if hasattr(mapping, "madvise"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mapping)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+# Files at least this large are attached as a FileSource instead of being loaded into the input box.
+LARGE_INPUT_THRESHOLD = 8 * 1024 * 1024
+PREVIEW_BYTES = 4096
+
+
+class FileSource:
+    """
+    An input file attached by path rather than read into memory.
+
+    Bakes map the file when they start (see open_input), so opening even a
+    multi-gigabyte input is instant and its pages are only loaded, and
+    dropped again by the kernel, as the recipe reads through them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def __len__(self):
+        return self.size
+
+    def digest(self) -> bytes:
+        """Identifies this version of the file for StepCache without reading it: path, size and mtime."""
+        stat = os.stat(self.path)
+        return f"{os.path.abspath(self.path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8")
+
+    def preview(self, size: int = PREVIEW_BYTES) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read(size)
+
+    def summary(self) -> str:
+        """The header shown in the input panel in place of the file's contents."""
+        preview = self.preview()
+        text = preview.decode("utf-8", errors="replace")
+        return (f"📄 {self.name}\n{self.path}\n{self.size:,} bytes, baked straight from a memory map.\n"
+                f"Clear the input to detach it.\n\n--- First {len(preview):,} bytes ---\n{text}")
+
+
+@contextmanager
+def open_input(data):
+    """
+    Yields bake-ready input: the memory map of a FileSource, or bytes/str
+    passed through unchanged. Results that may still point into the mapping
+    (a memoryview) must be copied before the block exits.
+    """
+    if isinstance(data, FileSource):
+        with map_file(data.path) as view:
+            yield view
+    else:
+        yield data
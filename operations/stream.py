@@ -0,0 +1,325 @@
+# File: operations/stream.py
+
+import base64
+import binascii
+import string
+
+from operations.encoders import to_base64, from_base64
+from operations.hex import to_hex, from_hex
+from operations.ciphers import caesar_cipher_bytes, rank_caesar_sample, BRUTE_FORCE_SAMPLE
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_BASE64_ALPHABET = (string.ascii_letters + string.digits + "+/=").encode("ascii")
+# Every byte that b64decode would silently discard in non-validating mode.
+_BASE64_JUNK = bytes(b for b in range(256) if b not in _BASE64_ALPHABET)
+_WHITESPACE = string.whitespace.encode("ascii")
+
+
+class StepFailed(ValueError):
+    """Raised by a streaming pipeline when one of its steps fails."""
+
+
+class StreamStage:
+    """
+    Runs one recipe step over a stream of chunks.
+
+    Each stage declares the block alignment its transform needs: only whole
+    blocks are transformed as they arrive, and a partial block is carried
+    over to the next chunk (or to flush() at the end of the stream).
+    `incremental` is False for stages that do all their work in flush().
+
+    `block_size` and `output_size` belong to the class, so planners read
+    them without building a stage (which may derive a key, for instance).
+    """
+    block_size = 1
+    incremental = True
+
+    def __init__(self):
+        self._carry = b""
+
+    def prepare(self, chunk) -> bytes:
+        """Hook for stages that need to filter the raw chunk (any bytes-like object) before aligning it."""
+        return chunk
+
+    @classmethod
+    def output_size(cls, input_size: int):
+        """
+        Returns the exact output size for an input of the given size, or None
+        when it depends on the content (e.g. decoders skipping whitespace) or
+        the stage needs to see the whole input. Only stages with a known size
+        can be split into independent segments.
+        """
+        return None
+
+    def transform(self, block: bytes) -> bytes:
+        raise NotImplementedError("This method must be implemented by a subclass")
+
+    @staticmethod
+    def unwrap(result: tuple[bool, bytes]) -> bytes:
+        """Turns an operation's (success, result) tuple into bytes, raising ValueError on failure."""
+        success, data = result
+        if not success:
+            raise ValueError(data)
+        return data
+
+    def feed(self, chunk) -> bytes:
+        data = self.prepare(chunk)
+        if self._carry:
+            data = self._carry + data
+        cut = len(data) - len(data) % self.block_size
+        if cut == len(data):
+            # Already aligned (always the case for block_size 1): no slicing copies.
+            self._carry = b""
+            return self.transform(data) if cut else b""
+        self._carry = bytes(data[cut:])
+        return self.transform(data[:cut]) if cut else b""
+
+    def flush(self) -> bytes:
+        carry, self._carry = self._carry, b""
+        return self.transform(carry) if carry else b""
+
+
+class ToBase64Stage(StreamStage):
+    block_size = 3  # 3 bytes in, 4 characters out
+
+    @classmethod
+    def output_size(cls, input_size):
+        return (input_size + 2) // 3 * 4
+
+    def transform(self, block):
+        return self.unwrap(to_base64(block))
+
+
+class FromBase64Stage(StreamStage):
+    """
+    Decodes Base64 as it arrives. Padding is stripped as it is seen and the
+    last partial block is padded again in flush(), so the result is the same
+    as from_base64 on the whole input wherever the chunks are split.
+    """
+    block_size = 4  # 4 characters in, 3 bytes out
+
+    def __init__(self):
+        super().__init__()
+        # "=" seen so far: once padding starts, only more padding (or junk) may follow.
+        self._pads = 0
+
+    def feed(self, chunk):
+        # Fast path: a clean, aligned chunk is decoded as-is, skipping the junk filter.
+        if not self._carry and not self._pads and len(chunk) % 4 == 0:
+            try:
+                decoded = base64.b64decode(chunk, validate=True)
+            except binascii.Error:
+                pass
+            else:
+                if chunk[-1:] == b"=":
+                    self._pads = 1
+                return decoded
+        return super().feed(chunk)
+
+    def prepare(self, chunk):
+        data = bytes(chunk).translate(None, _BASE64_JUNK)
+        index = 0 if self._pads else data.find(b"=")
+        if index == -1:
+            return data
+        if data[index:].strip(b"="):
+            raise ValueError("Invalid Base64 input: data after padding.")
+        self._pads += len(data) - index
+        return data[:index]
+
+    def transform(self, block):
+        return self.unwrap(from_base64(block))
+
+    def flush(self):
+        missing = -len(self._carry) % 4
+        if missing and (missing == 3 or self._pads < missing):
+            raise ValueError("Invalid Base64 input: Incorrect padding")
+        self._carry += b"=" * missing
+        return super().flush()
+
+
+class ToHexStage(StreamStage):
+    @classmethod
+    def output_size(cls, input_size):
+        return input_size * 2
+
+    def transform(self, block):
+        return self.unwrap(to_hex(block))
+
+
+class FromHexStage(StreamStage):
+    block_size = 2  # 2 hex digits per byte
+
+    def __init__(self):
+        super().__init__()
+        self._pending = b""
+
+    def feed(self, chunk):
+        # Fast path: a chunk of bare hex digits is decoded as-is. One ending in "0" may
+        # be followed by the "x" of a split "0x" prefix, so it takes the slow path.
+        if not self._carry and not self._pending and len(chunk) % 2 == 0 and chunk[-1:] != b"0":
+            try:
+                return binascii.unhexlify(chunk)
+            except binascii.Error:
+                pass
+        return super().feed(chunk)
+
+    def prepare(self, chunk):
+        # A trailing "0" may be the first half of a "0x" prefix split across chunks.
+        data = (self._pending + bytes(chunk)).translate(None, _WHITESPACE)
+        self._pending = b""
+        if data.endswith(b"0"):
+            data, self._pending = data[:-1], b"0"
+        return data.replace(b"0x", b"") if b"0x" in data else data
+
+    def transform(self, block):
+        return self.unwrap(from_hex(block))
+
+    def flush(self):
+        self._carry += self._pending
+        self._pending = b""
+        if len(self._carry) % 2 != 0:
+            raise ValueError("Invalid Hex string: odd length.")
+        return super().flush()
+
+
+class CaesarStage(StreamStage):
+    def __init__(self, shift: int, decrypt: bool):
+        super().__init__()
+        self.shift = shift
+        self.decrypt = decrypt
+
+    @classmethod
+    def output_size(cls, input_size):
+        return input_size
+
+    def transform(self, block):
+        return self.unwrap(caesar_cipher_bytes(block, self.shift, decrypt=self.decrypt))
+
+
+class CaesarBruteForceStage(StreamStage):
+    """
+    Buffers up to BRUTE_FORCE_SAMPLE bytes to pick the shift, then decrypts
+    the stream with it; the same sample caesar_brute_force ranks on.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._sample = []
+        self._sampled = 0
+        self.shift = None
+
+    def _decide(self) -> bytes:
+        sample = b"".join(self._sample)
+        self._sample = []
+        ranking = rank_caesar_sample(sample)
+        if not ranking:
+            raise ValueError("Input contains no letters to analyse.")
+        self.shift = ranking[0][0]
+        return self.transform(sample)
+
+    def feed(self, chunk):
+        if self.shift is not None:
+            return self.transform(chunk)
+        self._sample.append(bytes(chunk))
+        self._sampled += len(chunk)
+        return self._decide() if self._sampled >= BRUTE_FORCE_SAMPLE else b""
+
+    def flush(self):
+        return self._decide() if self.shift is None else b""
+
+    def transform(self, block):
+        return self.unwrap(caesar_cipher_bytes(block, self.shift, decrypt=True))
+
+
+class BufferedStage(StreamStage):
+    """
+    Fallback for operations without a dedicated stage: collects the whole
+    input and applies the operation once at the end of the stream.
+    """
+    incremental = False
+
+    def __init__(self, function, **args):
+        super().__init__()
+        self._function = function
+        self._args = args
+        self._chunks = []
+
+    def feed(self, chunk):
+        self._chunks.append(bytes(chunk))
+        return b""
+
+    def flush(self):
+        data, self._chunks = b"".join(self._chunks), []
+        return self.unwrap(self._function(data, **self._args))
+
+
+def read_chunks(source, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Yields fixed-size chunks from a binary file object until EOF."""
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_stage(stage: StreamStage, chunks):
+    for chunk in chunks:
+        out = stage.feed(chunk)
+        if out:
+            yield out
+    tail = stage.flush()
+    if tail:
+        yield tail
+
+
+def stream_chunks(pipeline, chunks):
+    """
+    Chains the stages of a compiled recipe as a generator pipeline.
+
+    Only one chunk per stage is alive at any time, so memory use is bounded by
+    the chunk size times the recipe length, independently of the input size.
+
+    Raises:
+        StepFailed: If a step fails, with the failing step named in the message.
+    """
+    for step in pipeline.steps:
+        chunks = _guard(step, _run_stage(step.new_stage(), chunks))
+    return chunks
+
+
+def _guard(step, chunks):
+    try:
+        yield from chunks
+    except StepFailed:
+        raise
+    except ValueError as e:
+        raise StepFailed(f"Step '{step.name}' failed: {e}")
+
+
+def stream_file(pipeline, source, sink, chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[bool, int]:
+    """
+    Runs a compiled recipe from one binary file object straight into another.
+
+    Returns:
+        A tuple containing a boolean for success and either the number of
+        bytes written or an error message.
+    """
+    written = 0
+    try:
+        for chunk in stream_chunks(pipeline, read_chunks(source, chunk_size)):
+            sink.write(chunk)
+            written += len(chunk)
+    except StepFailed as e:
+        return False, str(e)
+    return True, written
+
+
+def stream_path(pipeline, input_path: str, output_path: str,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> tuple[bool, int]:
+    """Convenience wrapper around stream_file for file paths."""
+    try:
+        with open(input_path, "rb") as source, open(output_path, "wb") as sink:
+            return stream_file(pipeline, source, sink, chunk_size)
+    except OSError as e:
+        return False, f"File error: {e}"
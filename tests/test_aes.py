@@ -0,0 +1,108 @@
+# File: tests/test_aes.py
+
+import unittest
+
+from operations import aes
+
+# NIST SP 800-38A, F.5.1 (CTR-AES128.Encrypt) and F.5.5 (CTR-AES256.Encrypt).
+CTR_PLAINTEXT = bytes.fromhex("6bc1bee22e409f96e93d7e117393172a" "ae2d8a571e03ac9c9eb76fac45af8e51"
+                              "30c81c46a35ce411e5fbc1191a0a52ef" "f69f2445df4f9b17ad2b417be66c3710")
+CTR_COUNTER = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+CTR_VECTORS = (
+    ("2b7e151628aed2a6abf7158809cf4f3c",
+     "874d6191b620e3261bef6864990db6ce" "9806f66b7970fdff8617187bb9fffdff"
+     "5ae4df3edbd5d35e5b4f09020db03eab" "1e031dda2fbe03d1792170a0f3009cee"),
+    ("603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4",
+     "601ec313775789a5b7a7f504bbf3d228" "f443e3ca4d62b59aca84e990cacaf5c5"
+     "2b0930daa23de94ce87017ba2d84988d" "dfc9c58db67aada613c2dd08457941a6"),
+)
+
+# The GCM specification's test cases (McGrew & Viega), as used by NIST's GCM validation.
+_GCM_KEY = "feffe9928665731c6d6a8f9467308308"
+_GCM_IV = "cafebabefacedbaddecaf888"
+_GCM_PLAINTEXT = ("d9313225f88406e5a55909c5aff5269a86a7a9531534f7da2e4c303d8a318a72"
+                  "1c3c0c95956809532fcf0e2449a6b525b16aedf5aa0de657ba637b39")
+_GCM_AAD = "feedfacedeadbeeffeedfacedeadbeefabaddad2"
+# (key, iv, plaintext, aad, ciphertext, tag)
+GCM_VECTORS = (
+    ("00" * 16, "00" * 12, "", "", "", "58e2fccefa7e3061367f1d57a4e7455a"),  # Test Case 1
+    ("00" * 16, "00" * 12, "00" * 16, "", "0388dace60b6a392f328c2b971b2fe78",
+     "ab6e47d42cec13bdf53a67b21257bddf"),  # Test Case 2
+    (_GCM_KEY, _GCM_IV, _GCM_PLAINTEXT, _GCM_AAD,
+     "42831ec2217774244b7221b784d0d49ce3aa212f2c02a4e035c17e2329aca12e"
+     "21d514b25466931c7d8f6a5aac84aa051ba30b396a0aac973d58e091",
+     "5bc94fbc3221a5db94fae95ae7121a47"),  # Test Case 4
+    ("00" * 32, "00" * 12, "", "", "", "530f8afbc74536b9a963b4f1c4cb738b"),  # Test Case 13
+    ("00" * 32, "00" * 12, "00" * 16, "", "cea7403d4d606b6e074ec5d3baf39d18",
+     "d0d1c8a799996bf0265b98b5d48ab919"),  # Test Case 14
+    (_GCM_KEY * 2, _GCM_IV, _GCM_PLAINTEXT, _GCM_AAD,
+     "522dc1f099567d07f47f37a32a84427d643a8cdcbfe5c0c97598a2bd2555d1aa"
+     "8cb08e48590dbb3da7b08b1056828838c5f61e6393ba7a0abcc9f662",
+     "76fc6ece0f4e1768cddf8853bb2d551b"),  # Test Case 16
+)
+
+CHUNK_SIZES = (1, 5, 16, 17, 1024)
+
+
+def run_cipher(cipher, data: bytes, chunk_size: int) -> bytes:
+    return b"".join(cipher.update(data[i:i + chunk_size]) for i in range(0, len(data), chunk_size))
+
+
+class PurePythonAESTest(unittest.TestCase):
+    """Known-answer tests for the pure-Python fallback, fed whole and in uneven chunks."""
+
+    def test_ctr(self):
+        for key, ciphertext in CTR_VECTORS:
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(key=key, chunk_size=chunk_size):
+                    cipher = aes._PyCipher(bytes.fromhex(key), aes.MODES["CTR"], CTR_COUNTER, b"", decrypt=False)
+                    self.assertEqual(run_cipher(cipher, CTR_PLAINTEXT, chunk_size).hex(), ciphertext)
+                    self.assertEqual(cipher.finalize(), b"")
+
+    def test_gcm_encrypt(self):
+        for key, iv, plaintext, aad, ciphertext, tag in GCM_VECTORS:
+            for chunk_size in CHUNK_SIZES:
+                with self.subTest(key=key, plaintext=plaintext[:16], chunk_size=chunk_size):
+                    cipher = aes._PyCipher(bytes.fromhex(key), aes.MODES["GCM"], bytes.fromhex(iv),
+                                           bytes.fromhex(aad), decrypt=False)
+                    self.assertEqual(run_cipher(cipher, bytes.fromhex(plaintext), chunk_size).hex(), ciphertext)
+                    self.assertEqual(cipher.finalize().hex(), tag)
+
+    def test_gcm_decrypt(self):
+        for key, iv, plaintext, aad, ciphertext, tag in GCM_VECTORS:
+            with self.subTest(key=key, plaintext=plaintext[:16]):
+                cipher = aes._PyCipher(bytes.fromhex(key), aes.MODES["GCM"], bytes.fromhex(iv),
+                                       bytes.fromhex(aad), decrypt=True)
+                self.assertEqual(run_cipher(cipher, bytes.fromhex(ciphertext), 7).hex(), plaintext)
+                self.assertEqual(cipher.finalize(bytes.fromhex(tag)), b"")
+
+                cipher = aes._PyCipher(bytes.fromhex(key), aes.MODES["GCM"], bytes.fromhex(iv),
+                                       bytes.fromhex(aad), decrypt=True)
+                cipher.update(bytes.fromhex(ciphertext))
+                forged = bytes.fromhex(tag)[:-1] + bytes([bytes.fromhex(tag)[-1] ^ 1])
+                with self.assertRaises(ValueError):
+                    cipher.finalize(forged)
+
+
+class SaltTest(unittest.TestCase):
+    def setUp(self):
+        aes.clear_key_cache()
+
+    def salt(self, ciphertext: bytes) -> bytes:
+        return ciphertext[aes._PREFIX.size:aes._PREFIX.size + aes.SALT_SIZE]
+
+    def test_fresh_salt_by_default(self):
+        first, second = aes.aes_encrypt(b"data", "pw")[1], aes.aes_encrypt(b"data", "pw")[1]
+        self.assertNotEqual(self.salt(first), self.salt(second))
+        self.assertEqual(aes.aes_decrypt(second, "pw"), (True, b"data"))
+
+    def test_reuse_salt_is_opt_in(self):
+        first = aes.aes_encrypt(b"data", "pw", reuse_salt=True)[1]
+        second = aes.aes_encrypt(b"data", "pw", reuse_salt=True)[1]
+        self.assertEqual(self.salt(first), self.salt(second))
+        self.assertNotEqual(first, second)
+        self.assertEqual(aes.aes_decrypt(first, "pw"), (True, b"data"))
+
+
+if __name__ == "__main__":
+    unittest.main()
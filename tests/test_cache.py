@@ -0,0 +1,63 @@
+# File: tests/test_cache.py
+
+import unittest
+from unittest import mock
+
+from operations import cache
+from operations.cache import StepCache, input_digest
+from operations.engine import compile_recipe
+
+RECIPE = [{"operation": "To Hex"}, {"operation": "To Base64"}, {"operation": "Caesar Encrypt", "args": {"shift": "3"}}]
+
+
+class StepCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = StepCache()
+        self.pipeline = compile_recipe(RECIPE)
+
+    def run_counting(self, pipeline, data, step_index):
+        """Runs a prefix through the cache and returns (result, number of steps that actually ran)."""
+        with mock.patch.object(cache, "execute_step", wraps=cache.execute_step) as execute:
+            result = self.cache.run_prefix(pipeline, data, step_index)
+        return result, execute.call_count
+
+    def test_each_step_runs_once(self):
+        for index in range(len(self.pipeline)):
+            result, ran = self.run_counting(self.pipeline, b"input", index)
+            self.assertEqual(result, self.pipeline[:index + 1].run(b"input"))
+            self.assertEqual(ran, 1)
+        self.assertEqual(self.run_counting(self.pipeline, b"input", 2)[1], 0)
+
+    def test_editing_a_step_keeps_the_earlier_results(self):
+        self.run_counting(self.pipeline, b"input", 2)
+        edited = compile_recipe(RECIPE[:2] + [{"operation": "Caesar Encrypt", "args": {"shift": "4"}}])
+        result, ran = self.run_counting(edited, b"input", 2)
+        self.assertEqual(ran, 1)
+        self.assertEqual(result, edited.run(b"input"))
+
+    def test_other_input_misses(self):
+        self.run_counting(self.pipeline, b"input", 1)
+        self.assertEqual(self.run_counting(self.pipeline, b"other", 1)[1], 2)
+        self.assertNotEqual(input_digest(b"input"), input_digest(b"other"))
+        self.assertEqual(input_digest("text"), input_digest(b"text"))
+
+    def test_failures_are_not_cached(self):
+        pipeline = compile_recipe([{"operation": "From Hex"}])
+        self.assertFalse(self.cache.run_prefix(pipeline, b"zz", 0)[0])
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction_by_size(self):
+        small = StepCache(max_bytes=10)
+        small.put("a", b"12345")
+        small.put("b", b"12345")
+        small.get("a")
+        small.put("c", b"123")
+        self.assertIsNone(small.get("b"))
+        self.assertEqual((small.get("a"), small.get("c")), (b"12345", b"123"))
+        self.assertEqual(small.current_bytes, 8)
+        small.put("huge", b"x" * 11)
+        self.assertIsNone(small.get("huge"))
+
+
+if __name__ == "__main__":
+    unittest.main()
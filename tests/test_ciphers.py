@@ -0,0 +1,45 @@
+# File: tests/test_ciphers.py
+
+import unittest
+
+from operations.ciphers import (BRUTE_FORCE_SAMPLE, caesar_brute_force, caesar_cipher_bytes, describe_caesar_ranking,
+                                rank_caesar_sample)
+from operations.engine import compile_recipe
+from operations.stream import stream_chunks
+
+ENGLISH = b"The quick brown fox jumps over the lazy dog while the committee discusses the budget. "
+
+
+class CaesarTest(unittest.TestCase):
+    def test_round_trip(self):
+        for shift in range(1, 26):
+            encrypted = caesar_cipher_bytes(ENGLISH, shift)[1]
+            self.assertEqual(caesar_cipher_bytes(encrypted, shift, decrypt=True), (True, ENGLISH))
+
+    def test_brute_force(self):
+        ciphertext = caesar_cipher_bytes(ENGLISH * 20, 11)[1]
+        self.assertEqual(caesar_brute_force(ciphertext), (True, ENGLISH * 20))
+        self.assertEqual(rank_caesar_sample(ciphertext)[0][0], 11)
+        self.assertEqual(len(rank_caesar_sample(ciphertext)), 25)
+        self.assertFalse(caesar_brute_force(b"1234 !?")[0])
+
+    def test_whole_and_streamed_pick_the_same_shift(self):
+        # English in the sample window, then a long tail whose letters alone would favour another shift.
+        sample = caesar_cipher_bytes(ENGLISH * (BRUTE_FORCE_SAMPLE // len(ENGLISH) + 1), 5)[1][:BRUTE_FORCE_SAMPLE]
+        data = sample + b"zzzz qqqq " * (BRUTE_FORCE_SAMPLE // 4)
+        pipeline = compile_recipe([{"operation": "Caesar Brute Force"}])
+        success, whole = pipeline.run(data)
+        self.assertTrue(success)
+        self.assertEqual(whole[:len(ENGLISH)], ENGLISH)
+        chunks = (data[i:i + 300_000] for i in range(0, len(data), 300_000))
+        self.assertEqual(b"".join(stream_chunks(pipeline, chunks)), whole)
+
+    def test_describe_ranking(self):
+        text = describe_caesar_ranking(caesar_cipher_bytes(ENGLISH * 5, 3)[1])
+        self.assertTrue(text.startswith("shift 3 (χ² "), text)
+        self.assertEqual(text.count("χ²"), 3)
+        self.assertEqual(describe_caesar_ranking(b"123"), "no letters to analyse")
+
+
+if __name__ == "__main__":
+    unittest.main()
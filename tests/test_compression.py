@@ -0,0 +1,71 @@
+# File: tests/test_compression.py
+
+import gzip
+import unittest
+
+from operations.compression import DecompressStage, FORMATS, compress, decompress
+from operations.engine import compile_recipe
+
+MB = 1024 * 1024
+
+
+class CompressionTest(unittest.TestCase):
+    def test_round_trip(self):
+        data = bytes(range(256)) * 5000
+        for format in FORMATS:
+            with self.subTest(format=format):
+                success, compressed = compress(data, format)
+                self.assertTrue(success)
+                self.assertEqual(decompress(compressed, format), (True, data))
+
+    def test_parallel_gzip_is_a_standard_stream(self):
+        data = bytes(range(256)) * 20000
+        success, compressed = compress(data, "gzip", threads=4)
+        self.assertTrue(success)
+        self.assertEqual(gzip.decompress(compressed), data)
+        self.assertEqual(compressed, compress(data, "gzip", threads=2)[1])
+
+    def test_concatenated_members(self):
+        for format in FORMATS:
+            with self.subTest(format=format):
+                first, second = compress(b"first ", format)[1], compress(b"second", format)[1]
+                self.assertEqual(decompress(first + second, format), (True, b"first second"))
+
+    def test_truncated_and_invalid_input(self):
+        compressed = compress(b"data" * 1000, "gzip")[1]
+        self.assertFalse(decompress(compressed[:-10], "gzip")[0])
+        self.assertFalse(decompress(b"not compressed", "zlib")[0])
+
+
+class OutputLimitTest(unittest.TestCase):
+    def test_limit(self):
+        data = b"\0" * MB
+        for format in FORMATS:
+            with self.subTest(format=format):
+                compressed = compress(data, format)[1]
+                self.assertEqual(decompress(compressed, format, max_mb=1), (True, data))
+                success, error = decompress(compressed + compressed, format, max_mb=1)
+                self.assertFalse(success)
+                self.assertIn("exceeds the 1 MB limit", error)
+
+    def test_bomb_stops_at_the_limit(self):
+        bomb = gzip.compress(b"\0" * (256 * MB), compresslevel=9)
+        stage = DecompressStage("gzip", max_mb=2)
+        produced = 0
+        with self.assertRaises(ValueError):
+            for offset in range(0, len(bomb), 64 * 1024):
+                produced += len(stage.feed(bomb[offset:offset + 64 * 1024]))
+        self.assertLessEqual(produced, 2 * MB)
+
+    def test_limit_is_a_recipe_argument(self):
+        compressed = compress(b"\0" * (2 * MB), "zlib")[1]
+        self.assertFalse(compile_recipe([{"operation": "Zlib Decompress", "args": {"max_mb": "1"}}]).run(compressed)[0])
+        self.assertTrue(compile_recipe([{"operation": "Zlib Decompress"}]).run(compressed)[0])
+
+    def test_inverse_pair_still_cancels(self):
+        pipeline = compile_recipe([{"operation": "Gzip Compress"}, {"operation": "Gzip Decompress"}], optimize=True)
+        self.assertEqual(len(pipeline), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# File: tests/test_detect.py
+
+import base64
+import unittest
+
+from operations.ciphers import caesar_cipher_bytes
+from operations.detect import detect, profile, text_score
+
+PLAINTEXT = (b"It was the best of times, it was the worst of times, it was the age of wisdom, "
+             b"it was the age of foolishness, it was the epoch of belief.")
+
+
+class ProfileTest(unittest.TestCase):
+    def test_byte_classes(self):
+        self.assertTrue(profile(base64.b64encode(PLAINTEXT)).looks_base64)
+        self.assertTrue(profile(PLAINTEXT.hex().encode()).looks_hex)
+        self.assertFalse(profile(PLAINTEXT).looks_base64)
+        self.assertFalse(profile(b"abc").looks_hex)
+        self.assertFalse(profile(b"").looks_base64)
+
+    def test_text_scores_higher_than_encodings(self):
+        self.assertGreater(text_score(PLAINTEXT), text_score(base64.b64encode(PLAINTEXT)))
+        self.assertGreater(text_score(PLAINTEXT), text_score(caesar_cipher_bytes(PLAINTEXT, 7)[1]))
+        self.assertEqual(text_score(b""), 0.0)
+
+
+class DetectTest(unittest.TestCase):
+    # A generous budget, so a slow or busy machine still finishes the search.
+    BUDGET = 2.0
+
+    def assert_best(self, data, expected):
+        candidates = detect(data, time_budget=self.BUDGET)
+        self.assertTrue(candidates)
+        self.assertEqual(candidates[0].describe(), expected)
+        self.assertTrue(candidates[0].preview.startswith(PLAINTEXT[:40].decode()))
+
+    def test_single_decodings(self):
+        self.assert_best(base64.b64encode(PLAINTEXT), "From Base64")
+        self.assert_best(PLAINTEXT.hex(), "From Hex")
+        self.assert_best(caesar_cipher_bytes(PLAINTEXT, 5)[1], "Caesar Decrypt(5)")
+
+    def test_stacked_decodings(self):
+        data = base64.b64encode(caesar_cipher_bytes(PLAINTEXT, 11)[1].hex().encode())
+        self.assert_best(data, "From Base64 → From Hex → Caesar Decrypt(11)")
+
+    def test_candidates_are_ranked_and_limited(self):
+        candidates = detect(base64.b64encode(PLAINTEXT), time_budget=self.BUDGET, max_results=2)
+        self.assertLessEqual(len(candidates), 2)
+        self.assertEqual(candidates, sorted(candidates, key=lambda candidate: -candidate.score))
+
+    def test_plain_text_has_no_candidates(self):
+        self.assertEqual(detect(PLAINTEXT, time_budget=self.BUDGET), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# File: tests/test_fanout.py
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from operations.engine import compile_recipe
+from operations.fanout import build_trie, fanout, parse_values, vary, vary_all
+
+DATA = b"Attack at dawn! " * 64
+BRUTE_FORCE = vary([[{"operation": "To Base64"}, {"operation": "From Base64"}, {"operation": "To Hex"},
+                     {"operation": "Caesar Encrypt", "args": {"shift": "1"}}]], "shift", parse_values("1-25"))
+
+
+class VaryTest(unittest.TestCase):
+    def test_parse_values(self):
+        self.assertEqual(parse_values("1-3, 7"), ["1", "2", "3", "7"])
+        self.assertEqual(parse_values("GCM,CTR"), ["GCM", "CTR"])
+        self.assertEqual(parse_values(""), [])
+
+    def test_vary(self):
+        self.assertEqual(len(BRUTE_FORCE), 25)
+        self.assertEqual(BRUTE_FORCE[4][3]["args"], {"shift": "5"})
+        # Recipes without the parameter are kept as they are.
+        self.assertEqual(vary([[{"operation": "To Hex"}]], "shift", ["1", "2"]), [[{"operation": "To Hex"}]])
+
+    def test_vary_all_is_a_cartesian_product(self):
+        recipes = vary_all([[{"operation": "Caesar Encrypt"}, {"operation": "Zlib Compress"}]],
+                           {"shift": ["1", "2", "3"], "level": ["1", "9"]})
+        self.assertEqual(len(recipes), 6)
+        self.assertEqual({(r[0]["args"]["shift"], r[1]["args"]["level"]) for r in recipes},
+                         {(s, l) for s in "123" for l in "19"})
+
+
+class FanoutTest(unittest.TestCase):
+    def assert_same_as_one_by_one(self, results, recipes):
+        self.assertEqual([result.index for result in results], list(range(len(recipes))))
+        for result, recipe_data in zip(results, recipes):
+            self.assertEqual((result.success, result.output), compile_recipe(recipe_data).run(DATA))
+
+    def test_shared_prefix_runs_once(self):
+        pipelines = [(index, compile_recipe(recipe)) for index, recipe in enumerate(BRUTE_FORCE)]
+        self.assertEqual(build_trie(pipelines).count_steps(), 3 + 25)
+
+        results, stats = fanout(BRUTE_FORCE, DATA, optimize=False, keep_outputs=True)
+        self.assert_same_as_one_by_one(results, BRUTE_FORCE)
+        self.assertEqual(stats.steps_total, 4 * 25)
+        self.assertEqual(stats.steps_run, 3 + 25)
+        self.assertEqual(stats.steps_saved, 4 * 25 - 28)
+
+    def test_optimized_recipes(self):
+        results, stats = fanout(BRUTE_FORCE, DATA, keep_outputs=True)
+        self.assert_same_as_one_by_one(results, BRUTE_FORCE)
+        # To Base64 → From Base64 cancels out.
+        self.assertEqual(stats.steps_run, 1 + 25)
+        self.assertEqual(results[0].description, "To Base64 → From Base64 → To Hex → Caesar Encrypt(1)")
+
+    def test_parallel_subtrees(self):
+        with ThreadPoolExecutor(4) as executor:
+            results, stats = fanout(BRUTE_FORCE, DATA, workers=4, keep_outputs=True, executor=executor)
+        self.assert_same_as_one_by_one(results, BRUTE_FORCE)
+        self.assertEqual(stats.workers, 4)
+
+    def test_previews_and_errors(self):
+        recipes = [[{"operation": "To Hex"}], [{"operation": "From Hex"}], [{"operation": "Nope"}]]
+        results, _ = fanout(recipes, DATA, preview_length=8)
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[0].output_size, len(DATA) * 2)
+        self.assertEqual(results[0].preview(8), DATA.hex()[:8] + "…")
+        self.assertFalse(results[1].success)
+        self.assertIn("From Hex", results[1].error)
+        self.assertFalse(results[2].success)
+        self.assertEqual(results[2].description, "Nope")
+        self.assertIn("Unknown operation", results[2].preview())
+
+
+if __name__ == "__main__":
+    unittest.main()
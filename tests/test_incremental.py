@@ -0,0 +1,64 @@
+# File: tests/test_incremental.py
+
+import unittest
+
+from operations.engine import compile_recipe
+from operations.incremental import IncrementalBaker, common_prefix, common_suffix
+
+TEXT = (b"The quick brown fox jumps over the lazy dog. " * 4000)
+
+
+class CommonRangeTest(unittest.TestCase):
+    def test_prefix_and_suffix(self):
+        a = TEXT
+        b = TEXT[:70000] + b"X" + TEXT[70001:]
+        self.assertEqual(common_prefix(a, b), 70000)
+        self.assertEqual(common_suffix(a, b, len(a) - 70000), len(a) - 70001)
+        self.assertEqual(common_prefix(a, a), len(a))
+        self.assertEqual(common_suffix(a, a, 10), 10)
+
+
+class IncrementalBakerTest(unittest.TestCase):
+    def assert_matches_full_bake(self, baker, data):
+        success, output = baker.bake(data)
+        self.assertTrue(success, output)
+        self.assertEqual(bytes(output), baker.pipeline.run(data)[1])
+
+    def test_edit_in_place_rebakes_one_block(self):
+        baker = IncrementalBaker(compile_recipe([{"operation": "To Base64"}]))
+        self.assertTrue(baker.block_local)
+        self.assert_matches_full_bake(baker, TEXT)
+        self.assertFalse(baker.last_update.incremental)
+
+        edited = TEXT[:1000] + b"Z" + TEXT[1001:]
+        self.assert_matches_full_bake(baker, edited)
+        self.assertTrue(baker.last_update.incremental)
+        self.assertEqual(baker.last_update.rebaked, 3)
+
+    def test_length_changes(self):
+        baker = IncrementalBaker(compile_recipe([{"operation": "To Hex"}, {"operation": "To Base64"}]))
+        data = TEXT
+        self.assert_matches_full_bake(baker, data)
+        for edit in (lambda d: d[:500] + b"inserted" + d[500:], lambda d: d[:-7], lambda d: d + b"!",
+                     lambda d: b"start " + d, lambda d: d[:100] + d[103:]):
+            data = edit(data)
+            self.assert_matches_full_bake(baker, data)
+            self.assertTrue(baker.last_update.incremental)
+
+    def test_non_block_local_recipe_falls_back_to_a_full_bake(self):
+        baker = IncrementalBaker(compile_recipe([{"operation": "To Base64"}, {"operation": "From Base64"}]))
+        self.assertFalse(baker.block_local)
+        self.assert_matches_full_bake(baker, TEXT)
+        self.assert_matches_full_bake(baker, TEXT + b"more")
+        self.assertFalse(baker.last_update.incremental)
+
+    def test_failure_resets_the_baker(self):
+        baker = IncrementalBaker(compile_recipe([{"operation": "From Hex"}]))
+        self.assertTrue(baker.bake(b"00ff")[0])
+        self.assertFalse(baker.bake(b"00fz")[0])
+        self.assert_matches_full_bake(baker, b"0011")
+        self.assertFalse(baker.last_update.incremental)
+
+
+if __name__ == "__main__":
+    unittest.main()
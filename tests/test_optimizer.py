@@ -0,0 +1,75 @@
+# File: tests/test_optimizer.py
+
+import unittest
+
+from operations.engine import compile_recipe
+from operations.optimizer import optimize
+
+SAMPLE = b"Attack at dawn! 0123456789 \x00\xff"
+
+
+def step(operation: str, **args) -> dict:
+    return {"operation": operation, "args": {name: str(value) for name, value in args.items()}}
+
+
+class OptimizerTest(unittest.TestCase):
+    def assert_plan(self, recipe: list, expected: list):
+        """The optimized recipe has the expected (operation, args) steps and the same output as written."""
+        pipeline = compile_recipe(recipe)
+        plan = optimize(pipeline)
+        self.assertEqual([(s.name, s.args) for s in plan.optimized.steps], expected)
+        self.assertEqual(plan.passes_saved, len(recipe) - len(expected))
+        self.assertEqual(plan.optimized.run(SAMPLE), pipeline.run(SAMPLE))
+        return plan
+
+    def test_inverse_pairs_cancel(self):
+        self.assert_plan([step("To Hex"), step("From Hex")], [])
+        self.assert_plan([step("To Base64"), step("To Hex"), step("From Hex"), step("From Base64")], [])
+        self.assert_plan([step("Zlib Compress", level=9), step("Zlib Decompress"), step("To Hex")],
+                         [("To Hex", {})])
+
+    def test_aes_pair_needs_the_same_key(self):
+        self.assert_plan([step("AES Encrypt", key="k"), step("AES Decrypt", key="k")], [])
+        pipeline = compile_recipe([step("AES Encrypt", key="k"), step("AES Decrypt", key="other")])
+        self.assertEqual(len(optimize(pipeline).optimized), 2)
+
+    def test_decoder_then_encoder_is_kept(self):
+        # From Base64 → To Base64 normalises whitespace and padding: not an identity.
+        pipeline = compile_recipe([step("From Base64"), step("To Base64")])
+        self.assertEqual(len(optimize(pipeline).optimized), 2)
+
+    def test_caesar_shifts_fuse(self):
+        self.assert_plan([step("Caesar Encrypt", shift=3), step("Caesar Encrypt", shift=5)],
+                         [("Caesar Encrypt", {"shift": 8})])
+        # The fused step keeps the direction of the first one.
+        self.assert_plan([step("Caesar Encrypt", shift=3), step("Caesar Decrypt", shift=5)],
+                         [("Caesar Encrypt", {"shift": 24})])
+        self.assert_plan([step("Caesar Decrypt", shift=3), step("Caesar Decrypt", shift=5)],
+                         [("Caesar Decrypt", {"shift": 8})])
+        self.assert_plan([step("Caesar Encrypt", shift=20), step("Caesar Encrypt", shift=10)],
+                         [("Caesar Encrypt", {"shift": 4})])
+
+    def test_caesar_shifts_that_cancel_are_dropped(self):
+        self.assert_plan([step("Caesar Encrypt", shift=7), step("Caesar Decrypt", shift=7)], [])
+        self.assert_plan([step("Caesar Encrypt", shift=13), step("Caesar Encrypt", shift=13), step("To Hex")],
+                         [("To Hex", {})])
+
+    def test_origins_point_at_the_written_steps(self):
+        recipe = [step("To Hex"), step("Caesar Encrypt", shift=1), step("Caesar Encrypt", shift=2), step("To Base64")]
+        plan = self.assert_plan(recipe, [("To Hex", {}), ("Caesar Encrypt", {"shift": 3}), ("To Base64", {})])
+        self.assertEqual(plan.optimized.origins, ((0,), (1, 2), (3,)))
+
+    def test_explain(self):
+        plan = optimize(compile_recipe([step("AES Encrypt", key="secret"), step("AES Decrypt", key="secret")]))
+        text = plan.explain()
+        self.assertIn("Estimated passes saved: 2", text)
+        self.assertIn("inverse pair", text)
+        self.assertNotIn("secret", text)
+        self.assertIn("No optimization applies.", optimize(compile_recipe([step("To Hex")])).explain())
+
+    def test_compile_recipe_optimize_flag(self):
+        self.assertEqual(len(compile_recipe([step("To Hex"), step("From Hex")], optimize=True)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
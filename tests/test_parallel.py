@@ -0,0 +1,74 @@
+# File: tests/test_parallel.py
+
+import os
+import unittest
+from unittest import mock
+
+from operations import aes
+from operations.engine import compile_recipe
+from operations.parallel import plan_segments, pipeline_output_size, run_parallel, segment_alignment
+
+
+def recipe(*operations, **args) -> list:
+    return [{"operation": operation, "args": {"shift": "3", "key": "k", **args}} for operation in operations]
+
+
+class SegmentAlignmentTest(unittest.TestCase):
+    def test_alignment(self):
+        cases = {
+            ("To Hex",): 1,
+            ("To Base64",): 3,
+            ("To Hex", "To Base64"): 3,
+            ("Caesar Encrypt", "To Base64", "To Base64"): 9,
+            ("To Base64", "To Hex", "Caesar Decrypt"): 3,
+        }
+        for operations, alignment in cases.items():
+            with self.subTest(operations=operations):
+                self.assertEqual(segment_alignment(compile_recipe(recipe(*operations))), alignment)
+
+    def test_steps_without_a_known_size_cannot_be_split(self):
+        for operations in (("From Base64",), ("To Hex", "From Hex"), ("AES Encrypt",), ("Gzip Compress",)):
+            with self.subTest(operations=operations):
+                self.assertIsNone(segment_alignment(compile_recipe(recipe(*operations))))
+
+    def test_planning_builds_no_stage(self):
+        pipeline = compile_recipe(recipe("AES Encrypt", "To Hex"))
+        with mock.patch.object(aes, "derive_key", side_effect=AssertionError("stage built")):
+            self.assertIsNone(segment_alignment(pipeline))
+
+    def test_output_size(self):
+        pipeline = compile_recipe(recipe("To Hex", "To Base64"))
+        for size in (0, 1, 2, 3, 100, 4097):
+            with self.subTest(size=size):
+                self.assertEqual(pipeline_output_size(pipeline, size), len(pipeline.run(b"x" * size)[1]))
+
+
+class PlanSegmentsTest(unittest.TestCase):
+    def test_segments_are_aligned_and_contiguous(self):
+        pipeline = compile_recipe(recipe("Caesar Encrypt", "To Base64", "To Base64"))
+        segments = plan_segments(pipeline, 1000, workers=4, min_segment=100)
+        self.assertEqual(len(segments), 4)
+        self.assertEqual((segments[0][0], segments[-1][1]), (0, 1000))
+        out_start = 0
+        for in_start, in_end, segment_out_start, out_end in segments:
+            self.assertEqual(in_start % 9, 0)
+            self.assertEqual(segment_out_start, out_start)
+            self.assertEqual(out_end - out_start, pipeline_output_size(pipeline, in_end - in_start))
+            out_start = out_end
+        self.assertEqual(out_start, pipeline_output_size(pipeline, 1000))
+
+    def test_unsplittable_recipe(self):
+        self.assertIsNone(plan_segments(compile_recipe(recipe("From Hex")), 1000, workers=4, min_segment=1))
+
+
+class RunParallelTest(unittest.TestCase):
+    def test_matches_a_serial_run(self):
+        data = os.urandom(100_003)
+        for operations in (("To Hex", "To Base64"), ("Caesar Encrypt", "To Base64", "To Base64")):
+            with self.subTest(operations=operations):
+                pipeline = compile_recipe(recipe(*operations))
+                self.assertEqual(run_parallel(pipeline, data, workers=3, min_segment=10_000), pipeline.run(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# File: tests/test_progress.py
+
+import unittest
+from unittest import mock
+
+from operations.engine import compile_recipe
+from operations.progress import BakeCancelled, CancelToken, ProgressThrottle, PROGRESS_CHUNK_SIZE, format_eta
+
+
+class ProgressThrottleTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.now = 100.0
+        patcher = mock.patch("operations.progress.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.throttle = ProgressThrottle(self.calls.append, max_rate=10)
+
+    def test_finished_steps_are_coalesced(self):
+        # 1000 tiny steps finishing within one interval: one call for the first report, one at the flush.
+        for index in range(1000):
+            self.throttle(index, "To Hex", 0, 10)
+            self.throttle(index, "To Hex", 10, 10)
+        self.throttle.flush()
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(len(self.calls[1]), 1000)
+        self.assertTrue(all(progress.finished for progress in self.calls[1]))
+
+    def test_latest_report_per_step_is_sent_on_the_next_tick(self):
+        self.throttle(0, "To Hex", 0, 100)
+        self.throttle(0, "To Hex", 50, 100)
+        self.throttle(0, "To Hex", 100, 100)
+        self.throttle(1, "To Base64", 10, 100)
+        self.assertEqual(len(self.calls), 1)
+        self.now += 0.2
+        self.throttle(1, "To Base64", 20, 100)
+        self.assertEqual([(progress.step_index, progress.done) for progress in self.calls[1]], [(0, 100), (1, 20)])
+
+    def test_flush_without_pending_reports_does_nothing(self):
+        self.throttle(0, "To Hex", 10, 10)
+        self.throttle.flush()
+        self.assertEqual(len(self.calls), 1)
+
+    def test_rate_is_bounded(self):
+        for chunk in range(300):
+            self.now += 0.01
+            self.throttle(0, "To Hex", chunk, 300)
+        self.assertLessEqual(len(self.calls), 31)
+
+
+class EngineProgressTest(unittest.TestCase):
+    def test_every_step_reaches_its_total(self):
+        reports = []
+        pipeline = compile_recipe([{"operation": "To Hex"}, {"operation": "To Base64"}])
+        pipeline.run(b"x" * (2 * PROGRESS_CHUNK_SIZE + 1), progress=lambda *report: reports.append(report))
+        finished = [(index, done) for index, _, done, total in reports if done == total]
+        self.assertEqual([index for index, _ in finished], [0, 1])
+
+    def test_cancel(self):
+        token = CancelToken()
+        token.cancel()
+        with self.assertRaises(BakeCancelled):
+            compile_recipe([{"operation": "To Hex"}]).run(b"data", cancel=token)
+
+
+class FormatEtaTest(unittest.TestCase):
+    def test_format(self):
+        self.assertEqual([format_eta(value) for value in (None, 0.2, 42, 185)], ["", "<1s", "42s", "3m05s"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# File: tests/test_registry.py
+
+import unittest
+from unittest import mock
+
+from operations import engine
+from operations.engine import compile_recipe
+from operations.registry import (Operation, Param, Registry, RecipeError, registry, parse_flag, parse_hash_algorithms,
+                                 parse_max_output, parse_shift)
+
+
+def reverse(data):
+    return True, bytes(data)[::-1]
+
+
+REVERSE = Operation("Reverse", "Plugins", function=reverse)
+
+
+def entry_point(name, load):
+    point = mock.Mock()
+    point.name = name
+    point.load = load
+    return point
+
+
+class ParseTest(unittest.TestCase):
+    def test_valid_values(self):
+        self.assertEqual(parse_shift("7"), 7)
+        self.assertEqual(parse_hash_algorithms("MD5, SHA-256, sha3-256, md5"), "md5,sha256,sha3_256")
+        self.assertIs(parse_flag("Yes"), True)
+        self.assertIs(parse_flag(""), False)
+        self.assertEqual(parse_max_output("1"), 1)
+
+    def test_invalid_values(self):
+        for parse, value in ((parse_shift, "0"), (parse_shift, "x"), (parse_hash_algorithms, "crc32"),
+                             (parse_hash_algorithms, " , "), (parse_flag, "maybe"), (parse_max_output, "0"),
+                             (parse_max_output, str(16 * 1024 + 1))):
+            with self.subTest(parse=parse.__name__, value=value):
+                with self.assertRaises(RecipeError):
+                    parse(value)
+
+
+class RegistryTest(unittest.TestCase):
+    def test_builtins(self):
+        self.assertIn("To Base64", registry)
+        self.assertEqual(registry.inverse("To Base64"), "From Base64")
+        self.assertIsNone(registry.get("No Such Operation"))
+        self.assertIsNone(registry.inverse("No Such Operation"))
+        self.assertNotIn("From Base64", registry.names("encrypt"))
+        self.assertIn("From Base64", registry.names("decrypt"))
+
+    def test_parse_args_uses_defaults(self):
+        operation = Operation("Test", "Tests", params=(Param("shift", "Shift", parse=parse_shift, default="3"),))
+        self.assertEqual(operation.parse_args({}), {"shift": 3})
+        self.assertEqual(operation.parse_args({"shift": "4"}), {"shift": 4})
+
+    def test_unknown_operation_is_a_recipe_error(self):
+        with self.assertRaisesRegex(RecipeError, "Unknown operation: Nope"):
+            compile_recipe([{"operation": "Nope"}])
+        with self.assertRaisesRegex(RecipeError, "Step 'Caesar Encrypt'"):
+            compile_recipe([{"operation": "Caesar Encrypt", "args": {"shift": "99"}}])
+        for bad in ({"operation": "To Hex"}, [{"args": {}}], ["To Hex"]):
+            with self.assertRaises(RecipeError):
+                compile_recipe(bad)
+
+
+class PluginTest(unittest.TestCase):
+    def discover(self, *points):
+        plugins = Registry()
+        plugins.register(Operation("To Hex", "Encoders / Decoders", function=reverse))
+        with mock.patch("importlib.metadata.entry_points", return_value=list(points)) as entry_points:
+            plugins.plugin_names()
+        entry_points.assert_called_once()
+        return plugins
+
+    def test_plugins_load_on_first_use(self):
+        load = mock.Mock(return_value=REVERSE)
+        plugins = self.discover(entry_point("Reverse", load))
+        self.assertIn("Reverse", plugins)
+        self.assertEqual(plugins.plugin_names(), ["Reverse"])
+        load.assert_not_called()
+
+        self.assertIs(plugins.get("Reverse"), REVERSE)
+        self.assertIs(plugins.get("Reverse"), REVERSE)
+        load.assert_called_once()
+        self.assertEqual(plugins.plugin_names(), [])
+
+    def test_factories_are_called(self):
+        plugins = self.discover(entry_point("Reverse", mock.Mock(return_value=lambda: REVERSE)))
+        self.assertIs(plugins.get("Reverse"), REVERSE)
+
+    def test_builtins_win_over_plugins(self):
+        load = mock.Mock(return_value=REVERSE)
+        plugins = self.discover(entry_point("To Hex", load))
+        self.assertEqual(plugins.plugin_names(), [])
+        self.assertEqual(plugins.get("To Hex").category, "Encoders / Decoders")
+        load.assert_not_called()
+
+    def test_broken_plugin_is_a_recipe_error(self):
+        plugins = self.discover(entry_point("Broken", mock.Mock(side_effect=ImportError("no module named x"))))
+        with self.assertRaisesRegex(RecipeError, "Failed to load plugin operation 'Broken'"):
+            plugins.get("Broken")
+
+    def test_broken_installation_is_ignored(self):
+        plugins = Registry()
+        with mock.patch("importlib.metadata.entry_points", side_effect=RuntimeError("bad metadata")):
+            self.assertEqual(plugins.plugin_names(), [])
+
+    def test_plugin_steps_compile_and_run(self):
+        plugins = self.discover(entry_point("Reverse", mock.Mock(return_value=REVERSE)))
+        with mock.patch.object(engine, "registry", plugins):
+            pipeline = compile_recipe([{"operation": "Reverse"}, {"operation": "To Hex"}])
+        self.assertEqual(pipeline.run(b"abc"), (True, b"abc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
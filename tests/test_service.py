@@ -0,0 +1,145 @@
+# File: tests/test_service.py
+
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from cryptosuite import service
+from cryptosuite.service import (BakeService, HTTPError, MicroBatcher, RecipeCache, bake_batch, content_length,
+                                 iter_body, read_head, recipe_id, _chunk_size)
+from operations.engine import compile_recipe, RecipeError
+
+RECIPE = [{"operation": "To Hex"}, {"operation": "To Base64"}]
+
+
+class ParsingTest(unittest.TestCase):
+    def test_content_length(self):
+        self.assertEqual(content_length({}), 0)
+        self.assertEqual(content_length({"content-length": "42"}), 42)
+        for value in ("-1", "4 2", "0x10", "1e3"):
+            with self.subTest(value=value):
+                with self.assertRaises(HTTPError) as raised:
+                    content_length({"content-length": value})
+                self.assertEqual(raised.exception.status, 400)
+
+    def test_chunk_size(self):
+        self.assertEqual(_chunk_size(b"1a2b\r\n"), 0x1a2b)
+        self.assertEqual(_chunk_size(b"10;name=value\r\n"), 16)
+        for line in (b"\r\n", b"xyz\r\n", b"-1\r\n", b"1 2\r\n"):
+            with self.subTest(line=line):
+                with self.assertRaises(HTTPError):
+                    _chunk_size(line)
+
+
+class RecipeCacheTest(unittest.TestCase):
+    def test_ids_ignore_formatting(self):
+        self.assertEqual(recipe_id(json.loads('[{"operation":"To Hex","args":{}}]')),
+                         recipe_id([{"args": {}, "operation": "To Hex"}]))
+        self.assertNotEqual(recipe_id(RECIPE), recipe_id(RECIPE[::-1]))
+
+    def test_lru(self):
+        cache = RecipeCache(max_size=2)
+        first = cache.add(RECIPE)
+        second = cache.add(RECIPE[:1])
+        self.assertEqual(cache.add(RECIPE), first)
+        cache.add(RECIPE[1:])
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(second))
+        self.assertEqual(cache.get(first)[0], RECIPE)
+        with self.assertRaises(RecipeError):
+            cache.add([{"operation": "Nope"}])
+
+    def test_bake_batch_isolates_failures(self):
+        results = bake_batch([(recipe_id(RECIPE), RECIPE, b"hi"), ("bad", [{"operation": "From Hex"}], b"zz"),
+                              (recipe_id(RECIPE), RECIPE, b"")])
+        self.assertEqual([result[:2] for result in results[::2]], [(True, b"Njg2OQ=="), (True, b"")])
+        self.assertFalse(results[1][0])
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+    """Runs the HTTP front end on a loopback port, with a thread pool standing in for the worker processes."""
+
+    async def asyncSetUp(self):
+        self.service = BakeService(workers=2, stream_threshold=1024)
+        self.service.executor.shutdown()
+        self.service.executor = ThreadPoolExecutor(2)
+        self.service.batcher = MicroBatcher(self.service.executor, 2)
+        self.server = await asyncio.start_server(self.service.handle, "127.0.0.1", 0, limit=service.MAX_HEADER_SIZE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.close()
+
+    async def request(self, method, path, body=b"", headers=None):
+        """Sends one request on a new connection; returns (status, headers, body)."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        lines = [f"{method} {path} HTTP/1.1", "Connection: close", f"Content-Length: {len(body)}"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        status_line, response_headers = await read_head(reader)
+        response = b"".join([chunk async for chunk in iter_body(reader, response_headers)])
+        writer.close()
+        await writer.wait_closed()
+        return int(status_line.split()[1]), response_headers, response
+
+    async def test_register_and_bake(self):
+        status, _, body = await self.request("POST", "/recipes", json.dumps(RECIPE).encode())
+        self.assertEqual(status, 201)
+        created = json.loads(body)
+        self.assertEqual(created, {"id": recipe_id(RECIPE), "steps": 2})
+
+        status, headers, body = await self.request("POST", f"/bake/{created['id']}", b"hi")
+        self.assertEqual((status, body), (200, b"Njg2OQ=="))
+        self.assertEqual(headers["x-recipe-id"], created["id"])
+
+    async def test_inline_recipe(self):
+        status, headers, body = await self.request("POST", "/bake", b"hi", {"X-Recipe": json.dumps(RECIPE)})
+        self.assertEqual((status, body), (200, b"Njg2OQ=="))
+        self.assertEqual(headers["x-recipe-id"], recipe_id(RECIPE))
+
+    async def test_large_bodies_are_streamed(self):
+        payload = bytes(range(256)) * 64
+        status, headers, body = await self.request("POST", "/bake", payload, {"X-Recipe": json.dumps(RECIPE)})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["transfer-encoding"], "chunked")
+        self.assertEqual(body, compile_recipe(RECIPE).run(payload)[1])
+        self.assertEqual(self.service.stats["streamed"], 1)
+
+    async def test_errors(self):
+        for method, path, body, headers, expected in (
+                ("GET", "/nowhere", b"", None, 404),
+                ("GET", "/recipes", b"", None, 405),
+                ("POST", "/recipes", b"not json", None, 400),
+                ("POST", "/recipes", b'[{"operation": "Nope"}]', None, 400),
+                ("POST", "/bake", b"data", None, 400),
+                ("POST", "/bake/unknown", b"data", None, 404),
+                ("POST", "/bake", b"zz", {"X-Recipe": '[{"operation": "From Hex"}]'}, 422)):
+            with self.subTest(method=method, path=path, body=body):
+                status, _, _ = await self.request(method, path, body, headers)
+                self.assertEqual(status, expected)
+        self.assertEqual(self.service.stats["failed_bakes"], 1)
+
+    async def test_concurrent_small_bakes(self):
+        await self.request("POST", "/recipes", json.dumps(RECIPE).encode())
+        path = f"/bake/{recipe_id(RECIPE)}"
+        responses = await asyncio.gather(*(self.request("POST", path, b"%d" % i) for i in range(20)))
+        for i, (status, _, body) in enumerate(responses):
+            self.assertEqual((status, body), (200, compile_recipe(RECIPE).run(b"%d" % i)[1]))
+        status, _, body = await self.request("GET", "/stats")
+        self.assertEqual(json.loads(body)["batched_requests"], 20)
+
+
+class MicroBatcherTest(unittest.IsolatedAsyncioTestCase):
+    async def test_one_tick_is_one_batch(self):
+        with ThreadPoolExecutor(1) as executor:
+            batcher = MicroBatcher(executor, workers=1, max_jobs=8)
+            jobs = [(recipe_id(RECIPE), RECIPE, b"%d" % i) for i in range(20)]
+            results = await asyncio.gather(*(batcher.submit(job) for job in jobs))
+        self.assertEqual([result[1] for result in results], [compile_recipe(RECIPE).run(job[2])[1] for job in jobs])
+        self.assertEqual((batcher.batches, batcher.batched_jobs, batcher.in_flight), (3, 20, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# File: tests/test_sources.py
+
+import os
+import tempfile
+import unittest
+
+from operations.cache import StepCache
+from operations.engine import compile_recipe
+from operations.progress import BakeCancelled, CancelToken, PROGRESS_CHUNK_SIZE
+from operations.profiling import run_profiled
+from operations.sources import FileSource, open_input
+
+
+class FileSourceBakeTest(unittest.TestCase):
+    """Bakes read straight from a memory map, which must close cleanly however the bake ends."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        with os.fdopen(handle, "wb") as f:
+            f.write(os.urandom(4 * PROGRESS_CHUNK_SIZE + 123))
+        self.addCleanup(os.remove, self.path)
+
+    def cancel_midway(self, run):
+        """Runs `run(data, progress, cancel)` on the mapped file, cancelling once the first chunks are done."""
+        token = CancelToken()
+
+        def progress(step_index, step_name, done, total):
+            if done >= 2 * PROGRESS_CHUNK_SIZE:
+                token.cancel()
+
+        with self.assertRaises(BakeCancelled):
+            with open_input(FileSource(self.path)) as data:
+                run(data, progress, token)
+
+    def test_cancel_releases_the_mapping(self):
+        for operation in ("To Base64", "To Hex", "Caesar Encrypt", "Hash", "Gzip Compress", "AES Encrypt"):
+            with self.subTest(operation=operation):
+                pipeline = compile_recipe([{"operation": operation, "args": {"shift": "3", "key": "k"}}])
+                self.cancel_midway(pipeline.run)
+
+    def test_cancel_releases_the_mapping_when_profiled_or_cached(self):
+        pipeline = compile_recipe([{"operation": "To Hex"}, {"operation": "To Base64"}])
+        self.cancel_midway(lambda data, progress, cancel: run_profiled(pipeline, data, progress, cancel))
+        source = FileSource(self.path)
+        self.cancel_midway(lambda data, progress, cancel: StepCache().run_prefix(
+            pipeline, data, 1, progress=progress, cancel=cancel, digest=source.digest()))
+
+    def test_bake_matches_in_memory_input(self):
+        with open(self.path, "rb") as f:
+            expected = compile_recipe([{"operation": "To Hex"}]).run(f.read())
+        pipeline = compile_recipe([{"operation": "To Hex"}])
+        with open_input(FileSource(self.path)) as data:
+            success, result = pipeline.run(data, progress=lambda *args: None, cancel=CancelToken())
+            result = bytes(result)
+        self.assertEqual((success, result), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
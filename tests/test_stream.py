@@ -0,0 +1,59 @@
+# File: tests/test_stream.py
+
+import unittest
+
+from operations.engine import compile_recipe
+from operations.stream import stream_chunks, StepFailed
+
+CHUNK_SIZES = (1, 2, 3, 4, 5, 7, 64, 1024 * 1024)
+
+# Inputs chosen around the places where the whole-input and streaming decoders used to disagree.
+CASES = {
+    "From Hex": (
+        b"48656c6c6f", b"48 65 6c 6c 6f", b"ab\ncd", b"0x480x65\r\n0x6c", b"\t00 0x00\n", b"00x11",
+        b"abc", b"zz", b"",
+    ),
+    "From Base64": (
+        b"SGVsbG8=", b"SGVs\nbG8=\n", b"YWI=Y2Q=", b"YWI=\n", b"YQ===", b"YWJj=", b"YQ=", b"YQ",
+        b"Y===", b"SGV*sbG8", b"YQ== \n=", b"YQ==x", b"",
+    ),
+}
+
+
+def bake_streamed(pipeline, data: bytes, chunk_size: int) -> tuple:
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    try:
+        return True, b"".join(stream_chunks(pipeline, chunks))
+    except StepFailed as e:
+        return False, str(e)
+
+
+class StreamEquivalenceTest(unittest.TestCase):
+    """Streaming a recipe must give the same result as running it on the whole input, for any chunking."""
+
+    def assert_equivalent(self, recipe: list, data: bytes):
+        pipeline = compile_recipe(recipe)
+        success, whole = pipeline.run(data)
+        for chunk_size in CHUNK_SIZES:
+            with self.subTest(data=data, chunk_size=chunk_size):
+                streamed_success, streamed = bake_streamed(pipeline, data, chunk_size)
+                self.assertEqual(streamed_success, success, streamed if success else whole)
+                if success:
+                    self.assertEqual(streamed, whole)
+
+    def test_decoders(self):
+        for operation, inputs in CASES.items():
+            for data in inputs:
+                self.assert_equivalent([{"operation": operation}], data)
+
+    def test_round_trips(self):
+        source = bytes(range(256)) * 9 + b"tail"
+        for recipe in ([{"operation": "To Base64"}, {"operation": "From Base64"}],
+                       [{"operation": "To Hex"}, {"operation": "From Hex"}],
+                       [{"operation": "Caesar Encrypt", "args": {"shift": "7"}}, {"operation": "To Base64"}],
+                       [{"operation": "Gzip Compress", "args": {"threads": "1"}}, {"operation": "Gzip Decompress"}]):
+            self.assert_equivalent(recipe, source)
+
+
+if __name__ == "__main__":
+    unittest.main()